@@ -0,0 +1,127 @@
+"""
+Snippet storage benchmark: verbatim rows vs the compressed blob store.
+
+Generates a synthetic corpus in which most snippets are shared boilerplate
+(imports, app setup, config templates) and the rest are unique functions,
+writes it with each layout and reports database size, write throughput,
+and read throughput when loading whole projects (every snippet decoded) or
+touching only five snippets per project (lazy decoding).
+
+    python benchmarks/bench_blob_store.py --projects 200 --snippets 50
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEMPLATES = [
+    "import os\nimport sys\nimport json\nimport logging\n\nlogger = logging.getLogger(__name__)\n",
+    "from flask import Flask, jsonify, request\n\napp = Flask(__name__)\napp.config.from_object('config')\n",
+    "class Config:\n" + "".join(f"    SETTING_{i} = os.environ.get('SETTING_{i}', '')\n" for i in range(15)),
+    "if __name__ == '__main__':\n    import uvicorn\n    uvicorn.run('app:app', host='0.0.0.0', port=8000)\n",
+    "def get_db():\n    db = SessionLocal()\n    try:\n        yield db\n    finally:\n        db.close()\n",
+]
+
+
+def unique_snippet(rng, i):
+    name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8))
+    body = "".join(f"    {name}_{j} = request.args.get('{name}_{j}', {rng.randrange(1000)})\n"
+                   for j in range(rng.randrange(5, 25)))
+    return f"def {name}_{i}(request):\n{body}    return jsonify(locals())\n"
+
+
+def corpus(projects, snippets, shared):
+    rng = random.Random(0)
+    return {
+        f"p{p}": {
+            f"feature {s}": rng.choice(TEMPLATES) if rng.random() < shared else unique_snippet(rng, s)
+            for s in range(snippets)
+        }
+        for p in range(projects)
+    }
+
+
+def db_size(conn, path):
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("VACUUM")
+    return os.path.getsize(path)
+
+
+def run_layout(layout, data, path):
+    from cogenbai.storage.blob_store import BlobStore, LazySnippets
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    if layout == "verbatim":
+        conn.execute("CREATE TABLE snippets (project_id TEXT, feature TEXT, code TEXT, PRIMARY KEY (project_id, feature))")
+    else:
+        conn.execute("CREATE TABLE snippets (project_id TEXT, feature TEXT, digest TEXT, PRIMARY KEY (project_id, feature))")
+        store = BlobStore(conn, codec=layout)
+
+    start = time.perf_counter()
+    for project_id, snippets in data.items():
+        conn.execute("BEGIN")
+        for feature, code in snippets.items():
+            value = code if layout == "verbatim" else store.put(code)
+            conn.execute("INSERT INTO snippets VALUES (?, ?, ?)", (project_id, feature, value))
+        conn.execute("COMMIT")
+    write = time.perf_counter() - start
+
+    def load(project_id):
+        if layout == "verbatim":
+            return dict(conn.execute("SELECT feature, code FROM snippets WHERE project_id = ? ORDER BY rowid",
+                                     (project_id,)).fetchall())
+        return LazySnippets(conn.execute(
+            "SELECT s.feature, b.codec, b.data FROM snippets s JOIN blobs b ON b.digest = s.digest "
+            "WHERE s.project_id = ? ORDER BY s.rowid", (project_id,)
+        ).fetchall())
+
+    start = time.perf_counter()
+    for project_id in data:
+        snippets = load(project_id)
+        for feature in snippets:
+            snippets[feature]
+    read_all = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for project_id in data:
+        snippets = load(project_id)
+        for feature in list(snippets)[:5]:
+            snippets[feature]
+    read_some = time.perf_counter() - start
+
+    size = db_size(conn, path)
+    conn.close()
+    return size, write, read_all, read_some
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--snippets", type=int, default=50)
+    parser.add_argument("--shared", type=float, default=0.6, help="fraction of snippets that are boilerplate")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.storage.blob_store import zstandard
+
+    data = corpus(args.projects, args.snippets, args.shared)
+    total = args.projects * args.snippets
+    text_mb = sum(len(code) for snippets in data.values() for code in snippets.values()) / 1024 ** 2
+    print(f"{total} snippets, {text_mb:.1f} MB of code, {args.shared:.0%} boilerplate")
+    print(f"{'layout':<9} {'db size':>9} {'write/s':>10} {'read all/s':>11} {'read 5/s':>10}")
+    layouts = ["verbatim", "zlib"] + (["zstd"] if zstandard is not None else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in layouts:
+            size, write, read_all, read_some = run_layout(layout, data, os.path.join(tmp, f"{layout}.db"))
+            print(f"{layout:<9} {size / 1024 ** 2:>7.2f}MB {total / write:>10.0f} {total / read_all:>11.0f} "
+                  f"{args.projects * 5 / read_some:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
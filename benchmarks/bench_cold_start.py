@@ -0,0 +1,85 @@
+"""
+Cold-start benchmark for copied vs memory-mapped weights.
+
+Starts --workers processes per loading mode, the way several uvicorn workers
+would, and has each one load the model and run one forward pass. Once all of
+them are up, each reports its startup time and memory: RSS, private (anon)
+and file-backed RSS, and PSS, which splits shared pages between processes
+and so shows how much the workers really cost together.
+
+    cogenbai convert-weights Salesforce/codegen-350M-multi ./checkpoints/codegen-350M
+    python benchmarks/bench_cold_start.py --model ./checkpoints/codegen-350M --workers 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def worker(model_path, mode):
+    sys.path.insert(0, ROOT)
+    import torch
+    from cogenbai.config import CogenConfig
+    from cogenbai.core.memory import memory_usage
+    from cogenbai.core.model import CogenBAI
+
+    baseline = memory_usage()
+    config = CogenConfig(model_name=model_path, mmap_weights=(mode == "mmap"), prefix_cache_max_bytes=0)
+    model = CogenBAI(model_path, device="cpu", config=config)
+    with torch.no_grad():
+        model.model(**model.tokenizer("def hello():", return_tensors="pt"))
+    print("ready", flush=True)
+    sys.stdin.readline()  # wait until every worker has loaded
+    usage = memory_usage()
+    print(json.dumps({
+        "startup_s": model.startup_seconds,
+        **{key: usage.get(key, 0.0) - baseline.get(key, 0.0)
+           for key in ("rss_mb", "rss_anon_mb", "rss_file_mb", "pss_mb")},
+    }), flush=True)
+    sys.stdin.readline()  # stay alive until every worker has measured
+
+
+def run_mode(model_path, mode, workers):
+    procs = [
+        subprocess.Popen([sys.executable, __file__, "--model", model_path, "--worker", mode],
+                         cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        while proc.stdout.readline().strip() != "ready":
+            pass
+    for proc in procs:
+        proc.stdin.write("measure\n")
+        proc.stdin.flush()
+    results = [json.loads(proc.stdout.readline()) for proc in procs]
+    for proc in procs:
+        proc.stdin.close()
+        proc.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="local safetensors checkpoint directory")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--modes", nargs="+", default=["copy", "mmap"])
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.model, args.worker)
+        return
+
+    print(f"{'mode':<6} {'startup':>9} {'rss':>9} {'anon':>9} {'file':>9} {'pss':>9} {'total pss':>10}")
+    for mode in args.modes:
+        results = run_mode(args.model, mode, args.workers)
+        mean = {key: sum(r[key] for r in results) / len(results) for key in results[0]}
+        print(f"{mode:<6} {mean['startup_s']:>8.2f}s {mean['rss_mb']:>7.0f}MB {mean['rss_anon_mb']:>7.0f}MB "
+              f"{mean['rss_file_mb']:>7.0f}MB {mean['pss_mb']:>7.0f}MB {mean['pss_mb'] * len(results):>8.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+External formatter latency benchmark.
+
+Formats --snippets distinct snippets through an ExternalFormatter from
+--threads threads and reports per-snippet latency (avg/p50/p95) and
+snippets/s for each mode. The default formatter is the stub used by the
+tests, which runs in every mode, so the numbers isolate process start-up
+(oneshot) against a long-lived worker (persistent, lsp). Pass a real tool
+with --command (oneshot only unless it speaks one of the protocols).
+
+    python benchmarks/bench_external_formatters.py --snippets 200 --workers 2
+    python benchmarks/bench_external_formatters.py --command gofmt --modes oneshot
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB = os.path.join(ROOT, "tests", "stub_formatter.py")
+
+SNIPPET = "package main\n\nfunc handler{i}(items []int) int {{  \n\ttotal := 0\n\tfor _, item := range items {{\n\t\ttotal += item * {i}\n\t}}\n\treturn total\n}}\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snippets", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--modes", nargs="+", default=["oneshot", "persistent", "lsp"])
+    parser.add_argument("--command", nargs="+", help="formatter command (default: the test stub)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.optimization.external import ExternalFormatter, ExternalFormatterSpec
+
+    snippets = [SNIPPET.format(i=i) for i in range(args.snippets)]
+    print(f"{'mode':<11} {'snippets/s':>10} {'avg ms':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode in args.modes:
+        command = args.command or [sys.executable, STUB, "--mode", mode]
+        formatter = ExternalFormatter(mode, ExternalFormatterSpec(command, mode=mode, workers=args.workers,
+                                                                  filename="snippet.go"))
+        try:
+            formatter.format(snippets[0])  # start the workers outside the measurement
+            formatter._stats.latencies.clear()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                list(pool.map(formatter.format, snippets))
+            elapsed = time.perf_counter() - start
+            stats = formatter.stats()
+        finally:
+            formatter.close()
+        print(f"{mode:<11} {len(snippets) / elapsed:>10.1f} {stats['avg_ms']:>8.2f} "
+              f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
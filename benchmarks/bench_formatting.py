@@ -0,0 +1,81 @@
+"""
+Formatting service benchmark.
+
+Formats --snippets generated Python functions --repeats times each, the
+way generated code, optimized code and generated tests reach the
+formatter, and then formats the already-formatted outputs once more.
+Compares the previous approach (every pass on every call, autopep8 ->
+black -> yapf where installed) with FormattingService, and prints the
+service's per-pass timing.
+
+    python benchmarks/bench_formatting.py --snippets 200 --repeats 5
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = '''def handler_{i}(request,limit = {i}):
+  total=0
+  for item in request.items :
+      if item>limit: total+= item
+      else :
+          total -=1
+  return {{ "total":total,'limit' : limit }}
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snippets", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.optimization.formatting import FORMATTERS, FormattingService
+
+    available = []
+    for name in ("autopep8", "black", "yapf"):
+        try:
+            FORMATTERS[name]("x = 1\n")
+            available.append(name)
+        except ImportError:
+            pass
+    print(f"passes: {' -> '.join(available)}")
+
+    snippets = [SNIPPET.format(i=i) for i in range(args.snippets)]
+    calls = [code for code in snippets for _ in range(args.repeats)]
+
+    start = time.perf_counter()
+    outputs = []
+    for code in calls:
+        for name in available:
+            try:
+                code = FORMATTERS[name](code)
+            except Exception:
+                pass
+        outputs.append(code)
+    for code in outputs[::args.repeats]:
+        for name in available:
+            code = FORMATTERS[name](code)
+    previous = time.perf_counter() - start
+
+    service = FormattingService({"python": available})
+    start = time.perf_counter()
+    formatted = [service.format(code, "python") for code in calls]
+    for code in formatted[::args.repeats]:
+        service.format(code, "python")
+    current = time.perf_counter() - start
+
+    total = len(calls) + args.snippets
+    print(f"{total} calls: every pass {previous * 1000 / total:.2f}ms/call, "
+          f"service {current * 1000 / total:.2f}ms/call ({previous / current:.1f}x)")
+    print(f"{'pass':<10} {'runs':>6} {'cached':>7} {'changed':>8} {'mean ms':>8}")
+    for name, stats in service.stats()["passes"].items():
+        print(f"{name:<10} {stats['runs']:>6} {stats['cached']:>7} {stats['changed']:>8} {stats['mean_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Import-time benchmark.
+
+Runs each command in a fresh interpreter several times and reports the best
+and median wall time. Exits non-zero if any median exceeds --budget seconds.
+
+    python benchmarks/bench_import.py --runs 5 --budget 1.0
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "import cogenbai": [sys.executable, "-c", "import cogenbai"],
+    "from cogenbai import LanguageGenerator": [
+        sys.executable, "-c", "from cogenbai import LanguageGenerator"
+    ],
+    "import CodeReviewAnalyzer": [
+        sys.executable, "-c", "from cogenbai.review.analyzer import CodeReviewAnalyzer"
+    ],
+    "cogenbai list-languages": [sys.executable, "-m", "cogenbai.cli.main", "list-languages"],
+}
+
+
+def time_command(cmd, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="max median seconds per command")
+    args = parser.parse_args()
+
+    baseline, _ = time_command([sys.executable, "-c", "pass"], args.runs)
+    print(f"{'command':<40} {'best':>8} {'median':>8}")
+    print(f"{'(bare interpreter)':<40} {baseline:>7.3f}s")
+    over_budget = []
+    for name, cmd in COMMANDS.items():
+        best, median = time_command(cmd, args.runs)
+        print(f"{name:<40} {best:>7.3f}s {median:>7.3f}s")
+        if median > args.budget:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"over the {args.budget:.2f}s budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Lexer throughput benchmark for the brace-language reviewers.
+
+For each language, writes a synthetic source file of --mb megabytes
+(functions with nested control flow, strings and comments) and reviews it
+streamed from disk with LexicalReview. Reports MB/s, tokens/s and the peak
+memory traced while reviewing, which should stay flat as --mb grows.
+
+    python benchmarks/bench_lexer.py --mb 4 --languages cpp java go rust
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+C_LIKE = '''
+/** Handles case {i}. */
+int handle_{i}(int* items, int count) {{
+    int total = 0; // running total
+    for (int idx = 0; idx < count; idx++) {{
+        if (items[idx] > {i}) {{
+            while (items[idx] > 0) {{ items[idx]--; total += 1; }}
+        }} else {{
+            total -= items[idx]; /* negative {{ */
+        }}
+    }}
+    log("done {{%d}}", total);
+    return total;
+}}
+'''
+
+TEMPLATES = {
+    "c": C_LIKE,
+    "cpp": C_LIKE,
+    "java": C_LIKE.replace("int* items", "int[] items"),
+    "csharp": C_LIKE.replace("int* items", "int[] items"),
+    "javascript": C_LIKE.replace("int ", "let ").replace("let* items", "items").replace("let handle", "function handle"),
+    "typescript": C_LIKE.replace("int ", "let ").replace("let* items", "items").replace("let handle", "function handle"),
+    "php": C_LIKE.replace("int ", "").replace("*items", "$items").replace("idx", "$idx").replace("total", "$total")
+                 .replace("count)", "$count)").replace("< count", "< $count").replace("handle_", "function handle_"),
+    "go": '''
+// handle{i} handles case {i}.
+func handle{i}(items []int) int {{
+\ttotal := 0 // running total
+\tfor _, item := range items {{
+\t\tif item > {i} {{
+\t\t\tfor item > 0 {{
+\t\t\t\titem--
+\t\t\t}}
+\t\t}} else {{
+\t\t\ttotal -= item /* negative {{ */
+\t\t}}
+\t}}
+\tfmt.Printf(`done {{%d}}`, total)
+\treturn total
+}}
+''',
+    "rust": '''
+/// Handles case {i}.
+fn handle_{i}<'a>(items: &'a mut [i32]) -> i32 {{
+    let mut total = 0; // running total
+    for item in items.iter_mut() {{
+        if *item > {i} {{
+            while *item > 0 {{ *item -= 1; total += 1; }}
+        }} else {{
+            total -= *item; /* negative {{ */
+        }}
+    }}
+    println!("done {{}}", total);
+    total
+}}
+''',
+    "kotlin": '''
+/** Handles case {i}. */
+fun handle{i}(items: IntArray): Int {{
+    var total = 0 // running total
+    for (item in items) {{
+        if (item > {i}) {{
+            var rest = item
+            while (rest > 0) {{ rest--; total += 1 }}
+        }} else {{
+            total -= item /* negative {{ */
+        }}
+    }}
+    println("done ${{total}}")
+    return total
+}}
+''',
+    "swift": '''
+/// Handles case {i}.
+func handle{i}(items: [Int]) -> Int {{
+    var total = 0 // running total
+    for item in items {{
+        if item > {i} {{
+            var rest = item
+            while rest > 0 {{ rest -= 1; total += 1 }}
+        }} else {{
+            total -= item /* negative {{ */
+        }}
+    }}
+    print("done \\(total) {{")
+    return total
+}}
+''',
+    "dart": '''
+/// Handles case {i}.
+int handle{i}(List<int> items) {{
+  var total = 0; // running total
+  for (var item in items) {{
+    if (item > {i}) {{
+      while (item > 0) {{ item--; total += 1; }}
+    }} else {{
+      total -= item; /* negative {{ */
+    }}
+  }}
+  print('done {{$total}}');
+  return total;
+}}
+''',
+}
+
+
+def write_source(path, template, megabytes):
+    size, i = 0, 0
+    with open(path, "w") as f:
+        while size < megabytes * 1024 ** 2:
+            chunk = template.format(i=i)
+            f.write(chunk)
+            size += len(chunk)
+            i += 1
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=4.0)
+    parser.add_argument("--languages", nargs="+", default=sorted(TEMPLATES), choices=sorted(TEMPLATES))
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.review.lexer import LANGUAGE_SPECS, tokenize
+    from cogenbai.review.lexical import LexicalReview
+
+    print(f"{'language':<11} {'MB/s':>7} {'tokens/s':>11} {'peak mem':>9}  complexity")
+    with tempfile.TemporaryDirectory() as tmp:
+        for language in args.languages:
+            path = os.path.join(tmp, f"source.{language}")
+            size = write_source(path, TEMPLATES[language], args.mb)
+            with open(path) as f:
+                tokens = sum(1 for _ in tokenize(f, LANGUAGE_SPECS[language]))
+
+            start = time.perf_counter()
+            with open(path) as f:
+                results = LexicalReview(language).run(f)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            with open(path) as f:
+                LexicalReview(language).run(f)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"{language:<11} {size / 1024 ** 2 / elapsed:>7.2f} {tokens / elapsed:>11.0f} "
+                  f"{peak / 1024:>7.0f}KB  {results['complexity']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Precision-mode benchmark.
+
+Loads a local checkpoint once per precision mode, each in a fresh
+interpreter, and reports load time, resident memory once the model has run
+(weights may be memory-mapped and only paged in by the first forward pass),
+peak resident memory and greedy decoding throughput on CPU.
+
+    python benchmarks/bench_precision.py --model ./checkpoints/codegen-350M-multi \
+        --modes fp32 bf16 int8 --threads 8 --new-tokens 64
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = "Generate python code:\nWrite a function that parses a CSV file into a list of dicts.\n\nSolution:\n"
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+
+def measure(model_path, precision, threads, new_tokens):
+    sys.path.insert(0, ROOT)
+    import torch
+    from cogenbai.config import CogenConfig
+    from cogenbai.core.model import CogenBAI
+
+    config = CogenConfig(model_name=model_path, precision=precision, num_threads=threads,
+                         prefix_cache_max_bytes=0, early_stopping=False)
+    baseline_rss = current_rss_mb()
+    start = time.perf_counter()
+    model = CogenBAI(model_path, device="cpu", config=config)
+    load_s = time.perf_counter() - start
+
+    inputs = model.tokenizer(PROMPT, return_tensors="pt")
+    generate = dict(max_new_tokens=new_tokens, min_new_tokens=new_tokens, do_sample=False,
+                    pad_token_id=model.tokenizer.eos_token_id)
+    with torch.no_grad():
+        model.model.generate(**inputs, max_new_tokens=4, do_sample=False,
+                             pad_token_id=model.tokenizer.eos_token_id)  # warm-up
+        start = time.perf_counter()
+        model.model.generate(**inputs, **generate)
+        decode_s = time.perf_counter() - start
+    rss_mb = current_rss_mb() - baseline_rss
+
+    return {
+        "precision": precision,
+        "load_s": load_s,
+        "rss_mb": rss_mb,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "tokens_per_s": new_tokens / decode_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="local checkpoint directory")
+    parser.add_argument("--modes", nargs="+", default=["fp32", "bf16", "int8"])
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--new-tokens", type=int, default=64)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.model, args.worker, args.threads, args.new_tokens)))
+        return
+
+    print(f"{'mode':<6} {'load':>8} {'rss':>10} {'peak rss':>10} {'tokens/s':>10}")
+    for mode in args.modes:
+        cmd = [sys.executable, __file__, "--model", args.model, "--worker", mode,
+               "--new-tokens", str(args.new_tokens)]
+        if args.threads:
+            cmd += ["--threads", str(args.threads)]
+        out = subprocess.run(cmd, cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        print(f"{mode:<6} {result['load_s']:>7.2f}s {result['rss_mb']:>8.0f}MB "
+              f"{result['peak_rss_mb']:>8.0f}MB {result['tokens_per_s']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
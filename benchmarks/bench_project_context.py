@@ -0,0 +1,102 @@
+"""
+Project context benchmark: every snippet vs retrieved snippets.
+
+Builds a project whose snippets are the top-level functions and classes of
+a source tree (this repository by default), then for each feature query
+builds the continue_project prompt twice: with every snippet (budget 0) and
+with the BM25-retrieved snippets that fit --budget tokens. Reports prompt
+tokens, context build time and prefill time (one forward pass over the
+prompt, no prefix cache); prompts longer than the model window are counted
+as overflows instead of timed.
+
+    python benchmarks/bench_project_context.py --model ./checkpoints/codegen-350M-multi --budget 1024
+"""
+import argparse
+import ast
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES = [
+    "persist generation results to the result cache",
+    "report prefix cache hit rate",
+    "validate the language of a generation request",
+    "truncate the key/value cache of a speculative draft",
+    "summarize complexity of reviewed code",
+]
+
+
+def collect_snippets(source_dir):
+    snippets = {}
+    for dirpath, _, filenames in os.walk(source_dir):
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path) as f:
+                source = f.read()
+            try:
+                tree = ast.parse(source)
+            except SyntaxError:
+                continue
+            for node in tree.body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    feature = f"{os.path.relpath(path, source_dir)}: {node.name}"
+                    snippets[feature] = ast.get_source_segment(source, node)
+    return snippets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--source-dir", default=os.path.join(ROOT, "cogenbai"))
+    parser.add_argument("--budget", type=int, default=1024)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import torch
+    from cogenbai.config import CogenConfig
+    from cogenbai.core.model import CogenBAI
+    from cogenbai.storage.project_tracker import ProjectState, ProjectTracker
+
+    snippets = collect_snippets(args.source_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = ProjectTracker(os.path.join(tmp, "projects.db"))
+        project = ProjectState("bench", "bench", "python", "none", "active", 0.0,
+                               datetime.now(), snippets, [])
+        start = time.perf_counter()
+        tracker.create_project(project)
+        print(f"indexed {len(snippets)} snippets in {time.perf_counter() - start:.2f}s")
+
+        config = CogenConfig(model_name=args.model, prefix_cache_max_bytes=0)
+        model = CogenBAI(args.model, device="cpu", config=config, project_tracker=tracker)
+        window = getattr(model.model.config, "max_position_embeddings", None) or model.model.config.n_positions
+
+        print(f"{'budget':>8} {'tokens':>8} {'build':>9} {'prefill':>9} {'overflow':>9}")
+        for budget in (0, args.budget):
+            config.project_context_tokens = budget
+            tokens, build, prefill, overflow = [], [], [], 0
+            for query in QUERIES:
+                start = time.perf_counter()
+                context = model._build_project_context(project, query)
+                build.append(time.perf_counter() - start)
+                prompt = model.build_prompt(f"Add feature: {query}", "python", None, context)
+                input_ids = model.tokenizer(prompt, return_tensors="pt").input_ids
+                tokens.append(input_ids.shape[1])
+                if input_ids.shape[1] > window:
+                    overflow += 1
+                    continue
+                start = time.perf_counter()
+                with torch.no_grad():
+                    model.model(input_ids)
+                prefill.append(time.perf_counter() - start)
+            mean_prefill = f"{sum(prefill) / len(prefill) * 1000:.0f}ms" if prefill else "-"
+            print(f"{budget or 'all':>8} {sum(tokens) / len(tokens):>8.0f} "
+                  f"{sum(build) / len(build) * 1000:>7.1f}ms {mean_prefill:>9} {overflow:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Feature addition cost as a project grows: JSON blob vs snippets table.
+
+For each project size, fills a project with that many synthetic snippets
+and times adding --features more, once by rewriting the whole
+``code_snippets`` JSON blob (how projects used to be stored) and once with
+ProjectTracker.add_snippet, which upserts one row (and indexes it for
+retrieval). Also times reading 10 snippets vs loading the whole project.
+
+    python benchmarks/bench_project_snippets.py --sizes 100 1000 5000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def snippet(i):
+    lines = [f"def handle_feature_{i}(request, session):"]
+    lines += [f"    value_{j} = session.get('key_{i}_{j}', {j})" for j in range(30)]
+    lines.append(f"    return render('feature_{i}.html', locals())")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--features", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.storage.project_tracker import ProjectState, ProjectTracker
+
+    print(f"{'snippets':>9} {'blob add':>10} {'table add':>10} {'load all':>10} {'load 10':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = ProjectTracker(os.path.join(tmp, "projects.db"))
+            snippets = {f"feature {i}": snippet(i) for i in range(size)}
+            tracker.create_project(ProjectState("p", "bench", "python", "none", "active", 0.0,
+                                                datetime.now(), snippets, []))
+            conn = tracker.conn
+            conn.execute("CREATE TABLE blob_projects (project_id TEXT PRIMARY KEY, code_snippets TEXT)")
+            conn.execute("INSERT INTO blob_projects VALUES ('p', ?)", (json.dumps(snippets),))
+            conn.commit()
+
+            start = time.perf_counter()
+            for i in range(size, size + args.features):
+                (blob,) = conn.execute("SELECT code_snippets FROM blob_projects WHERE project_id = 'p'").fetchone()
+                blob_snippets = json.loads(blob)
+                blob_snippets[f"feature {i}"] = snippet(i)
+                conn.execute("UPDATE blob_projects SET code_snippets = ? WHERE project_id = 'p'",
+                             (json.dumps(blob_snippets),))
+                conn.commit()
+            blob_add = (time.perf_counter() - start) / args.features
+
+            start = time.perf_counter()
+            for i in range(size, size + args.features):
+                tracker.add_snippet("p", f"feature {i}", snippet(i))
+            table_add = (time.perf_counter() - start) / args.features
+
+            start = time.perf_counter()
+            tracker.get_project("p")
+            load_all = time.perf_counter() - start
+            start = time.perf_counter()
+            tracker.get_snippets("p", [f"feature {i}" for i in range(0, size, max(size // 10, 1))][:10])
+            load_some = time.perf_counter() - start
+
+        print(f"{size:>9} {blob_add * 1000:>8.2f}ms {table_add * 1000:>8.2f}ms "
+              f"{load_all * 1000:>8.2f}ms {load_some * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
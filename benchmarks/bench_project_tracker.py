@@ -0,0 +1,114 @@
+"""
+Concurrent read/write stress test for ProjectTracker.
+
+Runs --writers threads adding snippets and --readers threads loading
+projects, fetching snippets and querying the retrieval index, all against
+one database for --duration seconds. With --processes N, every process runs
+that mix with its own tracker, like N API workers. Reports throughput,
+latency percentiles and failed operations.
+
+    python benchmarks/bench_project_tracker.py --writers 4 --readers 8 --processes 2
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECTS = 8
+
+
+def run_worker(db_path, worker_id, writers, readers, duration):
+    sys.path.insert(0, ROOT)
+    from cogenbai.storage.project_tracker import ProjectTracker
+
+    tracker = ProjectTracker(db_path)
+    results = {"write": [], "read": [], "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def writer(thread_id):
+        rng = random.Random(thread_id)
+        latencies, errors, i = [], 0, 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            feature = f"worker {worker_id} thread {thread_id} feature {i}"
+            code = f"def handler_{i}(request):\n    return lookup_{rng.randrange(100)}(request)\n"
+            if not tracker.add_snippet(f"p{rng.randrange(PROJECTS)}", feature, code):
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+            i += 1
+        with lock:
+            results["write"] += latencies
+            results["errors"] += errors
+
+    def reader(thread_id):
+        rng = random.Random(1000 + thread_id)
+        latencies = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            project_id = f"p{rng.randrange(PROJECTS)}"
+            tracker.get_project(project_id, include_snippets=False)
+            features = tracker.relevant_snippets(project_id, f"lookup_{rng.randrange(100)} handler")
+            tracker.get_snippets(project_id, features[:5])
+            latencies.append(time.perf_counter() - start)
+        with lock:
+            results["read"] += latencies
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.storage.project_tracker import ProjectState, ProjectTracker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "projects.db")
+        tracker = ProjectTracker(db_path)
+        for i in range(PROJECTS):
+            tracker.create_project(ProjectState(f"p{i}", f"project {i}", "python", "none", "active", 0.0,
+                                                datetime.now(), {"initial": "app = create_app()"}, []))
+        tracker.close()
+
+        jobs = [(db_path, i, args.writers, args.readers, args.duration) for i in range(args.processes)]
+        if args.processes == 1:
+            outcomes = [run_worker(*jobs[0])]
+        else:
+            with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+                outcomes = pool.starmap(run_worker, jobs)
+
+    print(f"{args.processes} process(es) x ({args.writers} writers + {args.readers} readers), "
+          f"{args.duration:.0f}s")
+    print(f"{'op':<6} {'ops/s':>9} {'p50':>9} {'p99':>9} {'max':>9}")
+    for op in ("write", "read"):
+        latencies = [latency for outcome in outcomes for latency in outcome[op]]
+        print(f"{op:<6} {len(latencies) / args.duration:>9.0f} {percentile(latencies, 0.5) * 1000:>7.2f}ms "
+              f"{percentile(latencies, 0.99) * 1000:>7.2f}ms {max(latencies, default=0.0) * 1000:>7.2f}ms")
+    print(f"failed writes: {sum(outcome['errors'] for outcome in outcomes)}")
+
+
+if __name__ == "__main__":
+    main()
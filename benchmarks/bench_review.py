@@ -0,0 +1,109 @@
+"""
+Code review benchmark on large Python files.
+
+Generates a module of at least --lines lines (classes, nested control flow,
+docstrings, a few eval/os.system calls) and times CodeReviewAnalyzer's
+single-pass review against the previous implementation, which parsed the
+source twice, walked the tree once per metric and ran regex scans for
+documentation and security.
+
+    python benchmarks/bench_review.py --lines 20000
+"""
+import argparse
+import ast
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FUNCTION = '''
+    def method_{i}(self, items, limit={i}):
+        """Process items for case {i}."""
+        total = 0
+        for item in items:
+            if item > limit:
+                while item > limit:
+                    item -= 1
+                    total += item
+            elif item == 0:
+                continue
+            else:
+                try:
+                    total += int(item)
+                except ValueError:
+                    pass
+        with open(self.path) as f:
+            data = f.read()
+        if {i} % 50 == 0:
+            os.system("echo " + data)
+        return total
+'''
+
+
+def generate(lines):
+    parts = ['"""Generated module for the review benchmark."""\nimport os\n']
+    i = 0
+    while sum(part.count("\n") for part in parts) < lines:
+        if i % 20 == 0:
+            parts.append(f'\n\nclass Service{i // 20}:\n    """Service {i // 20}."""\n')
+        parts.append(FUNCTION.format(i=i))
+        i += 1
+    return "".join(parts)
+
+
+def legacy_review(code):
+    """The multi-pass review this benchmark compares against."""
+    tree = ast.parse(code)
+    branches = sum(isinstance(node, (ast.If, ast.For, ast.While, ast.Try)) for node in ast.walk(tree))
+    cognitive = sum(1 for node in ast.walk(tree) if isinstance(node, (ast.If, ast.While, ast.For)))
+    tree = ast.parse(code)
+    issues = [f"Invalid name: {node.id}" for node in ast.walk(tree)
+              if isinstance(node, ast.Name) and (len(node.id) < 2 or not node.id.isidentifier())]
+    docs = len(re.findall(r'"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'', code)) / max(1, len(code.splitlines()))
+    vulnerabilities = [message for pattern, message in [
+        (r'eval\(', 'Dangerous eval() usage'),
+        (r'exec\(', 'Dangerous exec() usage'),
+        (r'os\.system\(', 'Unsafe system command execution')
+    ] if re.search(pattern, code)]
+    return {
+        'complexity': {'cyclomatic_complexity': branches, 'cognitive_complexity': cognitive},
+        'naming': {'issues': issues},
+        'documentation': {'documentation_ratio': docs, 'has_module_docstring': code.lstrip().startswith('"""')},
+        'security': {'vulnerabilities': vulnerabilities},
+    }
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.review.analyzer import CodeReviewAnalyzer
+
+    code = generate(args.lines)
+    analyzer = CodeReviewAnalyzer()
+    parse = timed(lambda: ast.parse(code), args.repeat)
+    legacy = timed(lambda: legacy_review(code), args.repeat)
+    single = timed(lambda: analyzer.review_code(code, "python"), args.repeat)
+
+    print(f"{len(code.splitlines())} lines, {len(code) / 1024:.0f} KB (best of {args.repeat})")
+    print(f"{'ast.parse alone':<28} {parse * 1000:>9.1f}ms")
+    print(f"{'multi-pass (previous)':<28} {legacy * 1000:>9.1f}ms")
+    print(f"{'single pass':<28} {single * 1000:>9.1f}ms  ({legacy / single:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Repository-scale review benchmark.
+
+Writes a synthetic repository of --files source files (mostly Python, some
+JavaScript and Go) and reviews it with run_batch_review, once in-process
+and once per --workers value, reporting files/s and lines/s. With no
+--path the synthetic tree is used; pass --path to review a real checkout.
+
+    python benchmarks/bench_review_batch.py --files 2000 --workers 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PYTHON_FUNCTION = '''
+def handler_{i}(request, limit={i}):
+    """Handle case {i}."""
+    total = 0
+    for item in request.items:
+        if item > limit:
+            while item > limit:
+                item -= 1
+        elif item == 0:
+            continue
+    return total
+'''
+
+
+def write_tree(root, files, rng):
+    for i in range(files):
+        kind = rng.random()
+        package = os.path.join(root, f"pkg{i % 40}")
+        os.makedirs(package, exist_ok=True)
+        if kind < 0.8:
+            path, code = f"module_{i}.py", "".join(PYTHON_FUNCTION.format(i=j) for j in range(rng.randrange(5, 40)))
+        elif kind < 0.9:
+            path, code = f"module_{i}.js", "function add(a, b) {\n  return a + b;\n}\n" * rng.randrange(5, 40)
+        else:
+            path, code = f"module_{i}.go", "func add(a int, b int) int {\n\treturn a + b\n}\n" * rng.randrange(5, 40)
+        with open(os.path.join(package, path), "w") as f:
+            f.write(code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--path", help="review this directory instead of a synthetic tree")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.review.batch import run_batch_review
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            path = tmp
+            write_tree(tmp, args.files, random.Random(0))
+        print(f"{os.cpu_count()} CPUs")
+        print(f"{'workers':<8} {'files':>7} {'failed':>7} {'files/s':>9} {'lines/s':>10} {'time':>8}")
+        for workers in [1] + args.workers:
+            with open(os.devnull, "w") as out:
+                report = run_batch_review(path, out, num_workers=workers)
+            print(f"{workers:<8} {report.files:>7} {report.failed:>7} {report.files_per_second:>9.0f} "
+                  f"{report.lines / report.elapsed:>10.0f} {report.elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Incremental re-review benchmark.
+
+Generates a module of --functions top-level functions, reviews it once to
+warm the cache, then repeatedly edits --changed functions and re-reviews
+the file. Reports the latency of a full review next to the incremental one
+for each edit size, and checks the two give identical results.
+
+    python benchmarks/bench_review_incremental.py --functions 1000 --changed 1 10 100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FUNCTION = '''
+def handler_{i}(request, limit={limit}):
+    """Handle case {i}."""
+    total = 0
+    for item in request.items:
+        if item > limit:
+            while item > limit:
+                item -= 1
+                total += item
+        elif item == 0:
+            continue
+        else:
+            try:
+                total += int(item)
+            except ValueError:
+                pass
+    return total
+'''
+
+
+def render(limits):
+    return '"""Generated module."""\nimport os\n' + "".join(
+        FUNCTION.format(i=i, limit=limit) for i, limit in enumerate(limits)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--functions", type=int, default=1000)
+    parser.add_argument("--changed", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--edits", type=int, default=20, help="re-reviews per edit size")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.review.analyzer import CodeReviewAnalyzer
+    from cogenbai.review.incremental import ReviewCache
+
+    rng = random.Random(0)
+    limits = list(range(args.functions))
+    full = CodeReviewAnalyzer()
+    incremental = CodeReviewAnalyzer(ReviewCache(max_entries=4 * args.functions))
+    source = render(limits)
+    incremental.review_code(source, "python")
+    print(f"{len(source.splitlines())} lines, {args.functions} functions")
+    print(f"{'changed':<8} {'full':>10} {'incremental':>12} {'speedup':>8}")
+
+    for changed in args.changed:
+        full_time = incremental_time = 0.0
+        for _ in range(args.edits):
+            for i in rng.sample(range(args.functions), changed):
+                limits[i] += 1
+            source = render(limits)
+            start = time.perf_counter()
+            expected = full.review_code(source, "python")
+            full_time += time.perf_counter() - start
+            start = time.perf_counter()
+            result = incremental.review_code(source, "python")
+            incremental_time += time.perf_counter() - start
+            assert result == expected
+        full_ms, incremental_ms = full_time / args.edits * 1000, incremental_time / args.edits * 1000
+        print(f"{changed:<8} {full_ms:>8.1f}ms {incremental_ms:>10.1f}ms {full_ms / incremental_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
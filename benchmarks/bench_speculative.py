@@ -0,0 +1,73 @@
+"""
+Speculative decoding benchmark for project continuation.
+
+Uses an existing source file as the project context (the continue_project
+shape: context, then "Add feature: ..."), decodes greedily with plain,
+n-gram prompt-lookup and, if --draft-model is given, draft-model decoding,
+and reports time, speedup over plain decoding, acceptance rate and tokens
+per main-model forward pass. Exits non-zero if any mode's output differs
+from plain greedy decoding.
+
+    python benchmarks/bench_speculative.py --model ./checkpoints/codegen-2B-multi \
+        --draft-model ./checkpoints/codegen-350M-multi --context-file cogenbai/core/batching.py
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEATURES = [
+    "Add feature: a method returning the number of pending requests",
+    "Add feature: reject requests whose max_length exceeds a limit",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--draft-model", help="small model sharing the main model's tokenizer")
+    parser.add_argument("--context-file", default=os.path.join(ROOT, "cogenbai", "core", "batching.py"))
+    parser.add_argument("--context-chars", type=int, default=4000)
+    parser.add_argument("--max-new-tokens", type=int, default=256)
+    parser.add_argument("--speculative-tokens", type=int, default=8)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.config import CogenConfig
+    from cogenbai.core.model import CogenBAI
+    from cogenbai.core.speculative import SpeculativeStats
+
+    config = CogenConfig(model_name=args.model, draft_model_name=args.draft_model,
+                         speculative_tokens=args.speculative_tokens)
+    model = CogenBAI(args.model, config=config)
+    with open(args.context_file) as f:
+        context = f.read()[:args.context_chars]
+    max_length = len(model.tokenizer(context).input_ids) + args.max_new_tokens
+
+    modes = [None, "ngram"] + (["draft"] if args.draft_model else [])
+    outputs, timings = {}, {}
+    print(f"{'mode':<8} {'time':>8} {'speedup':>8} {'accept':>8} {'tok/fwd':>8}")
+    for mode in modes:
+        model.speculative = SpeculativeStats()  # counters per mode
+        start = time.perf_counter()
+        outputs[mode] = [
+            model.generate_code(feature, "python", max_length=max_length, context=context,
+                                deterministic=True, speculative=mode)
+            for feature in FEATURES
+        ]
+        timings[mode] = time.perf_counter() - start
+        stats = model.speculative.stats()
+        accept = f"{stats['acceptance_rate']:.0%}" if mode else "-"
+        per_forward = f"{stats['tokens_per_forward']:.2f}" if mode else "1.00"
+        print(f"{mode or 'plain':<8} {timings[mode]:>7.2f}s {timings[None] / timings[mode]:>7.2f}x "
+              f"{accept:>8} {per_forward:>8}")
+
+    mismatched = [mode for mode in modes if outputs[mode] != outputs[None]]
+    if mismatched:
+        print(f"output differs from greedy decoding: {', '.join(mismatched)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
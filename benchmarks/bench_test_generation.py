@@ -0,0 +1,92 @@
+"""
+Package-wide test generation benchmark.
+
+Writes a synthetic package of --files modules (functions and classes with
+methods) and generates tests for it three ways: one
+TestGenerator.generate_tests call per file (black on every output, no
+module imports), then run_batch_generation in-process and once per
+--workers value, reporting files/s. Pass --path to use a real package.
+
+    python benchmarks/bench_test_generation.py --files 1000 --workers 2 4
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FUNCTION = '''
+def handler_{i}(request, limit={i}):
+    """Handle case {i}."""
+    def check(item):
+        return item > limit
+    return [item for item in request.items if check(item)]
+'''
+
+CLASS = '''
+class Service{i}:
+    def __init__(self, client, retries=3):
+        self.client = client
+
+    def fetch(self, key):
+        return self.client.get(key)
+
+    @classmethod
+    def create(cls, url):
+        return cls(url)
+
+    def _reset(self):
+        pass
+'''
+
+
+def write_package(root, files, rng):
+    package = os.path.join(root, "synthetic")
+    for i in range(files):
+        directory = os.path.join(package, f"sub{i % 20}")
+        os.makedirs(directory, exist_ok=True)
+        for init in (package, directory):
+            open(os.path.join(init, "__init__.py"), "a").close()
+        parts = [FUNCTION.format(i=j) for j in range(rng.randrange(2, 15))]
+        parts += [CLASS.format(i=j) for j in range(rng.randrange(0, 5))]
+        with open(os.path.join(directory, f"module_{i}.py"), "w") as f:
+            f.write("".join(parts))
+    return package
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--path", help="generate tests for this package instead of a synthetic one")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from cogenbai.optimization.formatting import FormattingService
+    from cogenbai.testing.batch import iter_python_modules, run_batch_generation
+    from cogenbai.testing.generator import TestGenerator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path or write_package(tmp, args.files, random.Random(0))
+        modules = list(iter_python_modules(path))
+        print(f"{os.cpu_count()} CPUs, {len(modules)} modules")
+        print(f"{'mode':<22} {'files/s':>9} {'time':>8}")
+
+        generator = TestGenerator(FormattingService({"python": ["black"]}, max_entries=0))
+        start = time.perf_counter()
+        for item in modules:
+            with open(item["path"], encoding="utf-8") as f:
+                generator.generate_tests(f.read(), "python")
+        elapsed = time.perf_counter() - start
+        print(f"{'generate_tests + black':<22} {len(modules) / elapsed:>9.0f} {elapsed:>7.2f}s")
+
+        for workers in [1] + args.workers:
+            report = run_batch_generation(path, os.path.join(tmp, f"out{workers}"), num_workers=workers)
+            print(f"{f'batch, {workers} workers':<22} {report.files_per_second:>9.0f} {report.elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
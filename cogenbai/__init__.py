@@ -1,10 +1,27 @@
-from .core.model import CogenBAI
-from .voice.synthesizer import VoiceSynthesizer
-from .languages.generator import LanguageGenerator
-from .debug.analyzer import CodeAnalyzer
-from .config import CogenConfig
-from .api.server import app as api_app
+import importlib
 
 __version__ = "0.1.0"
 
+# Exports are imported on first access so that ``import cogenbai`` does not
+# pull in torch, transformers, pyttsx3 or build the API's model.
+_exports = {
+    'CogenBAI': ('.core.model', 'CogenBAI'),
+    'VoiceSynthesizer': ('.voice.synthesizer', 'VoiceSynthesizer'),
+    'LanguageGenerator': ('.languages.generator', 'LanguageGenerator'),
+    'CodeAnalyzer': ('.debug.analyzer', 'CodeAnalyzer'),
+    'CogenConfig': ('.config', 'CogenConfig'),
+    'api_app': ('.api.server', 'app'),
+}
+
 __all__ = ['CogenBAI', 'VoiceSynthesizer', 'LanguageGenerator', 'CodeAnalyzer', 'CogenConfig', 'api_app']
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _exports[name]
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
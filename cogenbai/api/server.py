@@ -1,43 +1,281 @@
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from datetime import datetime
+import json
+import threading
+import time
 
-from ..core.model import CogenBAI
+from ..config import CogenConfig
+from ..core.batching import BatchScheduler, GenerationRequest
+from ..core.executor import InferenceExecutor, InferenceQueueFull
+from ..storage.project_tracker import (
+    AsyncProjectTracker, ProjectState, ProjectTracker, project_cursor, search_cursor
+)
 from ..languages.generator import LanguageGenerator
 from ..collaboration.session import SessionManager
 from ..collaboration.websocket import collaboration_manager
+from ..optimization.external import close_external_formatters, external_formatter_stats
+from ..optimization.formatting import FormattingService
 from ..review.analyzer import CodeReviewAnalyzer
+from ..review.batch import BatchReviewReport, review_batch
+from ..review.incremental import ReviewCache
+from ..review.security import review_rules
 from ..testing.generator import TestGenerator
 
 app = FastAPI(title="COGENBAI API")
-model = CogenBAI()
+config = CogenConfig()
+# Enough workers to fill a batch; callers beyond the queue limit get a 503
+inference_executor = InferenceExecutor(
+    max_workers=max(config.num_workers, config.batch_size),
+    max_queue_size=config.inference_queue_size
+)
 lang_generator = LanguageGenerator()
 session_manager = SessionManager()
-code_reviewer = CodeReviewAnalyzer()
-test_generator = TestGenerator()
+code_reviewer = CodeReviewAnalyzer(
+    ReviewCache(config.review_cache_size, config.review_cache_path) if config.review_cache_size else None,
+    review_rules(config.security_rules_path)
+)
+# Shared by the model and the test generator, so each text is formatted once
+formatting_service = FormattingService.from_config(config)
+test_generator = TestGenerator(formatting_service)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# The model is built on first use (or by the startup hook), never at import time
+_model = None
+_batch_scheduler = None
+_model_lock = threading.Lock()
+
+# The project database is opened on first use too, so importing this module creates no files
+_project_tracker = None
+_projects = None
+_tracker_lock = threading.Lock()
+
+def get_project_tracker() -> ProjectTracker:
+    global _project_tracker, _projects
+    if _project_tracker is None:
+        with _tracker_lock:
+            if _project_tracker is None:
+                tracker = ProjectTracker(config.projects_db_path)
+                # Handlers await database calls instead of blocking the event loop
+                _projects = AsyncProjectTracker(tracker)
+                _project_tracker = tracker
+    return _project_tracker
+
+def get_projects() -> AsyncProjectTracker:
+    get_project_tracker()
+    return _projects
+
+def get_model():
+    """Return the shared CogenBAI instance, loading it on first use."""
+    global _model, _batch_scheduler
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from ..core.model import CogenBAI
+                model = CogenBAI(config.model_name, config=config, project_tracker=get_project_tracker(),
+                                 formatter=formatting_service)
+                _batch_scheduler = BatchScheduler(
+                    model, batch_size=config.batch_size, max_wait_ms=config.batch_wait_ms
+                )
+                _model = model
+    return _model
+
+def get_batch_scheduler() -> BatchScheduler:
+    get_model()
+    return _batch_scheduler
+
+_review_pool = None
+
+def get_review_pool():
+    """Worker processes for /review/batch, started on first use and shared by requests."""
+    global _review_pool
+    if _review_pool is None:
+        with _model_lock:
+            if _review_pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                _review_pool = ProcessPoolExecutor(
+                    config.num_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _review_pool
+
+@app.on_event("startup")
+async def preload_model():
+    if config.preload_model:
+        # Load in the background so the server starts accepting connections at once
+        threading.Thread(target=get_model, name="cogenbai-model-loader", daemon=True).start()
+
+@app.on_event("shutdown")
+async def stop_review_pool():
+    if _review_pool is not None:
+        _review_pool.shutdown(cancel_futures=True)
+
+@app.on_event("shutdown")
+async def close_project_tracker():
+    if _projects is not None:
+        _projects.close()
+        _project_tracker.close()
+
+@app.on_event("shutdown")
+async def stop_external_formatters():
+    close_external_formatters()
+
 class CodeRequest(BaseModel):
     prompt: str
     language: str
     framework: Optional[str] = None
     max_length: Optional[int] = 1024
     temperature: float = 0.7
+    top_p: float = 0.95
+    deterministic: bool = False
+    seed: Optional[int] = None
+
+async def run_inference(fn, *args, **kwargs):
+    """Run a blocking model call on the inference executor."""
+    try:
+        return await inference_executor.run(fn, *args, **kwargs)
+    except InferenceQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
 
 @app.post("/generate")
 async def generate_code(request: CodeRequest, token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
     try:
-        code = model.generate_code(
-            prompt=request.prompt,
-            language=request.language,
-            max_length=request.max_length,
-            temperature=request.temperature
-        )
+        if request.seed is not None:
+            # Seeded requests sample with their own generator, outside the shared batches
+            code = await run_inference(
+                lambda **kwargs: get_model().generate_code(**kwargs),
+                prompt=request.prompt,
+                language=request.language,
+                framework=request.framework,
+                max_length=request.max_length,
+                temperature=request.temperature,
+                top_p=request.top_p,
+                deterministic=request.deterministic,
+                seed=request.seed
+            )
+        else:
+            generation_request = GenerationRequest(
+                prompt=request.prompt,
+                language=request.language,
+                framework=request.framework,
+                max_length=request.max_length,
+                temperature=request.temperature,
+                top_p=request.top_p,
+                deterministic=request.deterministic
+            )
+            code = await run_inference(lambda: get_batch_scheduler().generate(generation_request))
         return {"status": "success", "code": code}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _stream_generation(request: CodeRequest):
+    return inference_executor.stream(
+        lambda **kwargs: get_model().generate_code_stream(**kwargs),
+        prompt=request.prompt,
+        language=request.language,
+        framework=request.framework,
+        max_length=request.max_length,
+        temperature=request.temperature,
+        top_p=request.top_p
+    )
+
+@app.post("/generate/stream")
+async def generate_code_sse(request: CodeRequest, token: str = Depends(oauth2_scheme)):
+    try:
+        lang_generator.validate_target(request.language, request.framework)
+        events = _stream_generation(request)
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def sse():
+        try:
+            async for event in events:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+
+    return StreamingResponse(sse(), media_type="text/event-stream")
+
+@app.websocket("/ws/generate")
+async def generate_code_ws(websocket: WebSocket):
+    await websocket.accept()
+    try:
+        request = CodeRequest(**await websocket.receive_json())
+        lang_generator.validate_target(request.language, request.framework)
+        async for event in _stream_generation(request):
+            await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except InferenceQueueFull as e:
+        await websocket.send_json({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+        await websocket.close(code=1013)
+    except Exception as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1011)
+
+@app.get("/metrics/batching")
+async def batching_metrics() -> Dict[str, Any]:
+    if _batch_scheduler is None:
+        return {"loaded": False}
+    return _batch_scheduler.stats()
+
+@app.get("/metrics/inference")
+async def inference_metrics() -> Dict[str, Any]:
+    return inference_executor.stats()
+
+@app.get("/metrics/result-cache")
+async def result_cache_metrics() -> Dict[str, Any]:
+    if _model is None or _model.result_cache is None:
+        return {"enabled": config.result_cache_enabled, "loaded": _model is not None}
+    return {"enabled": True, **_model.result_cache.stats()}
+
+@app.get("/metrics/review-cache")
+async def review_cache_metrics() -> Dict[str, Any]:
+    if code_reviewer.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **code_reviewer.cache.stats()}
+
+@app.get("/metrics/formatting")
+async def formatting_metrics() -> Dict[str, Any]:
+    return {**formatting_service.stats(), "external": external_formatter_stats()}
+
+@app.get("/metrics/prefix-cache")
+async def prefix_cache_metrics() -> Dict[str, Any]:
+    if _model is None or _model.prefix_cache is None:
+        return {"enabled": config.prefix_cache_max_bytes > 0, "loaded": _model is not None}
+    return {"enabled": True, **_model.prefix_cache.stats()}
+
+@app.get("/metrics/memory")
+async def memory_metrics() -> Dict[str, Any]:
+    if _model is None:
+        from ..core.memory import memory_usage
+        return {"loaded": False, **memory_usage()}
+    return {"loaded": True, **_model.memory_stats()}
+
+@app.get("/metrics/speculative")
+async def speculative_metrics() -> Dict[str, Any]:
+    if _model is None:
+        return {"mode": config.speculative_decoding, "loaded": False}
+    return {"mode": config.speculative_decoding, **_model.speculative.stats()}
+
+@app.get("/metrics/early-stopping")
+async def early_stopping_metrics() -> Dict[str, Any]:
+    if _model is None:
+        return {"enabled": config.early_stopping, "loaded": False}
+    return {"enabled": config.early_stopping, **_model.early_stopping.stats()}
+
 @app.get("/supported-languages")
 async def get_supported_languages():
     return {"languages": list(lang_generator.language_configs.keys())}
@@ -77,6 +315,38 @@ async def review_code(code: str, language: str) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+class ReviewItem(BaseModel):
+    code: str
+    language: str
+    path: Optional[str] = None
+
+MAX_REVIEW_BATCH = 1000
+
+@app.post("/review/batch")
+async def review_code_batch(items: List[ReviewItem]):
+    """
+    Review many files in worker processes. Streams NDJSON: one record per
+    file as it finishes (``path`` defaults to the item's index), then
+    ``{"files", "failed", "lines", "elapsed", "files_per_second"}``.
+    """
+    if len(items) > MAX_REVIEW_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_REVIEW_BATCH} files per batch")
+    batch = [{"path": item.path or str(i), "language": item.language, "code": item.code}
+             for i, item in enumerate(items)]
+
+    def lines():
+        report = BatchReviewReport()
+        start = time.perf_counter()
+        for record in review_batch(batch, num_workers=config.num_workers, executor=get_review_pool(),
+                                   cache_path=config.review_cache_path,
+                                   rules_path=config.security_rules_path):
+            report.add(record)
+            yield json.dumps(record) + "\n"
+        report.elapsed = time.perf_counter() - start
+        yield json.dumps(report.to_dict()) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.post("/generate-tests")
 async def generate_tests(code: str, language: str, test_type: str = 'unit') -> Dict[str, str]:
     try:
@@ -90,7 +360,8 @@ async def create_project(
     name: str,
     language: str,
     framework: str,
-    initial_description: str
+    initial_description: str,
+    owner_id: Optional[str] = None
 ) -> Dict[str, Any]:
     project_id = f"proj_{int(time.time())}"
     project = ProjectState(
@@ -102,27 +373,93 @@ async def create_project(
         completion_percentage=0.0,
         last_modified=datetime.now(),
         code_snippets={},
-        dependencies=[]
+        dependencies=[],
+        owner_id=owner_id
     )
     
-    if model.project_tracker.create_project(project):
-        initial_code = model.generate_code(initial_description, language, framework)
-        project.code_snippets["initial"] = initial_code
-        model.project_tracker.update_project(
-            project_id,
-            {"code_snippets": json.dumps(project.code_snippets)}
+    if await get_projects().create_project(project):
+        initial_code = await run_inference(
+            lambda: get_model().generate_code(initial_description, language, framework)
         )
+        await get_projects().add_snippet(project_id, "initial", initial_code)
         return {"status": "success", "project_id": project_id, "code": initial_code}
     
     raise HTTPException(status_code=500, detail="Failed to create project")
 
+MAX_PAGE_SIZE = 1000
+
+def _check_limit(limit: int):
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+@app.get("/projects")
+async def list_projects(
+    owner_id: Optional[str] = None,
+    language: Optional[str] = None,
+    framework: Optional[str] = None,
+    status: Optional[str] = None,
+    modified_after: Optional[datetime] = None,
+    modified_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100
+):
+    """
+    Projects, most recently modified first, as NDJSON: one project per
+    line, then ``{"next_cursor": ...}`` (null on the last page).
+    """
+    _check_limit(limit)
+    try:
+        rows = get_project_tracker().list_projects(
+            owner_id=owner_id, language=language, framework=framework, status=status,
+            modified_after=modified_after, modified_before=modified_before,
+            cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # A sync generator: the server pulls it from a worker thread, page by page
+    def lines():
+        count, last = 0, None
+        for project in rows:
+            count, last = count + 1, project
+            yield json.dumps(project.summary()) + "\n"
+        yield json.dumps({"next_cursor": project_cursor(last) if count == limit else None}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/projects/search")
+async def search_projects(
+    q: str,
+    owner_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+):
+    """Full-text search over project code, best match first, as NDJSON like ``/projects``."""
+    _check_limit(limit)
+    try:
+        matches = await get_projects().search_projects(q, owner_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines():
+        for match in matches:
+            yield json.dumps({**match.project.summary(), "score": match.score, "features": match.features}) + "\n"
+        next_cursor = search_cursor(matches[-1]) if len(matches) == limit else None
+        yield json.dumps({"next_cursor": next_cursor}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.post("/projects/{project_id}/continue")
 async def continue_project(
     project_id: str,
     feature_description: str
 ) -> Dict[str, Any]:
     try:
-        new_code = model.continue_project(project_id, feature_description)
+        new_code = await run_inference(
+            lambda: get_model().continue_project(project_id, feature_description)
+        )
         return {"status": "success", "code": new_code}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
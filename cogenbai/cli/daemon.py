@@ -0,0 +1,159 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+def default_socket_path() -> str:
+    if os.environ.get("COGENBAI_SOCKET"):
+        return os.environ["COGENBAI_SOCKET"]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        # Private to the user already (0700, owned by them)
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "cogenbai.sock")
+    return os.path.join(_private_dir(os.path.join(tempfile.gettempdir(), f"cogenbai-{os.getuid()}")),
+                        "daemon.sock")
+
+
+def _private_dir(path: str) -> str:
+    """Create ``path`` as a 0700 directory, or check that the existing one is ours and private."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(f"{path} is not a private directory of this user; set COGENBAI_SOCKET")
+    return path
+
+
+class DaemonUnavailable(ConnectionError):
+    """Raised by DaemonClient when no daemon is listening on the socket."""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # One JSON request per line, answered by one JSON response per line
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = self.server.daemon.dispatch(request.get("method"), request.get("params", {}))
+            except Exception as e:
+                response = {"status": "error", "detail": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class InferenceDaemon:
+    """
+    Keeps a CogenBAI model resident and serves generation requests from
+    ``cogenbai generate`` over a Unix domain socket.
+
+    ``model_factory`` is called once, when the daemon starts; calls into the
+    model are serialized.
+    """
+
+    def __init__(self, socket_path: str, model_factory: Callable[[], Any]):
+        self.socket_path = socket_path
+        self.model_factory = model_factory
+        self.model = None
+        self._lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+
+    def start(self):
+        """Load the model and bind the socket; call serve_forever() afterwards."""
+        if os.path.exists(self.socket_path):
+            if _is_listening(self.socket_path):
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # stale socket from a crashed daemon
+        self.model = self.model_factory()
+        # Created 0600 rather than chmod-ed after bind, so no other user can ever connect
+        umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        self._server.daemon = self
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+    def dispatch(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if method == "ping":
+            return {"status": "success", "pid": os.getpid()}
+        if method == "generate":
+            with self._lock:
+                code = self.model.generate_code(**params)
+            return {"status": "success", "code": code}
+        raise ValueError(f"Unknown method: {method}")
+
+
+class DaemonClient:
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def ping(self) -> bool:
+        try:
+            return self._call("ping", {})["status"] == "success"
+        except DaemonUnavailable:
+            return False
+
+    def generate(self, **params) -> str:
+        response = self._call("generate", params)
+        if response["status"] != "success":
+            raise ValueError(response.get("detail", "Generation failed"))
+        return response["code"]
+
+    def _call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            owner = os.stat(self.socket_path).st_uid
+        except FileNotFoundError as e:
+            raise DaemonUnavailable(f"No daemon on {self.socket_path}") from e
+        if owner != os.getuid():
+            # Prompts are never sent to a socket another user could be listening on
+            raise DaemonUnavailable(f"{self.socket_path} belongs to another user")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            try:
+                sock.connect(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                raise DaemonUnavailable(f"No daemon on {self.socket_path}") from e
+            sock.sendall(json.dumps({"method": method, "params": params}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+            if not line:
+                raise DaemonUnavailable("Daemon closed the connection")
+            return json.loads(line)
+        finally:
+            sock.close()
+
+
+def _is_listening(socket_path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
@@ -1,5 +1,7 @@
+import os
+import signal
+import sys
 import click
-from ..core.model import CogenBAI
 from ..languages.generator import LanguageGenerator
 from ..config import CogenConfig
 
@@ -12,12 +14,144 @@ def cli():
 @click.argument('prompt')
 @click.option('--language', '-l', required=True, help='Target programming language')
 @click.option('--framework', '-f', help='Framework to use')
-def generate(prompt: str, language: str, framework: str = None):
+@click.option('--socket', 'socket_path', help='Daemon socket (default: $COGENBAI_SOCKET or per-user runtime dir)')
+@click.option('--no-daemon', is_flag=True, help='Always load the model in-process')
+def generate(prompt: str, language: str, framework: str = None,
+             socket_path: str = None, no_daemon: bool = False):
     """Generate code from a prompt"""
+    from .daemon import DaemonClient, DaemonUnavailable
+    if not no_daemon:
+        try:
+            result = DaemonClient(socket_path).generate(
+                prompt=prompt, language=language, framework=framework
+            )
+            click.echo(result)
+            return
+        except DaemonUnavailable:
+            pass
+        except RuntimeError as e:  # no private place for the default socket
+            click.echo(f"Not using the daemon: {e}", err=True)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+    # Imported here so that commands which don't need the model stay fast
+    from ..core.model import CogenBAI
     model = CogenBAI()
-    result = model.generate_code(prompt, language)
+    result = model.generate_code(prompt, language, framework)
     click.echo(result)
 
+@cli.command()
+@click.option('--socket', 'socket_path', help='Socket to listen on (default: $COGENBAI_SOCKET or per-user runtime dir)')
+@click.option('--model', 'model_name', help='Model to keep resident (default: CogenConfig.model_name)')
+def serve(socket_path: str = None, model_name: str = None):
+    """Keep the model loaded and serve `generate` over a Unix socket"""
+    from .daemon import InferenceDaemon, default_socket_path
+
+    def load_model():
+        from ..core.model import CogenBAI
+        config = CogenConfig()
+        return CogenBAI(model_name or config.model_name, config=config)
+
+    try:
+        daemon = InferenceDaemon(socket_path or default_socket_path(), load_model)
+        daemon.start()
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Serving on {daemon.socket_path}", err=True)
+    # Exit through serve_forever's cleanup (socket removal) on `kill` as well
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+@cli.command()
+@click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('output_path', type=click.Path(dir_okay=False))
+@click.option('--batch-size', '-b', type=int, help='Prompts per model batch (default: CogenConfig.batch_size)')
+@click.option('--shards', '-j', default=1, show_default=True, help='Worker processes, each with its own model')
+@click.option('--model', 'model_name', help='Model to use (default: CogenConfig.model_name)')
+def batch(input_path: str, output_path: str, batch_size: int = None, shards: int = 1, model_name: str = None):
+    """Generate code for every prompt in a JSONL file
+
+    Results are appended to OUTPUT_PATH as they finish; re-running the same
+    command skips prompts that already have a result.
+    """
+    from ..core.bulk import run_bulk_generation
+
+    def progress(report):
+        click.echo(f"\r{report.processed} done, {report.failed} failed, "
+                   f"{report.prompts_per_second:.2f} prompts/s", nl=False, err=True)
+
+    report = run_bulk_generation(input_path, output_path, model_name=model_name,
+                                 batch_size=batch_size, num_shards=shards, progress=progress)
+    click.echo(err=True)
+    click.echo(f"Processed {report.processed} prompts ({report.failed} failed, "
+               f"{report.skipped} already done) in {report.elapsed:.1f}s")
+    click.echo(f"{report.prompts_per_second:.2f} prompts/s, {report.tokens_per_second:.1f} tokens/s")
+
+@cli.command()
+@click.argument('path', type=click.Path(exists=True))
+@click.option('--workers', '-j', type=int, help='Review processes (default: CogenConfig.num_workers)')
+@click.option('--output', '-o', 'output_path', type=click.Path(dir_okay=False), help='Write NDJSON here instead of stdout')
+@click.option('--cache', 'cache_path', type=click.Path(dir_okay=False),
+              help='SQLite review cache; later runs only re-analyze changed definitions')
+@click.option('--rules', 'rules_path', type=click.Path(exists=True),
+              help='Security rule file or directory, added to the built-in rules')
+def review(path: str, workers: int = None, output_path: str = None, cache_path: str = None,
+           rules_path: str = None):
+    """Review every source file under PATH
+
+    Prints one JSON line per file as it finishes; languages are taken from
+    CogenConfig.language_extensions.
+    """
+    from ..review.batch import run_batch_review
+
+    out = open(output_path, 'w', encoding='utf-8') if output_path else sys.stdout
+    try:
+        report = run_batch_review(path, out, num_workers=workers, cache_path=cache_path, rules_path=rules_path)
+    finally:
+        if output_path:
+            out.close()
+    click.echo(f"Reviewed {report.files} files ({report.failed} failed, {report.lines} lines) "
+               f"in {report.elapsed:.1f}s, {report.files_per_second:.1f} files/s", err=True)
+
+@cli.command()
+@click.argument('path', type=click.Path(exists=True))
+@click.argument('output_dir', type=click.Path(file_okay=False))
+@click.option('--workers', '-j', type=int, help='Generator processes (default: CogenConfig.num_workers)')
+@click.option('--format', 'format_output', is_flag=True, help='Run the output through the Python formatting pipeline')
+def generate_tests(path: str, output_dir: str, workers: int = None, format_output: bool = False):
+    """Write unittest skeletons for every Python module under PATH
+
+    Each module gets OUTPUT_DIR/test_<dotted_module>.py, with one TestCase
+    for its functions and one per class; files are written as they finish.
+    """
+    from ..testing.batch import run_batch_generation
+
+    def progress(report):
+        click.echo(f"\r{report.files} files, {report.written} written, "
+                   f"{report.files_per_second:.1f} files/s", nl=False, err=True)
+
+    report = run_batch_generation(path, output_dir, num_workers=workers, format_output=format_output,
+                                  progress=progress)
+    click.echo(err=True)
+    click.echo(f"Wrote {report.tests} tests in {report.written} files for {report.files} modules "
+               f"({report.failed} failed) in {report.elapsed:.1f}s, {report.files_per_second:.1f} files/s")
+
+@cli.command()
+@click.argument('source')
+@click.argument('destination', type=click.Path(file_okay=False))
+@click.option('--dtype', type=click.Choice(['fp32', 'fp16', 'bf16']), help='Cast weights before writing (default: keep)')
+def convert_weights(source: str, destination: str, dtype: str = None):
+    """Rewrite a checkpoint as safetensors for memory-mapped loading
+
+    Point CogenConfig.model_name at DESTINATION and set mmap_weights=True.
+    """
+    from ..core.weights import convert_checkpoint
+    for path in convert_checkpoint(source, destination, dtype):
+        click.echo(f"Wrote {path} ({os.path.getsize(path) / 1024 ** 2:.0f} MB)")
+
 @cli.command()
 def list_languages():
     """List supported programming languages"""
@@ -41,7 +175,6 @@ def scaffold(project_name: str, template: str, description: str):
         return
     
     # Create project structure
-    import os
     import json
     structure = json.loads(template_data)['structure']
     base_path = os.path.join(os.getcwd(), project_name)
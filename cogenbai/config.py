@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 import os
 
@@ -52,6 +52,7 @@ class CogenConfig:
         "java": [".java"],
         "rust": [".rs"],
         "go": [".go"],
+        "c": [".c"],
         "cpp": [".cpp", ".hpp", ".cc", ".h"],
         "csharp": [".cs"],
         "php": [".php"],
@@ -68,8 +69,70 @@ class CogenConfig:
     
     # Performance settings
     use_gpu: bool = True
+    precision: str = "fp32"  # fp32, bf16 or int8 (dynamic quantization, CPU only)
+    num_threads: Optional[int] = None  # torch intra-op threads; None keeps the default
+    mmap_weights: bool = False  # memory-map safetensors weights, shared across processes
     batch_size: int = 1
+    batch_wait_ms: float = 10.0
     num_workers: int = 4
+    inference_queue_size: int = 32
+    preload_model: bool = True  # load the API model in the background at startup
+    prefix_cache_max_bytes: int = 2 * 1024 ** 3  # 0 disables prefix KV caching
+    early_stopping: bool = True  # stop decoding once the answer is complete
+    project_context_tokens: int = 1024  # budget for retrieved project snippets; 0 includes all
+    projects_db_path: str = "cogenbai_projects.db"  # SQLite file of the project tracker
+
+    # Speculative decoding of deterministic requests: "ngram" (prompt lookup) or "draft"
+    speculative_decoding: Optional[str] = None
+    speculative_tokens: int = 8  # tokens drafted per verification pass
+    speculative_ngram_size: int = 3
+    draft_model_name: Optional[str] = None  # small model sharing the main tokenizer
+
+    # Result cache (only deterministic or seeded generations are cached)
+    result_cache_enabled: bool = False
+    result_cache_size: int = 1024
+    result_cache_ttl: float = 3600.0
+    result_cache_path: Optional[str] = None  # SQLite file for the persistent tier
+    result_cache_disk_size: int = 100_000  # rows kept in the persistent tier, oldest dropped first
+
+    # Review cache: results per top-level Python definition, reused while its text is unchanged
+    review_cache_size: int = 4096  # 0 disables
+    review_cache_path: Optional[str] = None  # SQLite file shared by review workers
+    security_rules_path: Optional[str] = None  # rule file or directory added to the built-in security rules
+
+    # Formatting: passes run in order per language (see optimization/formatting.py);
+    # passes missing from this machine are skipped
+    format_pipelines: Dict[str, List[str]] = field(default_factory=lambda: {
+        "python": ["black"],
+        "javascript": ["prettier"],
+        "typescript": ["prettier-ts"],
+        "go": ["gofmt"],
+        "rust": ["rustfmt"],
+        "c": ["clang-format-c"],
+        "cpp": ["clang-format"],
+        "java": ["google-java-format"],
+        "kotlin": ["ktlint"],
+    })
+    format_cache_size: int = 1024  # per-pass results remembered by content hash; 0 disables
+    # Formatter executables usable as passes (see optimization/external.py). Go, Rust and
+    # C/C++ are formatted by pooled language servers (gopls, rust-analyzer, clangd) kept
+    # running between snippets, falling back to one gofmt/rustfmt/clang-format run per
+    # snippet when the server is not installed. prettier, google-java-format and ktlint
+    # have no daemon or formatting server mode, so they start a new process (and for
+    # google-java-format and ktlint, a new JVM) for every snippet
+    external_formatters: Dict[str, Dict[str, Any]] = field(default_factory=lambda: {
+        "prettier": {"command": ["prettier", "--stdin-filepath", "snippet.js"]},
+        "prettier-ts": {"command": ["prettier", "--stdin-filepath", "snippet.ts"]},
+        "gofmt": {"command": ["gopls"], "mode": "lsp", "filename": "snippet.go", "fallback": ["gofmt"]},
+        "rustfmt": {"command": ["rust-analyzer"], "mode": "lsp", "filename": "snippet.rs",
+                    "fallback": ["rustfmt", "--emit", "stdout", "--edition", "2021"]},
+        "clang-format-c": {"command": ["clangd"], "mode": "lsp", "filename": "snippet.c",
+                           "fallback": ["clang-format", "--assume-filename=snippet.c"]},
+        "clang-format": {"command": ["clangd"], "mode": "lsp", "filename": "snippet.cpp",
+                         "fallback": ["clang-format", "--assume-filename=snippet.cpp"]},
+        "google-java-format": {"command": ["google-java-format", "-"]},
+        "ktlint": {"command": ["ktlint", "--stdin", "--format", "--log-level=error"]},
+    })
     
     @classmethod
     def load(cls, config_path: str) -> 'CogenConfig':
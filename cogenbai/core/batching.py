@@ -0,0 +1,128 @@
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+
+
+@dataclass
+class GenerationRequest:
+    prompt: str
+    language: str
+    framework: Optional[str] = None
+    max_length: int = 1024
+    temperature: float = 0.7
+    top_p: float = 0.95
+    deterministic: bool = False
+
+
+@dataclass
+class GenerationResult:
+    code: str
+    num_tokens: int
+    cached: bool = False
+
+
+class BatchScheduler:
+    """
+    Collects concurrent generation requests and runs them as one padded
+    ``generate`` call.
+
+    A batch is closed as soon as ``batch_size`` requests are waiting or
+    ``max_wait_ms`` has passed since the first request of the batch arrived,
+    whichever comes first. Sampling parameters and max lengths are applied
+    per row by ``CogenBAI.generate_batch``, so requests with different
+    settings can share a batch.
+    """
+
+    def __init__(self, model, batch_size: int = 1, max_wait_ms: float = 10.0):
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Optional[Tuple[GenerationRequest, Future]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._max_batch = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="cogenbai-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, request: GenerationRequest) -> Future:
+        """Queue a request and return a future resolving to its GenerationResult."""
+        if self._closed:
+            raise RuntimeError("Batch scheduler is shut down")
+        # Validate up front so one bad request cannot fail a whole batch
+        self.model.build_prompt(request.prompt, request.language, request.framework)
+        future: Future = Future()
+        self._queue.put((request, future))
+        return future
+
+    def generate(self, request: GenerationRequest) -> str:
+        """Blocking helper returning only the generated code."""
+        return self.submit(request).result().code
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            mean_batch = self._requests / self._batches if self._batches else 0.0
+            return {
+                "batch_size": self.batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": self._batches,
+                "requests": self._requests,
+                "pending": self._queue.qsize(),
+                "mean_batch_size": mean_batch,
+                "max_batch_size": self._max_batch,
+                "occupancy": mean_batch / self.batch_size,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._closed = True
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._execute(batch)
+            if stop:
+                return
+
+    def _execute(self, batch: List[Tuple[GenerationRequest, Future]]):
+        # Drop requests whose callers cancelled while waiting
+        batch = [(req, fut) for req, fut in batch if fut.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            results = self.model.generate_batch([req for req, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+        else:
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
+
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._max_batch = max(self._max_batch, len(batch))
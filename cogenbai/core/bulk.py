@@ -0,0 +1,180 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import json
+import multiprocessing
+import os
+import time
+
+from ..config import CogenConfig
+from .batching import GenerationRequest
+
+_REQUEST_FIELDS = ("prompt", "language", "framework", "max_length", "temperature", "top_p", "deterministic")
+
+
+@dataclass
+class BulkReport:
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    generated_tokens: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def prompts_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.generated_tokens / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "prompts_per_second": self.prompts_per_second,
+            "tokens_per_second": self.tokens_per_second,
+        }
+
+
+def run_bulk_generation(input_path: str, output_path: str,
+                        model: Any = None,
+                        model_name: Optional[str] = None,
+                        config: Optional[CogenConfig] = None,
+                        batch_size: Optional[int] = None,
+                        num_shards: int = 1,
+                        progress: Optional[Callable[[BulkReport], None]] = None) -> BulkReport:
+    """
+    Generate code for every prompt in a JSONL file.
+
+    Each input line is an object with ``prompt`` and ``language`` and,
+    optionally, ``id``, ``framework``, ``max_length``, ``temperature``,
+    ``top_p`` and ``deterministic``. Without an ``id`` the line number is
+    used. One result line per prompt is appended to ``output_path`` as soon as
+    its batch finishes. Items already present in the output are skipped, so an
+    interrupted run resumes where it stopped.
+
+    With ``num_shards > 1`` batches are spread over that many worker
+    processes, each loading its own copy of the model; otherwise ``model``
+    (or a model loaded in-process) is used.
+    """
+    config = config or CogenConfig()
+    batch_size = batch_size or config.batch_size
+    report = BulkReport()
+    done = _completed_ids(output_path)
+    start = time.perf_counter()
+
+    def batches() -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        batch = []
+        for item_id, item in _read_items(input_path):
+            if item_id in done:
+                report.skipped += 1
+                continue
+            batch.append((item_id, item))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        def write(records: List[Dict[str, Any]]):
+            for record in records:
+                out.write(json.dumps(record) + "\n")
+                if "error" in record:
+                    report.failed += 1
+                else:
+                    report.processed += 1
+                    report.generated_tokens += record["num_tokens"]
+            out.flush()
+            os.fsync(out.fileno())
+            report.elapsed = time.perf_counter() - start
+            if progress:
+                progress(report)
+
+        if num_shards <= 1:
+            if model is None:
+                from .model import CogenBAI
+                model = CogenBAI(model_name or config.model_name, config=config)
+            for batch in batches():
+                write(_generate_batch(model, batch))
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(num_shards, mp_context=context, initializer=_init_worker,
+                                     initargs=(model_name or config.model_name, asdict(config))) as pool:
+                in_flight: Set = set()
+                for batch in batches():
+                    # Keep a bounded number of batches queued so the input is streamed
+                    if len(in_flight) >= 2 * num_shards:
+                        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            write(future.result())
+                    in_flight.add(pool.submit(_worker_generate, batch))
+                for future in wait(in_flight).done:
+                    write(future.result())
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _read_items(input_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            yield str(item.get("id", line_number)), item
+
+
+def _completed_ids(output_path: str) -> Set[str]:
+    """Ids already written successfully; also drops a torn last line from a crash."""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+    for line in data.decode("utf-8").splitlines():
+        if line.strip():
+            record = json.loads(line)
+            if "error" not in record:
+                done.add(record["id"])
+    return done
+
+
+def _generate_batch(model: Any, batch: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    valid = []
+    for item_id, item in batch:
+        try:
+            request = GenerationRequest(**{k: item[k] for k in _REQUEST_FIELDS if k in item})
+            model.build_prompt(request.prompt, request.language, request.framework)
+            valid.append((len(records), request))
+            records.append({"id": item_id})
+        except (TypeError, ValueError) as e:
+            records.append({"id": item_id, "error": str(e)})
+
+    if valid:
+        try:
+            results = model.generate_batch([request for _, request in valid])
+        except Exception as e:
+            for index, _ in valid:
+                records[index]["error"] = str(e)
+        else:
+            for (index, _), result in zip(valid, results):
+                records[index].update(code=result.code, num_tokens=result.num_tokens)
+    return records
+
+
+_worker_model = None
+
+
+def _init_worker(model_name: str, config_dict: Dict[str, Any]):
+    global _worker_model
+    from .model import CogenBAI
+    _worker_model = CogenBAI(model_name, config=CogenConfig(**config_dict))
+
+
+def _worker_generate(batch: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return _generate_batch(_worker_model, batch)
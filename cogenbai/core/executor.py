@@ -0,0 +1,153 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+import asyncio
+import math
+import threading
+import time
+
+_DONE = object()
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the admission queue is full; ``retry_after`` is in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Runs blocking model calls on dedicated worker threads so the asyncio
+    event loop (and the collaboration websockets on it) stays responsive.
+
+    At most ``max_queue_size`` calls may wait for a worker; further calls
+    are rejected with InferenceQueueFull instead of piling up.
+    """
+
+    def __init__(self, max_workers: int = 1, max_queue_size: int = 32):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max_queue_size
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                        thread_name_prefix="cogenbai-inference")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on a worker thread and await its result."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        self._admit()
+        enqueued = time.monotonic()
+        future = self._pool.submit(self._call, enqueued, fn, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def stream(self, fn: Callable[..., Iterator[Any]], *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        Drain the generator returned by ``fn`` on a worker thread and relay its
+        items to the event loop.
+
+        Admission happens immediately, so InferenceQueueFull is raised here
+        rather than on first iteration. Must be called from a running loop.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def post(item):
+            try:
+                loop.call_soon_threadsafe(events.put_nowait, item)
+            except RuntimeError:
+                # The loop is gone; nobody is listening any more
+                cancelled.set()
+
+        def drain():
+            # _DONE is posted however this ends, even if fn raises before yielding
+            try:
+                items = iter(fn(*args, **kwargs))
+                try:
+                    for item in items:
+                        if cancelled.is_set():
+                            break
+                        post(item)
+                finally:
+                    if hasattr(items, "close"):
+                        items.close()
+            finally:
+                post(_DONE)
+
+        future = self.submit(drain)
+        return self._relay(events, future, cancelled)
+
+    async def _relay(self, events: asyncio.Queue, future: Future,
+                     cancelled: threading.Event) -> AsyncIterator[Any]:
+        try:
+            while True:
+                item = await events.get()
+                if item is _DONE:
+                    break
+                yield item
+            await asyncio.wrap_future(future)
+        finally:
+            cancelled.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": (self._total_wait / started * 1000.0) if started else 0.0,
+                "max_wait_ms": self._max_wait * 1000.0,
+                "avg_run_ms": (self._total_run / self._completed * 1000.0) if self._completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def _admit(self):
+        with self._lock:
+            if self._queued >= self.max_queue_size:
+                self._rejected += 1
+                raise InferenceQueueFull(self._retry_after())
+            self._queued += 1
+
+    def _retry_after(self) -> int:
+        # Rough estimate of how long the current backlog takes to drain
+        avg_run = self._total_run / self._completed if self._completed else 1.0
+        backlog = (self._queued + self._running) / self.max_workers
+        return max(1, math.ceil(avg_run * backlog))
+
+    def _call(self, enqueued: float, fn: Callable[..., Any], args, kwargs) -> Any:
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            wait = started - enqueued
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._total_run += time.monotonic() - started
+
+    def _on_done(self, future: Future):
+        # A call cancelled before it started never reached _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
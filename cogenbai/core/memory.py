@@ -0,0 +1,22 @@
+from typing import Any, Dict
+import os
+
+
+def memory_usage() -> Dict[str, Any]:
+    """Resident memory of this process in MB, split into private and file-backed pages."""
+    usage: Dict[str, Any] = {"pid": os.getpid()}
+    fields = {"VmRSS": "rss_mb", "VmHWM": "peak_rss_mb", "RssAnon": "rss_anon_mb", "RssFile": "rss_file_mb"}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key = line.split(":", 1)[0]
+                if key in fields:
+                    usage[fields[key]] = int(line.split()[1]) / 1024.0
+        # Proportional set size: shared pages are split between the processes mapping them
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    usage["pss_mb"] = int(line.split()[1]) / 1024.0
+    except OSError:
+        pass  # not Linux
+    return usage
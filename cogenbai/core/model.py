@@ -1,9 +1,93 @@
 import torch
 from torch import nn
-from transformers import AutoModelForCausalLM, AutoTokenizer
-from typing import Optional, Dict, Any
+from transformers import (
+    AutoTokenizer, LogitsProcessor, LogitsProcessorList,
+    StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+)
+from typing import Optional, Dict, Any, List, Iterator, Tuple
 from datetime import datetime
+import copy
+import threading
+import time
+from ..config import CogenConfig
 from ..languages.generator import LanguageGenerator
+from ..optimization.formatting import FormattingService
+from ..storage.project_tracker import ProjectTracker, ProjectState
+from .batching import GenerationRequest, GenerationResult
+from .precision import load_causal_lm
+from .prefix_cache import PrefixCache
+from .result_cache import GenerationCache
+from .speculative import (
+    SPECULATIVE_MODES, DraftModelDrafter, NgramDrafter, SpeculativeDecoder, SpeculativeStats
+)
+from .stopping import CompletionStoppingCriteria, EarlyStoppingStats, detector_for
+from .memory import memory_usage
+
+# Project context stops looking for snippets below this many free tokens,
+# or after this many candidates in a row were too long for what is left
+_MIN_SNIPPET_TOKENS = 8
+_MAX_CONTEXT_MISSES = 8
+
+
+class RowwiseSamplingProcessor(LogitsProcessor):
+    """Applies a separate temperature and top-p to every row of a batch."""
+
+    def __init__(self, temperatures: torch.Tensor, top_ps: torch.Tensor):
+        self.temperatures = temperatures
+        self.top_ps = top_ps
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        greedy = self.temperatures <= 0
+        temperatures = torch.where(greedy, torch.ones_like(self.temperatures), self.temperatures)
+        scores = scores / temperatures[:, None]
+
+        # Nucleus filtering, same as TopPLogitsWarper but with a per-row threshold
+        sorted_logits, sorted_indices = torch.sort(scores, descending=False, dim=-1)
+        cumulative_probs = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+        sorted_to_remove = cumulative_probs <= (1 - self.top_ps)[:, None]
+        sorted_to_remove[:, -1] = False
+        to_remove = sorted_to_remove.scatter(1, sorted_indices, sorted_to_remove)
+        scores = scores.masked_fill(to_remove, -float("inf"))
+
+        # Rows with temperature <= 0 decode greedily
+        if greedy.any():
+            best = scores.argmax(dim=-1, keepdim=True)
+            keep = torch.zeros_like(scores, dtype=torch.bool).scatter(1, best, True)
+            scores = torch.where(greedy[:, None] & ~keep, torch.full_like(scores, -float("inf")), scores)
+        return scores
+
+
+class SeededSamplingProcessor(LogitsProcessor):
+    """
+    Samples with the request's own ``torch.Generator`` under greedy decoding.
+
+    Adding Gumbel noise to the filtered logits makes their argmax a sample
+    from softmax(logits / temperature), so a seed reproduces one output no
+    matter how many other requests sample from the global RNG meanwhile.
+    """
+
+    def __init__(self, temperature: float, top_p: float, seed: int, device: str):
+        self.filter = RowwiseSamplingProcessor(
+            torch.tensor([temperature], dtype=torch.float, device=device),
+            torch.tensor([top_p], dtype=torch.float, device=device),
+        )
+        self.generator = torch.Generator(device=device).manual_seed(seed)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        scores = self.filter(input_ids, scores.float())
+        uniform = torch.rand(scores.shape, generator=self.generator, device=scores.device)
+        return scores - torch.log(-torch.log(uniform.clamp_min(1e-20)))
+
+
+class StopOnEvent(StoppingCriteria):
+    """Ends generation once ``event`` is set, e.g. when a stream consumer goes away."""
+
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        return self.event.is_set()
+
 
 class CogenBAI(nn.Module):
     """
@@ -34,7 +118,10 @@ class CogenBAI(nn.Module):
         "developer": "Shahrear Hossain Shawon",
     }
 
-    def __init__(self, model_name: str = "codegen-16B-multi", device: str = "cuda"):
+    def __init__(self, model_name: str = "codegen-16B-multi", device: str = "cuda",
+                 config: Optional[CogenConfig] = None,
+                 project_tracker: Optional[ProjectTracker] = None,
+                 formatter: Optional[FormattingService] = None):
         """
         Initialize the CogenBAI model.
         
@@ -42,11 +129,39 @@ class CogenBAI(nn.Module):
         Shahrear Hossain Shawon from International Islamic University Chittagong.
         """
         super().__init__()
+        self.config = config or CogenConfig()
+        self.model_name = model_name
         self.device = "cuda" if torch.cuda.is_available() and device == "cuda" else "cpu"
+        start = time.perf_counter()
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForCausalLM.from_pretrained(model_name).to(self.device)
+        self.model = load_causal_lm(model_name, self.config.precision, self.device,
+                                    self.config.num_threads, self.config.mmap_weights)
+        self.startup_seconds = time.perf_counter() - start
+        # Batched generation needs left padding so every row ends at the same position
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.prefix_cache = (
+            PrefixCache(self.config.prefix_cache_max_bytes)
+            if self.config.prefix_cache_max_bytes > 0 else None
+        )
+        self.result_cache = (
+            GenerationCache(self.config.result_cache_size,
+                            self.config.result_cache_ttl,
+                            self.config.result_cache_path,
+                            self.config.result_cache_disk_size)
+            if self.config.result_cache_enabled else None
+        )
+        self.early_stopping = EarlyStoppingStats()
+        self.draft_model = (
+            load_causal_lm(self.config.draft_model_name, self.config.precision, self.device,
+                           mmap=self.config.mmap_weights)
+            if self.config.draft_model_name else None
+        )
+        self.speculative = SpeculativeStats()
         self.lang_generator = LanguageGenerator()
-        self.project_tracker = ProjectTracker()
+        self.project_tracker = project_tracker or ProjectTracker(self.config.projects_db_path)
+        self.formatter = formatter or FormattingService.from_config(self.config)
         from ..languages.modern_frameworks import ModernFrameworkSupport
         self.modern_frameworks = ModernFrameworkSupport()
         
@@ -66,13 +181,31 @@ class CogenBAI(nn.Module):
             "contact": cls.__contact__
         }
 
+    def memory_stats(self) -> Dict[str, Any]:
+        """Model load time and this process's resident memory."""
+        return {
+            "weights": "mmap" if self.config.mmap_weights else "copy",
+            "precision": self.config.precision,
+            "startup_seconds": self.startup_seconds,
+            **memory_usage()
+        }
+
     def generate_code(self, prompt: str, language: str, 
                      framework: Optional[str] = None,
                      max_length: int = 1024,
                      temperature: float = 0.7,
-                     top_p: float = 0.95) -> str:
+                     top_p: float = 0.95,
+                     context: Optional[str] = None,
+                     deterministic: bool = False,
+                     seed: Optional[int] = None,
+                     speculative: Optional[str] = None) -> str:
         """
         Generate code based on the given prompt and parameters.
+
+        Results are served from the result cache when it is enabled and the
+        call is reproducible, i.e. ``deterministic`` (greedy decoding) or a
+        ``seed`` is given. Deterministic calls can use speculative decoding,
+        which returns the same code in fewer forward passes of the model.
         
         Args:
             prompt (str): The coding task description
@@ -81,68 +214,359 @@ class CogenBAI(nn.Module):
             max_length (int): Maximum length of generated code
             temperature (float): Sampling temperature
             top_p (float): Nucleus sampling parameter
+            context (Optional[str]): Shared context placed before the prompt,
+                e.g. existing project code; cached in the prefix cache
+            deterministic (bool): Decode greedily, ignoring temperature and top_p
+            seed (Optional[int]): Seed for this request's own sampling generator
+            speculative (Optional[str]): "ngram" (prompt lookup) or "draft"
+                (draft model); defaults to CogenConfig.speculative_decoding.
+                Ignored unless ``deterministic``
             
         Returns:
             str: Generated code
         """
-        # Validate language and framework
-        lang_config = self.lang_generator.get_language_config(language)
-        if not lang_config:
-            raise ValueError(f"Unsupported language: {language}")
-        
-        if framework and framework not in lang_config["frameworks"]:
-            raise ValueError(f"Unsupported framework {framework} for {language}")
-        
-        # Prepare prompt with language and framework context
-        context = f"Generate {language} code"
-        if framework:
-            context += f" using {framework}"
-        formatted_prompt = f"{context}:\n{prompt}\n\nSolution:\n"
+        speculative = speculative or self.config.speculative_decoding
+        if speculative and speculative not in SPECULATIVE_MODES:
+            raise ValueError(f"Unsupported speculative decoding mode: {speculative}")
+        cache_key = self._result_cache_key(prompt, language, framework, max_length,
+                                           temperature, top_p, context, deterministic, seed)
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        input_ids, past_key_values = self._encode(prompt, language, framework, context)
+
+        # Generate code, stopping as soon as the answer is complete
+        prompt_width = input_ids.shape[1]
+        completion = self._completion_criteria([language], prompt_width)
+        stopping = StoppingCriteriaList([completion] if completion else [])
+        if speculative and deterministic:
+            outputs = self._speculative_decoder(speculative).generate(
+                input_ids,
+                past_key_values=past_key_values,
+                max_new_tokens=max_length - prompt_width,
+                eos_token_id=self.tokenizer.eos_token_id,
+                stopping_criteria=stopping
+            )
+        else:
+            if deterministic:
+                sampling = {"do_sample": False}
+            elif seed is not None:
+                # Never touches the global RNG, which concurrent requests share
+                sampling = {"do_sample": False, "logits_processor": LogitsProcessorList([
+                    SeededSamplingProcessor(temperature, top_p, seed, self.device)
+                ])}
+            else:
+                sampling = {"do_sample": True, "temperature": temperature, "top_p": top_p}
+            outputs = self.model.generate(
+                input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                past_key_values=past_key_values,
+                max_length=max_length,
+                pad_token_id=self.tokenizer.eos_token_id,
+                num_return_sequences=1,
+                stopping_criteria=stopping,
+                **sampling
+            )
         
-        # Generate code
-        inputs = self.tokenizer(formatted_prompt, return_tensors="pt").to(self.device)
+        generated_code, _ = self._finish_row(outputs[0][prompt_width:], completion, 0,
+                                             max_length - prompt_width)
+        code = self._format_code(generated_code, language)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, code)
+        return code
+    
+    def generate_code_stream(self, prompt: str, language: str,
+                             framework: Optional[str] = None,
+                             max_length: int = 1024,
+                             temperature: float = 0.7,
+                             top_p: float = 0.95,
+                             context: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generate code, yielding decoded text as tokens arrive.
+
+        Yields ``{"type": "token", "text": ...}`` events (the first one also
+        carries ``ttft_ms``) followed by one ``{"type": "final", "code": ...}``
+        event holding the formatted code and timings. Closing the generator
+        early stops the underlying ``generate`` call.
+
+        Args:
+            prompt (str): The coding task description
+            language (str): Target programming language
+            framework (Optional[str]): Specific framework to use
+            max_length (int): Maximum length of generated code
+            temperature (float): Sampling temperature
+            top_p (float): Nucleus sampling parameter
+            context (Optional[str]): Shared context placed before the prompt
+
+        Returns:
+            Iterator[Dict[str, Any]]: Token events and a final event
+        """
+        start = time.perf_counter()
+        input_ids, past_key_values = self._encode(prompt, language, framework, context)
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        prompt_width = input_ids.shape[1]
+        completion = self._completion_criteria([language], prompt_width)
+        stop = threading.Event()
+        criteria = [StopOnEvent(stop)] + ([completion] if completion else [])
+        outputs = []
+        errors = []
+
+        def run():
+            try:
+                outputs.append(self.model.generate(
+                    input_ids,
+                    attention_mask=torch.ones_like(input_ids),
+                    past_key_values=past_key_values,
+                    max_length=max_length,
+                    temperature=temperature,
+                    top_p=top_p,
+                    do_sample=True,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    num_return_sequences=1,
+                    streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList(criteria)
+                ))
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        worker = threading.Thread(target=run, name="cogenbai-stream", daemon=True)
+        worker.start()
+        ttft_ms = None
+        chunks = []
+        try:
+            for text in streamer:
+                if not text:
+                    continue
+                chunks.append(text)
+                if ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - start) * 1000.0
+                    yield {"type": "token", "text": text, "ttft_ms": ttft_ms}
+                else:
+                    yield {"type": "token", "text": text}
+        finally:
+            stop.set()
+            worker.join()
+        if errors:
+            raise errors[0]
+
+        # Tokens already streamed may run past the end of the answer; the final code does not
+        generated_code, _ = self._finish_row(outputs[0][0, prompt_width:], completion, 0,
+                                             max_length - prompt_width)
+        yield {
+            "type": "final",
+            "code": self._format_code(generated_code, language),
+            "ttft_ms": ttft_ms,
+            "total_ms": (time.perf_counter() - start) * 1000.0
+        }
+
+    def generate_batch(self, requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """
+        Generate code for several requests in one padded ``generate`` call.
+
+        Each request keeps its own temperature, top_p and max_length.
+        Deterministic requests decode greedily and are answered from the
+        result cache when possible; only the misses reach the model.
+
+        Args:
+            requests (List[GenerationRequest]): Requests to run together
+
+        Returns:
+            List[GenerationResult]: One result per request, in the same order
+        """
+        results: List[Optional[GenerationResult]] = [None] * len(requests)
+        keys = [
+            self._result_cache_key(r.prompt, r.language, r.framework, r.max_length,
+                                   r.temperature, r.top_p, None, r.deterministic, None)
+            for r in requests
+        ]
+        for i, key in enumerate(keys):
+            if key is not None:
+                cached = self.result_cache.get(key)
+                if cached is not None:
+                    results[i] = GenerationResult(code=cached, num_tokens=0, cached=True)
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            generated = self._generate_rows([requests[i] for i in pending])
+            for i, result in zip(pending, generated):
+                results[i] = result
+                if keys[i] is not None:
+                    self.result_cache.put(keys[i], result.code)
+        return results
+
+    def _generate_rows(self, requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """Run one padded generate call over ``requests``."""
+        prompts = [self.build_prompt(r.prompt, r.language, r.framework) for r in requests]
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.device)
+        padded_len = inputs.input_ids.shape[1]
+        prompt_lens = inputs.attention_mask.sum(dim=1).tolist()
+        budgets = [max(r.max_length - n, 0) for r, n in zip(requests, prompt_lens)]
+
+        sampling = RowwiseSamplingProcessor(
+            torch.tensor([0.0 if r.deterministic else r.temperature for r in requests],
+                         dtype=torch.float, device=self.device),
+            torch.tensor([r.top_p for r in requests], dtype=torch.float, device=self.device),
+        )
+        completion = self._completion_criteria([r.language for r in requests], padded_len, budgets)
         outputs = self.model.generate(
             inputs.input_ids,
-            max_length=max_length,
-            temperature=temperature,
-            top_p=top_p,
+            attention_mask=inputs.attention_mask,
+            max_new_tokens=max(max(budgets), 1),
             do_sample=True,
-            pad_token_id=self.tokenizer.eos_token_id,
-            num_return_sequences=1
+            temperature=1.0,
+            top_p=1.0,
+            logits_processor=LogitsProcessorList([sampling]),
+            pad_token_id=self.tokenizer.pad_token_id,
+            num_return_sequences=1,
+            stopping_criteria=StoppingCriteriaList([completion] if completion else [])
         )
-        
-        generated_code = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        return self._format_code(generated_code, language)
-    
-    def continue_project(self, project_id: str, new_feature_description: str) -> str:
-        """Continue development of an existing project."""
-        project = self.project_tracker.get_project(project_id)
+
+        results = []
+        for i, (row, request, budget) in enumerate(zip(outputs, requests, budgets)):
+            text, num_tokens = self._finish_row(row[padded_len:padded_len + budget], completion, i, budget)
+            results.append(GenerationResult(
+                code=self._format_code(text, request.language),
+                num_tokens=num_tokens
+            ))
+        return results
+
+    def _completion_criteria(self, languages: List[str], prompt_width: int,
+                             budgets: Optional[List[int]] = None) -> Optional[CompletionStoppingCriteria]:
+        """Per-row early stopping driven by the language configs, or None when disabled."""
+        if not self.config.early_stopping:
+            return None
+        detectors = [
+            # The prompt format itself marks the start of a new, unrequested answer
+            detector_for(self.lang_generator.get_language_config(language),
+                         ["\nSolution:", f"\nGenerate {language} code"])
+            for language in languages
+        ]
+        return CompletionStoppingCriteria(self.tokenizer, prompt_width, detectors, budgets)
+
+    def _finish_row(self, new_tokens: torch.Tensor, completion: Optional[CompletionStoppingCriteria],
+                    row: int, budget: int) -> Tuple[str, int]:
+        """Decode one row's generated tokens, cut at the end of the answer; returns (text, num_tokens)."""
+        eos = (new_tokens == self.tokenizer.eos_token_id).nonzero()
+        num_tokens = int(eos[0]) if len(eos) else len(new_tokens)
+        stopped_at = completion.stopped_at[row] if completion else None
+        if stopped_at is not None:
+            num_tokens = min(num_tokens, stopped_at)
+        text = self.tokenizer.decode(new_tokens[:num_tokens], skip_special_tokens=True)
+        if completion:
+            text = completion.trim(row, text)
+        self.early_stopping.record(num_tokens, budget, stopped_at is not None)
+        return text, num_tokens
+
+    def _result_cache_key(self, prompt: str, language: str, framework: Optional[str],
+                          max_length: int, temperature: float, top_p: float,
+                          context: Optional[str], deterministic: bool,
+                          seed: Optional[int]) -> Optional[str]:
+        """Key for the result cache, or None when the call is not cacheable."""
+        if self.result_cache is None or not (deterministic or seed is not None):
+            return None
+        if deterministic:
+            # Greedy decoding does not depend on the sampling parameters
+            temperature, top_p, seed = None, None, None
+        # Early stopping and the formatter passes change the returned text too
+        return GenerationCache.make_key(
+            model=self.model_name, precision=self.config.precision, prompt=prompt, language=language,
+            framework=framework, max_length=max_length, temperature=temperature,
+            top_p=top_p, context=context, seed=seed, early_stopping=self.config.early_stopping,
+            formatting=self.formatter.pipelines.get(language.lower(), [])
+        )
+
+    def build_prompt(self, prompt: str, language: str, framework: Optional[str] = None,
+                     context: Optional[str] = None) -> str:
+        """Validate language/framework and build the model prompt."""
+        return "".join(self._prompt_parts(prompt, language, framework, context))
+
+    def _prompt_parts(self, prompt: str, language: str, framework: Optional[str] = None,
+                      context: Optional[str] = None) -> Tuple[str, str]:
+        """Split the model prompt into a shareable prefix and the request-specific rest."""
+        self.lang_generator.validate_target(language, framework)
+
+        # Prepare prompt with language and framework context
+        header = f"Generate {language} code"
+        if framework:
+            header += f" using {framework}"
+        if context:
+            return f"{header}:\n{context}", f"\n\n{prompt}\n\nSolution:\n"
+        return f"{header}:\n", f"{prompt}\n\nSolution:\n"
+
+    def _encode(self, prompt: str, language: str, framework: Optional[str] = None,
+                context: Optional[str] = None) -> Tuple[torch.Tensor, Any]:
+        """Tokenize a prompt, reusing cached key/values for its prefix when possible."""
+        prefix, rest = self._prompt_parts(prompt, language, framework, context)
+        if self.prefix_cache is None:
+            inputs = self.tokenizer(prefix + rest, return_tensors="pt").to(self.device)
+            return inputs.input_ids, None
+
+        # Tokenized as one string, exactly as without the cache; the prefix is
+        # the tokens that end within it, so a token spanning the boundary
+        # belongs to the request-specific rest
+        encoding = self.tokenizer(prefix + rest, return_offsets_mapping=True)
+        ids = encoding.input_ids
+        split = next((i for i, (_, end) in enumerate(encoding.offset_mapping) if end > len(prefix)), len(ids))
+        prefix_ids = ids[:split]
+        cached, past_key_values = self.prefix_cache.lookup(prefix_ids)
+        if cached < len(prefix_ids):
+            # Prefill only the part of the prefix that is not cached yet
+            with torch.no_grad():
+                outputs = self.model(
+                    torch.tensor([prefix_ids[cached:]], device=self.device),
+                    past_key_values=past_key_values,
+                    use_cache=True
+                )
+            self.prefix_cache.insert(prefix_ids, outputs.past_key_values)
+            past_key_values = copy.deepcopy(outputs.past_key_values)
+        input_ids = torch.tensor([ids], device=self.device)
+        return input_ids, past_key_values
+
+    def _speculative_decoder(self, mode: str) -> SpeculativeDecoder:
+        if mode == "draft":
+            if self.draft_model is None:
+                raise ValueError("Draft-model decoding needs CogenConfig.draft_model_name")
+            drafter = DraftModelDrafter(self.draft_model)
+        else:
+            drafter = NgramDrafter(self.config.speculative_ngram_size)
+        return SpeculativeDecoder(self.model, drafter, self.config.speculative_tokens, self.speculative)
+
+    def continue_project(self, project_id: str, new_feature_description: str,
+                         deterministic: bool = False, speculative: Optional[str] = None) -> str:
+        """
+        Continue development of an existing project.
+
+        New code tends to repeat identifiers and lines of the project context,
+        so deterministic continuations gain the most from ``speculative="ngram"``.
+        """
+        project = self.project_tracker.get_project(project_id, include_snippets=False)
         if not project:
             raise ValueError(f"Project {project_id} not found")
 
         # Generate context from existing code
-        context = self._build_project_context(project)
+        context = self._build_project_context(project, new_feature_description)
         
-        # Generate new code
+        # Generate new code; the context prefix is served from the prefix cache
         new_code = self.generate_code(
-            prompt=f"{context}\n\nAdd feature: {new_feature_description}",
+            prompt=f"Add feature: {new_feature_description}",
             language=project.language,
-            framework=project.framework
+            framework=project.framework,
+            context=context,
+            deterministic=deterministic,
+            speculative=speculative
         )
 
-        # Update project state
-        project.code_snippets[new_feature_description] = new_code
-        project.last_modified = datetime.now()
-        self.project_tracker.update_project(project_id, {
-            "code_snippets": json.dumps(project.code_snippets),
-            "last_modified": project.last_modified.isoformat()
-        })
+        # Update project state; only the new feature's row is written
+        self.project_tracker.add_snippet(project_id, new_feature_description, new_code)
 
         return new_code
 
     def generate_deployment_config(self, project_id: str, platform: str) -> Dict[str, Any]:
         """Generate deployment configuration for modern frameworks."""
-        project = self.project_tracker.get_project(project_id)
+        project = self.project_tracker.get_project(project_id, include_snippets=False)
         if not project:
             raise ValueError(f"Project {project_id} not found")
 
@@ -154,13 +578,63 @@ class CogenBAI(nn.Module):
         except ValueError as e:
             raise ValueError(f"Deployment configuration failed: {str(e)}")
 
-    def _build_project_context(self, project: ProjectState) -> str:
-        """Build context from existing project code."""
+    def _build_project_context(self, project: ProjectState, query: str = "") -> str:
+        """Build context from the existing project code most relevant to ``query``."""
         context = f"Project: {project.name}\nLanguage: {project.language}\nFramework: {project.framework}\n\n"
         context += "Existing code:\n"
-        for feature, code in project.code_snippets.items():
-            context += f"\n# Feature: {feature}\n{code}\n"
-        return context
+        budget = self.config.project_context_tokens
+        if budget > 0:
+            ranked = self.project_tracker.relevant_snippets(project.project_id, query)
+            # Snippets sharing no term with the query still fill what is left, newest first
+            matched = set(ranked)
+            ranked += [feature for feature in self.project_tracker.snippet_features(project.project_id)
+                       if feature not in matched]
+            chosen = self._fill_context_budget(project.project_id, ranked, budget)
+            # Keep the project's own order so the code reads as it was written
+            snippets = self.project_tracker.get_snippets(project.project_id, chosen)
+        else:
+            snippets = self.project_tracker.get_snippets(project.project_id)
+        return context + "".join(self._snippet_section(feature, code) for feature, code in snippets.items())
+
+    def _fill_context_budget(self, project_id: str, ranked: List[str], budget: int) -> List[str]:
+        """
+        The best-ranked features whose sections fit in ``budget`` tokens.
+
+        Token counts are recorded in the project database, so only snippets
+        never measured before are fetched and tokenized. The search ends once
+        the budget can no longer hold a snippet or several candidates in a
+        row did not fit, instead of measuring the whole project.
+        """
+        tracker, tokenizer = self.project_tracker, self.model_name
+        chosen, counts, misses = [], {}, 0
+        for position, feature in enumerate(ranked):
+            if budget < _MIN_SNIPPET_TOKENS or misses >= _MAX_CONTEXT_MISSES:
+                break
+            if feature not in counts:
+                # Measure candidates a few at a time; the budget is usually filled early
+                window = ranked[position:position + 16]
+                counts.update(tracker.snippet_token_counts(project_id, tokenizer, window))
+                unknown = [name for name in window if name not in counts]
+                measured = [
+                    (name, code, len(self.tokenizer(self._snippet_section(name, code)).input_ids))
+                    for name, code in tracker.get_snippets(project_id, unknown).items()
+                ]
+                if measured:
+                    tracker.set_snippet_token_counts(project_id, tokenizer, measured)
+                counts.update((name, tokens) for name, _, tokens in measured)
+                if feature not in counts:
+                    continue  # deleted meanwhile
+            if counts[feature] <= budget:
+                chosen.append(feature)
+                budget -= counts[feature]
+                misses = 0
+            else:
+                misses += 1
+        return chosen
+
+    @staticmethod
+    def _snippet_section(feature: str, code: str) -> str:
+        return f"\n# Feature: {feature}\n{code}\n"
 
     def _format_code(self, code: str, language: str) -> str:
         """Format the generated code according to language standards."""
@@ -169,11 +643,4 @@ class CogenBAI(nn.Module):
             code = code.split("Solution:")[-1].strip()
         
         # Add language-specific formatting
-        if language == "python":
-            import black
-            try:
-                return black.format_str(code, mode=black.FileMode())
-            except:
-                return code
-                
-        return code
+        return self.formatter.format(code, language)
@@ -0,0 +1,81 @@
+from typing import Optional
+import gc
+import warnings
+import torch
+from torch import nn
+from transformers import AutoModelForCausalLM
+from .weights import load_mmap_causal_lm
+
+PRECISIONS = ("fp32", "bf16", "int8")
+
+
+def load_causal_lm(model_name: str, precision: str = "fp32", device: str = "cpu",
+                   num_threads: Optional[int] = None, mmap: bool = False) -> nn.Module:
+    """
+    Load a causal LM in the requested precision.
+
+    With ``mmap`` the weights of a local safetensors checkpoint are memory
+    mapped instead of copied (see ``weights.load_mmap_causal_lm``).
+
+    * ``fp32``: full precision weights.
+    * ``bf16``: weights loaded directly as bfloat16, halving memory.
+    * ``int8``: fp32 weights with every linear layer (except the output head)
+      replaced by a dynamically quantized int8 version. CPU only.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision} (expected one of {', '.join(PRECISIONS)})")
+    if precision == "int8" and device != "cpu":
+        raise ValueError("int8 dynamic quantization is only supported on CPU")
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    dtype = torch.bfloat16 if precision == "bf16" else torch.float32
+    if mmap:
+        model = load_mmap_causal_lm(model_name, dtype)
+    else:
+        model = AutoModelForCausalLM.from_pretrained(model_name, dtype=dtype, low_cpu_mem_usage=True)
+    if precision == "int8":
+        model = quantize_dynamic_int8(model)
+    return model.to(device).eval()
+
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """Quantize the linear layers of ``model`` to int8 with dynamic activation scales."""
+    _conv1d_to_linear(model)
+    # The output head stays in full precision; quantizing it costs the most accuracy
+    layers = {
+        name for name, module in model.named_modules()
+        if isinstance(module, nn.Linear) and module is not model.get_output_embeddings()
+    }
+    with warnings.catch_warnings():
+        # torch.ao.quantization warns about its planned move to torchao
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        torch.ao.quantization.quantize_dynamic(model, layers, dtype=torch.qint8, inplace=True)
+
+    # The remaining fp32 tensors may still be views into the memory-mapped
+    # checkpoint, which keeps the whole fp32 file resident; copy them out
+    with torch.no_grad():
+        for param in model.parameters():
+            param.data = param.data.clone()
+        for module in model.modules():
+            for name, buffer in module._buffers.items():
+                if buffer is not None:
+                    module._buffers[name] = buffer.clone()
+    # Free the replaced fp32 layers now rather than at the next GC cycle
+    gc.collect()
+    return model
+
+
+def _conv1d_to_linear(model: nn.Module):
+    """GPT-2 style models use transformers' Conv1D (a transposed linear layer); swap in nn.Linear."""
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if type(child).__name__ != "Conv1D":
+                continue
+            in_features, out_features = child.weight.shape
+            # Built on the meta device to skip allocating and initialising throwaway weights
+            linear = nn.Linear(in_features, out_features, device="meta")
+            linear.weight = nn.Parameter(child.weight.detach().t().contiguous(), requires_grad=False)
+            linear.bias = nn.Parameter(child.bias.detach().clone(), requires_grad=False)
+            setattr(parent, name, linear)
@@ -0,0 +1,194 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+import copy
+import threading
+import torch
+
+
+def cache_nbytes(past_key_values: Any) -> int:
+    """Size in bytes of the tensors held by a past_key_values object."""
+    return sum(t.numel() * t.element_size() for t in _cache_tensors(past_key_values))
+
+
+def crop_cache(past_key_values: Any, length: int) -> Any:
+    """Return a copy of ``past_key_values`` truncated to the first ``length`` positions."""
+    return truncate_cache(copy.deepcopy(past_key_values), length)
+
+
+def truncate_cache(past_key_values: Any, length: int) -> Any:
+    """Truncate ``past_key_values`` to ``length`` positions, in place where the format allows."""
+    if hasattr(past_key_values, "crop"):
+        surplus = past_key_values.get_seq_length() - length
+        if surplus > 0:
+            past_key_values.crop(-surplus)
+        return past_key_values
+    # Legacy tuple-of-tuples format: (batch, heads, seq, head_dim) tensors
+    return tuple(tuple(t[..., :length, :] for t in layer) for layer in past_key_values)
+
+
+def _cache_tensors(obj: Any) -> Iterator[torch.Tensor]:
+    if torch.is_tensor(obj):
+        yield obj
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            yield from _cache_tensors(item)
+    elif hasattr(obj, "layers"):
+        for layer in obj.layers:
+            yield from _cache_tensors((layer.keys, layer.values))
+    elif hasattr(obj, "key_cache"):
+        yield from _cache_tensors((obj.key_cache, obj.value_cache))
+
+
+class _Node:
+    __slots__ = ("tokens", "children", "parent", "past_key_values", "nbytes")
+
+    def __init__(self, tokens: Tuple[int, ...] = (), parent: Optional["_Node"] = None):
+        self.tokens = tokens
+        self.children: Dict[int, "_Node"] = {}
+        self.parent = parent
+        self.past_key_values = None
+        self.nbytes = 0
+
+    def descendant_with_cache(self) -> Optional["_Node"]:
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.past_key_values is not None:
+                return node
+            stack.extend(node.children.values())
+        return None
+
+
+class PrefixCache:
+    """
+    Radix tree over prompt token ids holding the past key/value tensors of
+    shared prompt prefixes (the language/framework header, project context).
+
+    A lookup returns the longest cached prefix of the given ids. When the ids
+    diverge in the middle of a cached entry, that entry is cropped to the
+    shared part, so a project whose context only grew at the end still reuses
+    everything before the new code. Entries are evicted least recently used
+    first once their total size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024 ** 3):
+        self.max_bytes = max_bytes
+        self.root = _Node()
+        self._lru: "OrderedDict[_Node, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reused_tokens = 0
+
+    def lookup(self, token_ids: Sequence[int]) -> Tuple[int, Any]:
+        """
+        Find the longest cached prefix of ``token_ids``.
+
+        Returns the number of matched tokens and a private copy of their
+        past_key_values (safe for ``generate`` to extend), or ``(0, None)``.
+        """
+        with self._lock:
+            node, matched, best, best_len = self.root, 0, None, 0
+            while matched < len(token_ids):
+                child = node.children.get(token_ids[matched])
+                if child is None:
+                    break
+                common = _common_length(child.tokens, token_ids[matched:])
+                node, matched = child, matched + common
+                if common < len(child.tokens):
+                    break
+                if node.past_key_values is not None:
+                    best, best_len = node, matched
+
+            if matched > best_len:
+                # Diverged below the deepest entry: crop a longer entry to the shared part
+                deeper = node.descendant_with_cache()
+                if deeper is not None:
+                    best, best_len = deeper, matched
+
+            if best is None:
+                self.misses += 1
+                return 0, None
+            self.hits += 1
+            self.reused_tokens += best_len
+            self._lru.move_to_end(best)
+            past_key_values = best.past_key_values
+
+        return best_len, crop_cache(past_key_values, best_len)
+
+    def insert(self, token_ids: Sequence[int], past_key_values: Any):
+        """Store ``past_key_values`` for ``token_ids``; the cache takes ownership."""
+        nbytes = cache_nbytes(past_key_values)
+        if not token_ids or nbytes > self.max_bytes:
+            return
+        with self._lock:
+            node = self._insert_path(tuple(token_ids))
+            if node.past_key_values is not None:
+                self.total_bytes -= node.nbytes
+            node.past_key_values = past_key_values
+            node.nbytes = nbytes
+            self.total_bytes += nbytes
+            self._lru[node] = None
+            self._lru.move_to_end(node)
+            while self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        with self._lock:
+            self.root = _Node()
+            self._lru.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._lru),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "reused_tokens": self.reused_tokens,
+            }
+
+    def _insert_path(self, token_ids: Tuple[int, ...]) -> _Node:
+        node, pos = self.root, 0
+        while pos < len(token_ids):
+            child = node.children.get(token_ids[pos])
+            if child is None:
+                child = _Node(token_ids[pos:], node)
+                node.children[token_ids[pos]] = child
+                return child
+            common = _common_length(child.tokens, token_ids[pos:])
+            if common < len(child.tokens):
+                # Split the edge so the new prefix ends on a node
+                middle = _Node(child.tokens[:common], node)
+                node.children[token_ids[pos]] = middle
+                child.tokens = child.tokens[common:]
+                child.parent = middle
+                middle.children[child.tokens[0]] = child
+                child = middle
+            node, pos = child, pos + common
+        return node
+
+    def _evict(self):
+        node, _ = self._lru.popitem(last=False)
+        self.total_bytes -= node.nbytes
+        node.past_key_values = None
+        node.nbytes = 0
+        self.evictions += 1
+        # Prune branches that no longer lead to any cached entry
+        while node is not self.root and not node.children and node.past_key_values is None:
+            parent = node.parent
+            del parent.children[node.tokens[0]]
+            node = parent
+
+
+def _common_length(a: Sequence[int], b: Sequence[int]) -> int:
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
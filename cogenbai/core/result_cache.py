@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+
+class GenerationCache:
+    """
+    Cache of generated code keyed by the full set of generation parameters.
+
+    Entries live in an in-memory LRU with a time-to-live. When ``db_path`` is
+    given, entries are also written to a SQLite table so they survive
+    restarts; memory misses fall back to it and promote the entry. Each
+    ``put`` drops expired rows from the table and the oldest rows beyond
+    ``max_disk_entries``.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0,
+                 db_path: Optional[str] = None, max_disk_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.conn = None
+        self._disk_entries = 0
+        if db_path:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS generation_cache (
+                    key TEXT PRIMARY KEY,
+                    code TEXT,
+                    created_at REAL
+                )
+            ''')
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS generation_cache_created_at ON generation_cache (created_at)"
+            )
+            self.conn.commit()
+            self._disk_entries = self.conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(**params: Any) -> str:
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, code = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return code
+                del self._entries[key]
+                self.expirations += 1
+
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT code, created_at FROM generation_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    code, created_at = row
+                    if now - created_at <= self.ttl_seconds:
+                        self.disk_hits += 1
+                        self._remember(key, created_at, code)
+                        return code
+                    self.conn.execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+                    self.conn.commit()
+                    self._disk_entries -= 1
+                    self.expirations += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, code: str):
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, code)
+            if self.conn is not None:
+                exists = self.conn.execute(
+                    "SELECT 1 FROM generation_cache WHERE key = ?", (key,)
+                ).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO generation_cache VALUES (?, ?, ?)",
+                    (key, code, created_at)
+                )
+                self._disk_entries += 0 if exists else 1
+                self._prune_disk(created_at)
+                self.conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM generation_cache")
+                self.conn.commit()
+                self._disk_entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_entries": self._disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, created_at: float, code: str):
+        self._entries[key] = (created_at, code)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _prune_disk(self, now: float):
+        expired = self.conn.execute(
+            "DELETE FROM generation_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        self._disk_entries -= expired
+        self.expirations += expired
+        overflow = self._disk_entries - self.max_disk_entries
+        if overflow > 0:
+            evicted = self.conn.execute(
+                "DELETE FROM generation_cache WHERE key IN "
+                "(SELECT key FROM generation_cache ORDER BY created_at LIMIT ?)", (overflow,)
+            ).rowcount
+            self._disk_entries -= evicted
+            self.evictions += evicted
@@ -0,0 +1,162 @@
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import torch
+from transformers import StoppingCriteriaList
+from .prefix_cache import truncate_cache
+
+SPECULATIVE_MODES = ("ngram", "draft")
+
+
+class NgramDrafter:
+    """
+    Prompt-lookup drafting: finds the most recent earlier occurrence of the
+    last ``ngram_size`` (down to 1) tokens and proposes the tokens that
+    followed it. Cheap, and effective when the output copies from the
+    context, e.g. identifiers and lines of existing project code.
+    """
+
+    def __init__(self, ngram_size: int = 3):
+        self.ngram_size = ngram_size
+        self._index: List[Dict[Tuple[int, ...], int]] = [{} for _ in range(ngram_size + 1)]
+        self._indexed = [0] * (ngram_size + 1)
+
+    def draft(self, ids: List[int], num_tokens: int) -> List[int]:
+        for n in range(min(self.ngram_size, len(ids) - 1), 0, -1):
+            index = self._index[n]
+            # Index every n-gram that has a following token, latest occurrence wins
+            for start in range(self._indexed[n], len(ids) - n):
+                index[tuple(ids[start:start + n])] = start
+            self._indexed[n] = max(self._indexed[n], len(ids) - n)
+            start = index.get(tuple(ids[-n:]))
+            if start is not None:
+                return ids[start + n:start + n + num_tokens]
+        return []
+
+    def accept(self, length: int):
+        pass
+
+
+class DraftModelDrafter:
+    """Greedy drafting with a small model sharing the main model's tokenizer."""
+
+    def __init__(self, model):
+        self.model = model
+        self.device = next(model.parameters()).device
+        self.past_key_values = None
+        self.cached = 0  # tokens held in the draft model's cache
+
+    def draft(self, ids: List[int], num_tokens: int) -> List[int]:
+        tokens: List[int] = []
+        new = ids[self.cached:]
+        while len(tokens) < num_tokens:
+            outputs = self.model(torch.tensor([new], device=self.device),
+                                 past_key_values=self.past_key_values, use_cache=True)
+            self.past_key_values = outputs.past_key_values
+            self.cached += len(new)
+            tokens.append(int(outputs.logits[0, -1].argmax()))
+            new = tokens[-1:]
+        return tokens
+
+    def accept(self, length: int):
+        """Drop cached positions past the first ``length`` committed tokens."""
+        if self.cached > length:
+            self.past_key_values = truncate_cache(self.past_key_values, length)
+            self.cached = length
+
+
+class SpeculativeDecoder:
+    """
+    Greedy speculative decoding: a drafter proposes up to ``num_tokens``
+    tokens, the main model scores all of them in one forward pass, and the
+    longest prefix matching its own greedy choices is kept together with the
+    model's token at the first mismatch. The result is the same sequence
+    plain greedy decoding produces, in fewer main-model passes.
+    """
+
+    def __init__(self, model, drafter, num_tokens: int = 8,
+                 stats: Optional["SpeculativeStats"] = None):
+        self.model = model
+        self.drafter = drafter
+        self.num_tokens = num_tokens
+        self.stats = stats
+
+    @torch.no_grad()
+    def generate(self, input_ids: torch.LongTensor, past_key_values: Any = None,
+                 max_new_tokens: int = 256, eos_token_id: Optional[int] = None,
+                 stopping_criteria: Optional[StoppingCriteriaList] = None) -> torch.LongTensor:
+        """Decode one sequence; returns prompt and generated ids like ``generate``."""
+        device = input_ids.device
+        ids = input_ids[0].tolist()
+        cached = past_key_values.get_seq_length() if hasattr(past_key_values, "get_seq_length") else (
+            past_key_values[0][0].shape[-2] if past_key_values else 0
+        )
+        outputs = self.model(input_ids[:, cached:], past_key_values=past_key_values, use_cache=True)
+        past_key_values = outputs.past_key_values
+        pending = int(outputs.logits[0, -1].argmax())
+        forwards, drafted, accepted, generated = 1, 0, 0, 0
+
+        def commit(token: int) -> bool:
+            """Append one token; True when generation must stop after it."""
+            nonlocal generated
+            ids.append(token)
+            generated += 1
+            if token == eos_token_id or generated >= max_new_tokens:
+                return True
+            return bool(stopping_criteria and stopping_criteria(torch.tensor([ids], device=device), None).all())
+
+        while max_new_tokens > 0 and not commit(pending):
+            # Leave room for the model's own token after the accepted draft
+            draft = self.drafter.draft(ids, min(self.num_tokens, max_new_tokens - generated - 1))
+            outputs = self.model(torch.tensor([ids[-1:] + draft], device=device),
+                                 past_key_values=past_key_values, use_cache=True)
+            past_key_values = outputs.past_key_values
+            forwards += 1
+            predictions = outputs.logits[0].argmax(dim=-1).tolist()
+
+            matched = 0
+            while matched < len(draft) and draft[matched] == predictions[matched]:
+                matched += 1
+            drafted += len(draft)
+            accepted += matched
+            if any(commit(token) for token in draft[:matched]):
+                break
+            past_key_values = truncate_cache(past_key_values, len(ids))
+            self.drafter.accept(len(ids))
+            pending = predictions[matched]
+
+        if self.stats is not None:
+            self.stats.record(drafted, accepted, forwards, generated)
+        return torch.tensor([ids], device=device)
+
+
+class SpeculativeStats:
+    """Acceptance counters across speculative generations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.drafted_tokens = 0
+        self.accepted_tokens = 0
+        self.target_forwards = 0
+        self.generated_tokens = 0
+
+    def record(self, drafted: int, accepted: int, forwards: int, generated: int):
+        with self._lock:
+            self.requests += 1
+            self.drafted_tokens += drafted
+            self.accepted_tokens += accepted
+            self.target_forwards += forwards
+            self.generated_tokens += generated
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "drafted_tokens": self.drafted_tokens,
+                "accepted_tokens": self.accepted_tokens,
+                "acceptance_rate": self.accepted_tokens / self.drafted_tokens if self.drafted_tokens else 0.0,
+                "target_forwards": self.target_forwards,
+                "generated_tokens": self.generated_tokens,
+                # Plain decoding needs one main-model pass per token
+                "tokens_per_forward": self.generated_tokens / self.target_forwards if self.target_forwards else 0.0,
+            }
@@ -0,0 +1,215 @@
+from typing import Any, Dict, List, Optional, Sequence
+import ast
+import codeop
+import re
+import threading
+import warnings
+import torch
+from transformers import StoppingCriteria
+
+# Lines after a finished block that still look like code, e.g. another function
+_CODE_CHARS = set("{}()[];=<>")
+_COMMENT_PREFIXES = ("//", "/*", "*", "#", "@")
+# Top-level lines that continue the statement above them and never compile alone
+_PYTHON_CONTINUATION = re.compile(r"(?:else|elif|except|finally|case)\b")
+# A markdown code fence, opening (```cpp) or closing (```)
+_FENCE = re.compile(r"\s*(?:```|~~~)")
+
+
+class CompletionDetector:
+    """
+    Decides where a generated answer ends, looking only at complete lines.
+
+    ``stop_sequences`` end the answer wherever they appear. ``completion``
+    selects a structural check from the language config:
+
+    * ``"braces"``: once every ``{`` is closed again, the first following
+      line that does not look like code (prose, a code fence) ends the answer.
+    * ``"python"``: once the answer parses as a complete module, the first
+      following top-level line that can never become valid Python ends it.
+
+    With either check, a code fence line after some code always ends the answer.
+
+    ``feed`` is called with the whole text generated so far and only scans
+    lines it has not seen yet.
+    """
+
+    def __init__(self, stop_sequences: Sequence[str] = (), completion: Optional[str] = None):
+        self.stop_sequences = [s for s in stop_sequences if s]
+        self.completion = completion
+        self._scanned = 0  # offset of the first line not examined yet
+        self._depth = 0
+        self._opened = False
+        self._balanced_at: Optional[int] = None
+        self._in_block_comment = False
+
+    def feed(self, text: str, final: bool = False) -> Optional[int]:
+        """Return the offset where the answer ends, or None while it may continue."""
+        for sequence in self.stop_sequences:
+            index = text.find(sequence, max(0, self._scanned - len(sequence)))
+            if index != -1:
+                return index
+
+        end = len(text) if final else text.rfind("\n") + 1
+        while self._scanned < end:
+            line_end = text.find("\n", self._scanned, end)
+            line_end = end if line_end == -1 else line_end + 1
+            start, self._scanned = self._scanned, line_end
+            line = text[start:line_end].rstrip("\n")
+            if self.completion and _FENCE.match(line) and text[:start].strip():
+                return self._balanced_at if self._balanced_at is not None else start
+            if self.completion == "braces":
+                cut = self._scan_braces(line, start)
+            elif self.completion == "python":
+                cut = self._scan_python(text, line, start)
+            else:
+                cut = None
+            if cut is not None:
+                return cut
+        return None
+
+    def _scan_braces(self, line: str, start: int) -> Optional[int]:
+        if self._balanced_at is not None and line.strip():
+            if not _looks_like_code(line):
+                return self._balanced_at
+            self._balanced_at = None
+
+        i = 0
+        while i < len(line):
+            if self._in_block_comment:
+                close = line.find("*/", i)
+                if close == -1:
+                    break
+                self._in_block_comment, i = False, close + 2
+                continue
+            ch = line[i]
+            if line.startswith("//", i):
+                break
+            if line.startswith("/*", i):
+                self._in_block_comment, i = True, i + 2
+                continue
+            if ch in "\"'`":
+                # Skip string literals closed on the same line; an unmatched quote
+                # (e.g. a Rust lifetime) is treated as an ordinary character
+                close = _closing_quote(line, i)
+                i = close + 1 if close != -1 else i + 1
+                continue
+            if ch == "{":
+                self._depth += 1
+                self._opened = True
+            elif ch == "}":
+                self._depth = max(self._depth - 1, 0)
+            i += 1
+
+        if line.strip() and self._opened and self._depth == 0 and not self._in_block_comment:
+            self._balanced_at = start + len(line)
+        return None
+
+    def _scan_python(self, text: str, line: str, start: int) -> Optional[int]:
+        if (not line.strip() or line[0].isspace() or not text[:start].strip()
+                or _PYTHON_CONTINUATION.match(line)):
+            return None
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            try:
+                ast.parse(text[:start])
+            except SyntaxError:
+                return None
+            try:
+                # None means "incomplete", e.g. the header of a new def
+                codeop.compile_command(line, symbol="exec")
+            except (SyntaxError, ValueError, OverflowError):
+                return start
+        return None
+
+
+def detector_for(language_config: Dict[str, Any], extra_stop_sequences: Sequence[str] = ()) -> CompletionDetector:
+    """Build the detector described by a LanguageGenerator language config."""
+    return CompletionDetector(
+        list(extra_stop_sequences) + list(language_config.get("stop_sequences", [])),
+        language_config.get("completion")
+    )
+
+
+def _looks_like_code(line: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith(_COMMENT_PREFIXES) or any(ch in _CODE_CHARS for ch in stripped)
+
+
+def _closing_quote(line: str, start: int) -> int:
+    quote, i = line[start], start + 1
+    while i < len(line):
+        if line[i] == "\\":
+            i += 2
+            continue
+        if line[i] == quote:
+            return i
+        i += 1
+    return -1
+
+
+class CompletionStoppingCriteria(StoppingCriteria):
+    """
+    Ends each row of a (padded) ``generate`` call once its detector reports
+    that the answer is complete. ``prompt_width`` is the padded prompt length;
+    detectors only run when a row has just produced a newline. Rows with a
+    ``budgets`` entry also end once they have generated that many tokens, so
+    short requests do not keep decoding alongside long ones.
+    """
+
+    def __init__(self, tokenizer, prompt_width: int, detectors: List[CompletionDetector],
+                 budgets: Optional[List[int]] = None):
+        self.tokenizer = tokenizer
+        self.prompt_width = prompt_width
+        self.detectors = detectors
+        self.budgets = budgets
+        self.ends: List[Optional[int]] = [None] * len(detectors)
+        self.stopped_at: List[Optional[int]] = [None] * len(detectors)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        done = []
+        for row, detector in enumerate(self.detectors):
+            if self.ends[row] is None and "\n" in self.tokenizer.decode(input_ids[row, -1:]):
+                text = self.tokenizer.decode(input_ids[row, self.prompt_width:], skip_special_tokens=True)
+                self.ends[row] = detector.feed(text)
+                if self.ends[row] is not None:
+                    self.stopped_at[row] = input_ids.shape[1] - self.prompt_width
+            over_budget = self.budgets is not None and input_ids.shape[1] - self.prompt_width >= self.budgets[row]
+            done.append(self.ends[row] is not None or over_budget)
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+    def trim(self, row: int, text: str) -> str:
+        """Cut the decoded answer of ``row`` at the end its detector found."""
+        end = self.ends[row]
+        if end is None:
+            end = self.detectors[row].feed(text, final=True)
+        return text if end is None else text[:end]
+
+
+class EarlyStoppingStats:
+    """Counts tokens generated and tokens saved by stopping before the budget."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.early_stops = 0
+        self.generated_tokens = 0
+        self.saved_tokens = 0
+
+    def record(self, generated: int, budget: int, stopped_early: bool):
+        with self._lock:
+            self.requests += 1
+            self.generated_tokens += generated
+            if stopped_early:
+                self.early_stops += 1
+                self.saved_tokens += max(budget - generated, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "early_stops": self.early_stops,
+                "generated_tokens": self.generated_tokens,
+                "saved_tokens": self.saved_tokens,
+                "mean_generated_tokens": self.generated_tokens / self.requests if self.requests else 0.0,
+            }
@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional
+import json
+import mmap
+import os
+import struct
+import torch
+from torch import nn
+from transformers import AutoConfig, AutoModelForCausalLM, AutoTokenizer
+
+_SAFETENSORS_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+    "U8": torch.uint8, "BOOL": torch.bool,
+}
+
+
+def load_mmap_causal_lm(model_dir: str, dtype: Optional[torch.dtype] = None) -> nn.Module:
+    """
+    Build a causal LM whose weights are views into memory-mapped safetensors files.
+
+    Pages are read from disk on first use and, being clean file-backed pages,
+    are shared by every process that maps the same checkpoint. Tensors whose
+    dtype differs from ``dtype`` are converted, which copies them into private
+    memory; convert the checkpoint to the serving dtype to avoid that.
+    """
+    files = safetensors_files(model_dir)
+    if not files:
+        raise ValueError(
+            f"No safetensors checkpoint in {model_dir}; convert it with `cogenbai convert-weights`"
+        )
+
+    config = AutoConfig.from_pretrained(model_dir)
+    # No allocation or init; the device context only applies to this thread
+    with torch.device("meta"):
+        model = AutoModelForCausalLM.from_config(config)
+
+    state_dict: Dict[str, torch.Tensor] = {}
+    maps = []
+    for path in files:
+        tensors, mapping = _map_safetensors(path)
+        state_dict.update(tensors)
+        maps.append(mapping)
+    if dtype is not None:
+        state_dict = {
+            name: t.to(dtype) if t.is_floating_point() and t.dtype != dtype else t
+            for name, t in state_dict.items()
+        }
+
+    model.load_state_dict(state_dict, strict=False, assign=True)
+    model.tie_weights()
+    _rebuild_meta_buffers(model)
+    missing = [name for name, p in model.named_parameters() if p.is_meta]
+    if missing:
+        raise ValueError(f"Checkpoint in {model_dir} is missing weights: {', '.join(missing[:5])}")
+    # Keep the mappings alive for as long as the model
+    model._weight_maps = maps
+    return model.eval()
+
+
+def convert_checkpoint(source: str, destination: str, dtype: Optional[str] = None) -> List[str]:
+    """
+    Rewrite any checkpoint ``from_pretrained`` can read (``.bin``, sharded,
+    hub id) as safetensors in ``destination``, optionally cast to ``dtype``
+    ("fp32", "fp16" or "bf16"). The tokenizer is copied along when the
+    source has one. Returns the written weight files.
+    """
+    dtypes = {"fp32": torch.float32, "fp16": torch.float16, "bf16": torch.bfloat16}
+    if dtype is not None and dtype not in dtypes:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    model = AutoModelForCausalLM.from_pretrained(
+        source, dtype=dtypes[dtype] if dtype else "auto", low_cpu_mem_usage=True
+    )
+    os.makedirs(destination, exist_ok=True)
+    model.save_pretrained(destination, safe_serialization=True)
+    try:
+        AutoTokenizer.from_pretrained(source).save_pretrained(destination)
+    except (OSError, ValueError):
+        pass  # weights-only checkpoint
+    return safetensors_files(destination)
+
+
+def safetensors_files(model_dir: str) -> List[str]:
+    index = os.path.join(model_dir, "model.safetensors.index.json")
+    if os.path.exists(index):
+        with open(index) as f:
+            shards = sorted(set(json.load(f)["weight_map"].values()))
+        return [os.path.join(model_dir, shard) for shard in shards]
+    single = os.path.join(model_dir, "model.safetensors")
+    return [single] if os.path.exists(single) else []
+
+
+def _map_safetensors(path: str):
+    with open(path, "rb") as f:
+        header_len = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_len))
+        # Private copy-on-write mapping: unmodified pages stay shared through the page cache
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    base = 8 + header_len
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = _SAFETENSORS_DTYPES[info["dtype"]]
+        start, end = info["data_offsets"]
+        shape = info["shape"]
+        itemsize = torch.empty((), dtype=dtype).element_size()
+        if start == end:
+            tensors[name] = torch.empty(shape, dtype=dtype)
+        elif (base + start) % itemsize:
+            # Misaligned data cannot be viewed in place; copy this tensor
+            raw = bytearray(mapping[base + start:base + end])
+            tensors[name] = torch.frombuffer(raw, dtype=dtype).reshape(shape)
+        else:
+            tensors[name] = torch.frombuffer(
+                mapping, dtype=dtype, count=(end - start) // itemsize, offset=base + start
+            ).reshape(shape)
+    return tensors, mapping
+
+
+def _rebuild_meta_buffers(model: nn.Module):
+    """
+    Compute the buffers that are not in the checkpoint (rotary frequencies
+    and other non-persistent buffers), which were created on the meta device
+    with the rest of the model, with the model's own initialization.
+    """
+    for module_name, module in model.named_modules():
+        meta = [name for name, buffer in module.named_buffers(recurse=False) if buffer.is_meta]
+        if not meta:
+            continue
+        full_names = ", ".join(f"{module_name}.{name}" for name in meta)
+        if any(True for _ in module.parameters(recurse=False)):
+            # Initializing this module would overwrite its loaded weights
+            raise ValueError(f"Cannot compute buffers {full_names} without reinitializing their module")
+        for name in meta:
+            # NaN marks what the initialization leaves unset
+            buffer = module._buffers[name]
+            fill = float("nan") if buffer.is_floating_point() else 0
+            module._buffers[name] = torch.full(buffer.shape, fill, dtype=buffer.dtype)
+        model._init_weights(module)
+        if any(module._buffers[name].is_floating_point() and module._buffers[name].isnan().any() for name in meta):
+            raise ValueError(f"The model's initialization does not compute buffers {full_names}")
@@ -9,6 +9,7 @@ class LanguageGenerator:
                 "file_extension": ".py",
                 "testing_frameworks": ["pytest", "unittest", "nose"],
                 "doc_format": "docstring",
+                "completion": "python",
             },
             "javascript": {
                 "frameworks": [
@@ -19,7 +20,8 @@ class LanguageGenerator:
                 "file_extension": ".js",
                 "testing_frameworks": ["jest", "vitest", "cypress", "playwright"],
                 "doc_format": "jsdoc",
-                "bundlers": ["vite", "webpack", "rollup", "esbuild", "turbopack"]
+                "bundlers": ["vite", "webpack", "rollup", "esbuild", "turbopack"],
+                "completion": "braces"
             },
             "typescript": {
                 "frameworks": [
@@ -30,7 +32,8 @@ class LanguageGenerator:
                 "file_extension": ".ts",
                 "testing_frameworks": ["jest", "vitest", "cypress", "playwright"],
                 "doc_format": "tsdoc",
-                "bundlers": ["vite", "webpack", "rollup", "esbuild", "turbopack"]
+                "bundlers": ["vite", "webpack", "rollup", "esbuild", "turbopack"],
+                "completion": "braces"
             },
             "rust": {
                 "frameworks": ["actix", "rocket", "warp", "yew"],
@@ -38,6 +41,7 @@ class LanguageGenerator:
                 "file_extension": ".rs",
                 "testing_frameworks": ["cargo test"],
                 "doc_format": "rustdoc",
+                "completion": "braces",
             },
             "go": {
                 "frameworks": ["gin", "echo", "fiber", "buffalo"],
@@ -45,6 +49,7 @@ class LanguageGenerator:
                 "file_extension": ".go",
                 "testing_frameworks": ["testing"],
                 "doc_format": "godoc",
+                "completion": "braces",
             },
             "java": {
                 "frameworks": ["spring", "quarkus", "micronaut", "jakarta ee"],
@@ -52,6 +57,7 @@ class LanguageGenerator:
                 "file_extension": ".java",
                 "testing_frameworks": ["junit", "testng"],
                 "doc_format": "javadoc",
+                "completion": "braces",
             },
             "kotlin": {
                 "frameworks": ["spring", "ktor", "compose"],
@@ -59,6 +65,7 @@ class LanguageGenerator:
                 "file_extension": ".kt",
                 "testing_frameworks": ["junit", "kotlintest"],
                 "doc_format": "kdoc",
+                "completion": "braces",
             },
             "cpp": {
                 "frameworks": ["qt", "boost", "opencv", "llvm"],
@@ -66,7 +73,8 @@ class LanguageGenerator:
                 "file_extension": ".cpp",
                 "testing_frameworks": ["gtest", "catch2", "doctest"],
                 "doc_format": "doxygen",
-                "ide_support": ["visual-studio", "clion", "qt-creator"]
+                "ide_support": ["visual-studio", "clion", "qt-creator"],
+                "completion": "braces"
             },
             "dart": {
                 "frameworks": ["flutter", "shelf", "aqueduct"],
@@ -74,7 +82,8 @@ class LanguageGenerator:
                 "file_extension": ".dart",
                 "testing_frameworks": ["test", "flutter_test"],
                 "doc_format": "dartdoc",
-                "ide_support": ["android-studio", "vscode"]
+                "ide_support": ["android-studio", "vscode"],
+                "completion": "braces"
             },
             "swift": {
                 "frameworks": ["swiftui", "vapor", "perfect"],
@@ -82,7 +91,8 @@ class LanguageGenerator:
                 "file_extension": ".swift",
                 "testing_frameworks": ["xctest"],
                 "doc_format": "markdown",
-                "ide_support": ["xcode"]
+                "ide_support": ["xcode"],
+                "completion": "braces"
             },
             "matlab": {
                 "frameworks": ["simulink", "app-designer"],
@@ -98,12 +108,21 @@ class LanguageGenerator:
                 "file_extension": ".sh",
                 "testing_frameworks": ["bats", "shunit2"],
                 "doc_format": "man-pages",
-                "ide_support": ["vscode", "bash-ide"]
+                "ide_support": ["vscode", "bash-ide"],
+                "stop_sequences": ["\n#!/"]
             }
         }
         
     def get_language_config(self, language: str) -> Optional[dict]:
         return self.language_configs.get(language.lower())
+
+    def validate_target(self, language: str, framework: Optional[str] = None) -> dict:
+        config = self.get_language_config(language)
+        if not config:
+            raise ValueError(f"Unsupported language: {language}")
+        if framework and framework not in config["frameworks"]:
+            raise ValueError(f"Unsupported framework {framework} for {language}")
+        return config
     
     def generate_boilerplate(self, language: str, framework: str) -> str:
         config = self.get_language_config(language)
@@ -0,0 +1,448 @@
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Deque, Dict, List, Optional
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+
+MODES = ("oneshot", "persistent", "lsp")
+
+# LSP language ids by file extension, for didOpen
+_LANGUAGE_IDS = {".c": "c", ".cc": "cpp", ".cpp": "cpp", ".h": "cpp", ".hpp": "cpp", ".cs": "csharp",
+                 ".dart": "dart", ".go": "go", ".java": "java", ".js": "javascript", ".kt": "kotlin",
+                 ".php": "php", ".rs": "rust", ".swift": "swift", ".ts": "typescript"}
+
+
+class FormatterError(ValueError):
+    """The formatter rejected the code, crashed or timed out."""
+
+
+class FormatterTimeout(FormatterError):
+    pass
+
+
+class FormatterNotInstalled(ImportError):
+    """The formatter's executable is missing; formatting pipelines skip it."""
+
+
+@dataclass
+class ExternalFormatterSpec:
+    """
+    How to run one external formatter.
+
+    - ``oneshot``: ``command`` reads a snippet on stdin and writes it
+      formatted to stdout, one process per snippet (gofmt, rustfmt,
+      clang-format, prettier);
+    - ``persistent``: ``command`` stays up and answers JSON lines, a
+      ``{"id", "code"}`` request with ``{"id", "code"}`` or ``{"id",
+      "error"}``; for formatters wrapped in a small daemon;
+    - ``lsp``: ``command`` is a language server on stdio (gopls, clangd, rust-analyzer,
+      ``dart language-server``) asked for ``textDocument/formatting``.
+
+    ``workers`` processes (or concurrent oneshot runs) serve requests;
+    ``filename`` tells language servers the snippet's language. When
+    ``command`` is not installed, ``fallback`` (if given) is run oneshot
+    instead, e.g. gofmt for a missing gopls. A server that exits while
+    starting up counts as missing.
+    """
+
+    command: List[str]
+    mode: str = "oneshot"
+    workers: int = 2
+    timeout: float = 10.0
+    filename: str = "snippet.txt"
+    idempotent: bool = True
+    fallback: Optional[List[str]] = None
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown formatter mode {self.mode!r}; expected one of {', '.join(MODES)}")
+        if not self.command:
+            raise ValueError("Formatter command is empty")
+        if self.workers < 1:
+            raise ValueError("Formatter workers must be at least 1")
+        if self.fallback is not None and not self.fallback:
+            raise ValueError("Formatter fallback command is empty")
+
+
+class _Process:
+    """A long-lived formatter process; a thread reads its messages so that waits can time out."""
+
+    def __init__(self, command: List[str], read_message):
+        try:
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            stderr=subprocess.DEVNULL)
+        except FileNotFoundError as e:
+            raise FormatterNotInstalled(f"{command[0]} is not installed") from e
+        self.messages: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.failed = False  # exited, broke the pipe or timed out; must be replaced
+        self._reader = threading.Thread(target=self._read, args=(read_message,), daemon=True)
+        self._reader.start()
+
+    def _read(self, read_message):
+        try:
+            while True:
+                message = read_message(self.process.stdout)
+                if message is None:
+                    break
+                self.messages.put(message)
+        except (OSError, ValueError):
+            pass
+        self.messages.put(None)  # end of output: the process exited
+
+    def alive(self) -> bool:
+        return not self.failed and self.process.poll() is None
+
+    def send(self, data: bytes):
+        try:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        except OSError as e:
+            self.failed = True
+            raise FormatterError(f"formatter exited: {e}") from e
+
+    def receive(self, deadline: float) -> Dict[str, Any]:
+        try:
+            message = self.messages.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            self.failed = True
+            raise FormatterTimeout("formatter timed out") from None
+        if message is None:
+            self.failed = True
+            raise FormatterError(f"formatter exited with code {self.process.wait()}")
+        return message
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class _JsonLinesProtocol:
+    def __init__(self, spec: ExternalFormatterSpec):
+        self._ids = itertools.count(1)
+
+    @staticmethod
+    def read(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+        line = stream.readline()
+        return json.loads(line) if line else None
+
+    def start(self, process: _Process, deadline: float):
+        pass
+
+    def format(self, process: _Process, code: str, deadline: float) -> str:
+        request_id = next(self._ids)
+        process.send(json.dumps({"id": request_id, "code": code}).encode("utf-8") + b"\n")
+        while True:
+            message = process.receive(deadline)
+            if message.get("id") == request_id:
+                break
+        if "error" in message:
+            raise FormatterError(message["error"])
+        return message["code"]
+
+
+class _LspProtocol:
+    """Just enough of the Language Server Protocol to format one document at a time."""
+
+    def __init__(self, spec: ExternalFormatterSpec):
+        self._ids = itertools.count(1)
+        self._documents = itertools.count(1)
+        self._extension = os.path.splitext(spec.filename)[1]
+        self._language_id = _LANGUAGE_IDS.get(self._extension, self._extension.lstrip("."))
+        self._root = os.path.join(os.path.realpath(os.getcwd()), ".cogenbai-format")
+        self._encoding = "utf-16"  # what the server counts positions in; LSP's default
+
+    @staticmethod
+    def read(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+        length = None
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("ascii").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return json.loads(stream.read(length)) if length is not None else {}
+
+    @staticmethod
+    def _send(process: _Process, message: Dict[str, Any]):
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode("utf-8")
+        process.send(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+
+    def _request(self, process: _Process, method: str, params: Dict[str, Any], deadline: float) -> Any:
+        request_id = next(self._ids)
+        self._send(process, {"id": request_id, "method": method, "params": params})
+        while True:
+            message = process.receive(deadline)
+            if "method" in message:
+                if "id" in message:
+                    # Server requests (configuration, progress) get empty answers
+                    result = None
+                    if message["method"] == "workspace/configuration":
+                        result = [None] * len(message.get("params", {}).get("items", []))
+                    self._send(process, {"id": message["id"], "result": result})
+                continue
+            if message.get("id") == request_id:
+                if "error" in message:
+                    raise FormatterError(message["error"].get("message", "language server error"))
+                return message.get("result")
+
+    def start(self, process: _Process, deadline: float):
+        root = "file://" + self._root
+        result = self._request(process, "initialize", {
+            "processId": os.getpid(), "rootUri": root,
+            "workspaceFolders": [{"uri": root, "name": "cogenbai"}],
+            "capabilities": {"general": {"positionEncodings": list(_UNIT_WIDTHS)}},
+        }, deadline)
+        self._encoding = (result or {}).get("capabilities", {}).get("positionEncoding", "utf-16")
+        if self._encoding not in _UNIT_WIDTHS:
+            raise FormatterError(f"language server counts positions in unsupported {self._encoding}")
+        self._send(process, {"method": "initialized", "params": {}})
+
+    def format(self, process: _Process, code: str, deadline: float) -> str:
+        uri = f"file://{self._root}/snippet{next(self._documents)}{self._extension}"
+        self._send(process, {"method": "textDocument/didOpen", "params": {"textDocument": {
+            "uri": uri, "languageId": self._language_id, "version": 1, "text": code}}})
+        try:
+            edits = self._request(process, "textDocument/formatting", {
+                "textDocument": {"uri": uri}, "options": {"tabSize": 4, "insertSpaces": True},
+            }, deadline)
+        finally:
+            self._send(process, {"method": "textDocument/didClose", "params": {"textDocument": {"uri": uri}}})
+        return _apply_edits(code, edits or [], self._encoding)
+
+
+# Code units per character, by LSP position encoding
+_UNIT_WIDTHS = {
+    "utf-8": lambda char: len(char.encode("utf-8")),
+    "utf-16": lambda char: 2 if ord(char) > 0xFFFF else 1,
+    "utf-32": lambda char: 1,
+}
+
+
+def _apply_edits(code: str, edits: List[Dict[str, Any]], encoding: str = "utf-16") -> str:
+    """Apply LSP TextEdits whose positions count ``encoding`` code units."""
+    lines = code.splitlines(True)
+    starts = [0]
+    for line in lines:
+        starts.append(starts[-1] + len(line))
+    width = _UNIT_WIDTHS[encoding]
+
+    def offset(position: Dict[str, int]) -> int:
+        line = position["line"]
+        if line >= len(lines):
+            return len(code)
+        # Columns past the end of the line mean its end, before the line break
+        text = lines[line].rstrip("\r\n")
+        units, column = position["character"], 0
+        if text.isascii():
+            column = min(units, len(text))
+        else:
+            while column < len(text) and units > 0:
+                units -= width(text[column])
+                column += 1
+        return starts[line] + column
+
+    spans = sorted(((offset(edit["range"]["start"]), offset(edit["range"]["end"]), edit["newText"])
+                    for edit in edits), key=lambda span: span[0], reverse=True)
+    for start, end, text in spans:
+        code = code[:start] + text + code[end:]
+    return code
+
+
+_PROTOCOLS = {"persistent": _JsonLinesProtocol, "lsp": _LspProtocol}
+
+
+@dataclass
+class FormatterStats:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    restarts: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=1024), repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+        stats = {key: value for key, value in asdict(self).items() if key != "latencies"}
+        return {**stats,
+                "avg_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                "p50_ms": percentile(0.5), "p95_ms": percentile(0.95),
+                "max_ms": latencies[-1] * 1000 if latencies else 0.0}
+
+
+class ExternalFormatter:
+    """
+    A pool running one external formatter (see ExternalFormatterSpec).
+    ``format`` is a formatting pass: it returns the formatted code, raises
+    FormatterNotInstalled when the executable is missing and FormatterError
+    when the snippet is rejected, the formatter crashes or it takes longer
+    than ``timeout``. A crashed or stuck process is killed and replaced on
+    the next call.
+    """
+
+    def __init__(self, name: str, spec: ExternalFormatterSpec):
+        self.name = name
+        self.spec = spec
+        self._lock = threading.Lock()
+        self._stats = FormatterStats()
+        self._slots = threading.BoundedSemaphore(spec.workers)  # concurrent oneshot runs
+        self._fallen_back = False  # command is missing; fallback runs oneshot instead
+        if spec.mode != "oneshot":
+            self._protocol = _PROTOCOLS[spec.mode](spec)
+            # Idle processes; None is a slot whose process is not started yet
+            self._idle: "queue.LifoQueue[Optional[_Process]]" = queue.LifoQueue()
+            for _ in range(spec.workers):
+                self._idle.put(None)
+        self._closed = False
+
+    def format(self, code: str) -> str:
+        start = time.perf_counter()
+        try:
+            if self.spec.mode == "oneshot":
+                result = self._run_oneshot(code, self.spec.command)
+            elif self._fallen_back:
+                result = self._run_oneshot(code, self.spec.fallback)
+            else:
+                try:
+                    result = self._run_persistent(code)
+                except FormatterNotInstalled:
+                    if not self.spec.fallback:
+                        raise
+                    self._fallen_back = True
+                    result = self._run_oneshot(code, self.spec.fallback)
+        except FormatterError as e:
+            with self._lock:
+                self._stats.errors += 1
+                self._stats.timeouts += isinstance(e, FormatterTimeout)
+            raise
+        finally:
+            with self._lock:
+                self._stats.calls += 1
+                self._stats.latencies.append(time.perf_counter() - start)
+        return result
+
+    def _run_oneshot(self, code: str, command: List[str]) -> str:
+        with self._slots:
+            try:
+                completed = subprocess.run(command, input=code.encode("utf-8"),
+                                           capture_output=True, timeout=self.spec.timeout)
+            except FileNotFoundError as e:
+                raise FormatterNotInstalled(f"{command[0]} is not installed") from e
+            except subprocess.TimeoutExpired:
+                raise FormatterTimeout(f"{self.name} timed out after {self.spec.timeout}s") from None
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip().splitlines()
+            raise FormatterError(f"{self.name} failed: {message[-1] if message else completed.returncode}")
+        return completed.stdout.decode("utf-8")
+
+    def _run_persistent(self, code: str) -> str:
+        if self._closed:
+            raise FormatterError(f"{self.name} is closed")
+        deadline = time.monotonic() + self.spec.timeout
+        try:
+            process = self._idle.get(timeout=self.spec.timeout)
+        except queue.Empty:
+            raise FormatterTimeout(f"{self.name}: no idle worker after {self.spec.timeout}s") from None
+        try:
+            if process is None or not process.alive():
+                if process is not None:
+                    process.close()
+                    with self._lock:
+                        self._stats.restarts += 1
+                process = None
+                started = _Process(self.spec.command, self._protocol.read)
+                try:
+                    self._protocol.start(started, deadline)
+                except FormatterError as e:
+                    exited = not isinstance(e, FormatterTimeout) and started.process.poll() is not None
+                    started.close()
+                    if exited:
+                        # e.g. a rustup proxy whose rust-analyzer component is not installed
+                        raise FormatterNotInstalled(f"{self.spec.command[0]} exited during startup: {e}") from e
+                    raise
+                process = started
+            return self._protocol.format(process, code, deadline)
+        except FormatterError:
+            # Crashed or stuck: replaced on the next call (a rejected snippet keeps the process)
+            if process is not None and not process.alive():
+                process.close()
+                process = None
+                with self._lock:
+                    self._stats.restarts += 1
+            raise
+        finally:
+            if self._closed and process is not None:
+                process.close()
+                process = None
+            self._idle.put(process)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            mode = "oneshot" if self._fallen_back else self.spec.mode
+            return {"mode": mode, "fallback": self._fallen_back, "workers": self.spec.workers,
+                    **self._stats.to_dict()}
+
+    def close(self):
+        self._closed = True
+        if self.spec.mode == "oneshot":
+            return
+        while True:
+            try:
+                process = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if process is not None:
+                process.close()
+
+
+_pools: Dict[str, ExternalFormatter] = {}
+_pools_lock = threading.Lock()
+
+
+def register_external_formatters(specs: Dict[str, Dict[str, Any]]) -> Dict[str, ExternalFormatter]:
+    """
+    Make each external formatter in ``specs`` (name -> ExternalFormatterSpec
+    fields) a formatting pass. Pools are shared by name and kept while
+    their spec is unchanged.
+    """
+    from .formatting import register_formatter
+
+    registered = {}
+    with _pools_lock:
+        for name, options in specs.items():
+            spec = ExternalFormatterSpec(**options)
+            pool = _pools.get(name)
+            if pool is None or pool.spec != spec:
+                if pool is not None:
+                    pool.close()
+                pool = _pools[name] = ExternalFormatter(name, spec)
+            register_formatter(name, pool.format, idempotent=spec.idempotent)
+            registered[name] = pool
+    return registered
+
+
+def external_formatter_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-formatter latency and restart counts."""
+    with _pools_lock:
+        return {name: pool.stats() for name, pool in _pools.items()}
+
+
+def close_external_formatters():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
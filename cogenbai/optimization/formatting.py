@@ -0,0 +1,207 @@
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+import hashlib
+import threading
+import time
+
+from ..config import CogenConfig
+from .external import register_external_formatters
+
+
+def _autopep8(code: str) -> str:
+    import autopep8
+    return autopep8.fix_code(code)
+
+
+def _black(code: str) -> str:
+    import black
+    return black.format_str(code, mode=black.FileMode())
+
+
+def _yapf(code: str) -> str:
+    from yapf.yapflib.yapf_api import FormatCode
+    return FormatCode(code)[0]
+
+
+# Formatter passes by name, joined by the external formatters of the config
+# (see external.py). A pass raises ImportError when its package or executable
+# is missing (it is then skipped) and any other exception on code it can't format.
+FORMATTERS: Dict[str, Callable[[str], str]] = {
+    "autopep8": _autopep8,
+    "black": _black,
+    "yapf": _yapf,
+}
+
+# Passes whose output is already formatted by the same pass again
+IDEMPOTENT: Set[str] = {"black"}
+
+
+def register_formatter(name: str, formatter: Callable[[str], str], idempotent: bool = False):
+    """Make ``formatter`` available to pipelines as ``name``."""
+    FORMATTERS[name] = formatter
+    if idempotent:
+        IDEMPOTENT.add(name)
+    else:
+        IDEMPOTENT.discard(name)
+
+
+@dataclass
+class PassTiming:
+    name: str
+    seconds: float = 0.0
+    changed: bool = False
+    cached: bool = False  # result known for this text; the formatter didn't run
+    error: Optional[str] = None
+
+
+@dataclass
+class FormatResult:
+    code: str
+    passes: List[PassTiming] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return sum(timing.seconds for timing in self.passes)
+
+
+@dataclass
+class PassStats:
+    runs: int = 0
+    cached: int = 0
+    changed: int = 0
+    errors: int = 0
+    seconds: float = 0.0  # spent running the formatter
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "mean_ms": self.seconds / self.runs * 1000 if self.runs else 0.0}
+
+
+class FormattingService:
+    """
+    Runs each language's pipeline of formatter passes, remembering the
+    result of every pass per input text (by content hash) in an LRU of
+    ``max_entries`` (0 disables it).
+
+    A pass that leaves a text unchanged has reached its fixed point there,
+    so it is skipped the next time it sees that text; idempotent passes
+    (see IDEMPOTENT) also record their output as a fixed point, so
+    formatting already-formatted code runs no formatter at all.
+    """
+
+    def __init__(self, pipelines: Optional[Dict[str, List[str]]] = None, max_entries: int = 1024):
+        if pipelines is None:
+            config = CogenConfig()
+            register_external_formatters(config.external_formatters)
+            pipelines = config.format_pipelines
+        for language, passes in pipelines.items():
+            unknown = [name for name in passes if name not in FORMATTERS]
+            if unknown:
+                raise ValueError(f"Unknown formatter(s) for {language}: {', '.join(unknown)}; "
+                                 f"available: {', '.join(FORMATTERS)}")
+        self.pipelines = {language.lower(): list(passes) for language, passes in pipelines.items()}
+        self.max_entries = max_entries
+        # pass + text hash -> output, or None when the pass left the text unchanged
+        self._entries: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, PassStats] = {}
+        self.unavailable: Set[str] = set()
+
+    @classmethod
+    def from_config(cls, config: CogenConfig) -> "FormattingService":
+        register_external_formatters(config.external_formatters)
+        return cls(config.format_pipelines, config.format_cache_size)
+
+    def format(self, code: str, language: str) -> str:
+        return self.format_code(code, language).code
+
+    def format_code(self, code: str, language: str) -> FormatResult:
+        """Format ``code``, with the time and outcome of every pass."""
+        result = FormatResult(code)
+        text, digest = code, None
+        for name in self.pipelines.get(language.lower(), ()):
+            if name in self.unavailable:
+                continue
+            digest = digest or _digest(text)
+            key = f"{name}\0{digest}"
+            timing = PassTiming(name)
+            start = time.perf_counter()
+            with self._lock:
+                cached = key in self._entries
+                if cached:
+                    self._entries.move_to_end(key)
+                    output = self._entries[key]
+            if cached:
+                timing.cached = True
+                output = text if output is None else output
+            else:
+                try:
+                    output = FORMATTERS[name](text)
+                except ImportError:
+                    self.unavailable.add(name)
+                    continue
+                except Exception as e:
+                    # Usually code the formatter can't parse, or a timeout; the text is
+                    # passed on unchanged and nothing is remembered
+                    output, timing.error = text, f"{type(e).__name__}: {e}"
+                else:
+                    self._remember(key, None if output == text else output)
+                    if output != text and name in IDEMPOTENT:
+                        self._remember(f"{name}\0{_digest(output)}", None)
+            timing.seconds = time.perf_counter() - start
+            timing.changed = output != text
+            if timing.changed:
+                text, digest = output, None
+            self._record(timing)
+            result.passes.append(timing)
+        result.code = text
+        return result
+
+    def _remember(self, key: str, output: Optional[str]):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _record(self, timing: PassTiming):
+        with self._lock:
+            stats = self._stats.setdefault(timing.name, PassStats())
+            if timing.cached:
+                stats.cached += 1
+            else:
+                stats.runs += 1
+                stats.seconds += timing.seconds
+            stats.changed += timing.changed
+            stats.errors += timing.error is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "pipelines": self.pipelines,
+                "unavailable": sorted(self.unavailable),
+                "passes": {name: stats.to_dict() for name, stats in self._stats.items()},
+            }
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_default_service: Optional[FormattingService] = None
+
+
+def default_formatting_service() -> FormattingService:
+    """A service with the default pipelines, shared by users not given one."""
+    global _default_service
+    if _default_service is None:
+        _default_service = FormattingService()
+    return _default_service
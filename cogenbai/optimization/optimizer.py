@@ -1,43 +1,16 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import ast
-import autopep8
-import black
-from yapf.yapflib.yapf_api import FormatCode
+
+from .formatting import FormattingService, default_formatting_service
 
 class CodeOptimizer:
-    def __init__(self):
-        self.formatters = {
-            'python': self._optimize_python,
-            'javascript': self._optimize_javascript
-        }
+    def __init__(self, formatter: Optional[FormattingService] = None):
+        # Formatter passes per language come from the service's pipelines
+        # (CogenConfig.format_pipelines); languages without one are returned as is
+        self.formatter = formatter or default_formatting_service()
 
     def optimize(self, code: str, language: str) -> str:
-        optimizer = self.formatters.get(language.lower())
-        if not optimizer:
-            return code
-        return optimizer(code)
-
-    def _optimize_python(self, code: str) -> str:
-        # First pass: Basic PEP 8 formatting
-        code = autopep8.fix_code(code)
-        
-        try:
-            # Second pass: Black formatting
-            code = black.format_str(code, mode=black.FileMode())
-        except:
-            pass
-
-        try:
-            # Third pass: YAPF formatting
-            code, _ = FormatCode(code)
-        except:
-            pass
-
-        return code
-
-    def _optimize_javascript(self, code: str) -> str:
-        # Add JavaScript optimization logic here
-        return code
+        return self.formatter.format(code, language)
 
     def analyze_complexity(self, code: str) -> Dict[str, Any]:
         try:
@@ -1,9 +1,27 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import ast
 import re
 
+from .incremental import ReviewCache, split_definitions
+from .lexer import LANGUAGE_SPECS
+from .lexical import LexicalReview
+from .metrics import METRICS, SecurityMetric
+from .security import RuleSet, default_rules, security_result
+from .visitor import Metric, ReviewVisitor
+
+# Segments joined while looking for a parseable split before reviewing the whole module
+MAX_JOINED_SEGMENTS = 8
+
 class CodeReviewAnalyzer:
-    def __init__(self):
+    def __init__(self, cache: Optional[ReviewCache] = None, rules: Optional[RuleSet] = None):
+        # With a cache, Python modules are reviewed per top-level definition and
+        # only definitions whose text changed are analyzed again
+        self.cache = cache
+        # Security rules for every language; the built-in ones by default
+        self.rules = rules if rules is not None else default_rules()
+        # Python is reviewed in one parse and one walk of the tree (see metrics.py)
+        # and brace languages in one pass over their tokens (see lexical.py);
+        # these cover every other language
         self.metrics = {
             'complexity': self._analyze_complexity,
             'naming': self._analyze_naming,
@@ -12,29 +30,63 @@ class CodeReviewAnalyzer:
         }
 
     def review_code(self, code: str, language: str) -> Dict[str, Any]:
+        if language == 'python':
+            return self._review_python(code) if self.cache is None else self._review_incremental(code)
+        if language in LANGUAGE_SPECS:
+            return LexicalReview(language, self.rules).run(code.splitlines(True))
         results = {}
         for metric_name, analyzer in self.metrics.items():
             results[metric_name] = analyzer(code, language)
         return results
 
+    def _review_python(self, code: str) -> Dict[str, Any]:
+        tree = ast.parse(code)
+        visitor = ReviewVisitor(self._metrics(code))
+        visitor.walk(tree)
+        return visitor.results()
+
+    def _review_incremental(self, code: str) -> Dict[str, Any]:
+        metrics = self._metrics(code)
+        misses = []
+        pending, joined = "", 0
+        line_offset = 0
+        for segment in split_definitions(code):
+            if joined > MAX_JOINED_SEGMENTS:
+                break
+            pending += segment
+            # Cached security findings depend on the rules
+            key = self.cache.make_key(pending, self.rules.fingerprint)
+            partials = self.cache.get(key)
+            if partials is None:
+                try:
+                    tree = ast.parse(pending)
+                except SyntaxError:
+                    # Split inside a multi-line string or bracket: retry joined with the next segment
+                    joined += 1
+                    continue
+                visitor = ReviewVisitor(self._metrics(pending))
+                visitor.walk(tree)
+                partials = {metric.name: metric.partial() for metric in visitor.metrics}
+                misses.append((key, partials))
+            for metric in metrics:
+                metric.merge(partials[metric.name], line_offset)
+            line_offset += pending.count("\n")
+            pending, joined = "", 0
+        self.cache.put_many(misses)
+        if pending:
+            # Segments that don't parse even when joined (usually a syntax error);
+            # the whole-module review raises if the code is invalid
+            return self._review_python(code)
+        return {metric.name: metric.result() for metric in metrics}
+
+    def _metrics(self, source: str) -> List[Metric]:
+        return [metric(source, self.rules) if metric is SecurityMetric else metric(source) for metric in METRICS]
+
     def _analyze_complexity(self, code: str, language: str) -> Dict[str, Any]:
-        if language == 'python':
-            tree = ast.parse(code)
-            return {
-                'cyclomatic_complexity': self._count_branches(tree),
-                'cognitive_complexity': self._analyze_cognitive_complexity(tree)
-            }
         return {}
 
     def _analyze_naming(self, code: str, language: str) -> Dict[str, List[str]]:
-        issues = []
-        if language == 'python':
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Name):
-                    if not self._is_valid_name(node.id):
-                        issues.append(f"Invalid name: {node.id}")
-        return {'issues': issues}
+        return {'issues': []}
 
     def _analyze_documentation(self, code: str, language: str) -> Dict[str, Any]:
         doc_ratio = len(re.findall(r'"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'', code)) / max(1, len(code.splitlines()))
@@ -43,46 +95,6 @@ class CodeReviewAnalyzer:
             'has_module_docstring': code.lstrip().startswith('"""') or code.lstrip().startswith("'''")
         }
 
-    def _analyze_security(self, code: str, language: str) -> Dict[str, List[str]]:
-        vulnerabilities = []
-        dangerous_patterns = {
-            'python': [
-                (r'eval\(', 'Dangerous eval() usage'),
-                (r'exec\(', 'Dangerous exec() usage'),
-                (r'os\.system\(', 'Unsafe system command execution')
-            ]
-        }
-        
-        for pattern, message in dangerous_patterns.get(language, []):
-            if re.search(pattern, code):
-                vulnerabilities.append(message)
-        return {'vulnerabilities': vulnerabilities}
-
-    def _count_branches(self, tree: ast.AST) -> int:
-        count = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.For, ast.While, ast.Try)):
-                count += 1
-        return count
-
-    def _analyze_cognitive_complexity(self, tree: ast.AST) -> int:
-        complexity = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.While, ast.For)):
-                complexity += 1
-                # Add nesting penalty
-                complexity += self._get_nesting_level(node) * 0.5
-        return int(complexity)
-
-    def _get_nesting_level(self, node: ast.AST, level: int = 0) -> int:
-        parent = getattr(node, 'parent', None)
-        if parent is None:
-            return level
-        return self._get_nesting_level(parent, level + 1)
-
-    def _is_valid_name(self, name: str) -> bool:
-        if len(name) < 2:
-            return False
-        if not name.isidentifier():
-            return False
-        return True
+    def _analyze_security(self, code: str, language: str) -> Dict[str, Any]:
+        # Python and brace languages are scanned during their single pass; no rules for the rest yet
+        return security_result([])
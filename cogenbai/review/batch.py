@@ -0,0 +1,189 @@
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+import json
+import multiprocessing
+import os
+import time
+
+from ..config import CogenConfig
+from .analyzer import CodeReviewAnalyzer
+from .incremental import ReviewCache
+from .lexer import LANGUAGE_SPECS
+from .lexical import LexicalReview
+from .security import review_rules
+
+# Directories that hold dependencies or build output rather than project code
+SKIP_DIRS = {"node_modules", "__pycache__", "venv", "site-packages", "target", "vendor"}
+
+
+@dataclass
+class BatchReviewReport:
+    files: int = 0
+    failed: int = 0
+    lines: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    def add(self, record: Dict[str, Any]):
+        self.files += 1
+        if "error" in record:
+            self.failed += 1
+        else:
+            self.lines += record["lines"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "files_per_second": self.files_per_second}
+
+
+def extension_languages(language_extensions: Dict[str, List[str]]) -> Dict[str, str]:
+    """Extension -> language; the first language listing an extension wins."""
+    languages: Dict[str, str] = {}
+    for language, extensions in language_extensions.items():
+        for extension in extensions:
+            languages.setdefault(extension.lower(), language)
+    return languages
+
+
+def iter_source_files(root: str, language_extensions: Dict[str, List[str]]) -> Iterator[Tuple[str, str]]:
+    """
+    ``(path, language)`` for every file under ``root`` with a known
+    extension, in a stable order. Hidden directories and SKIP_DIRS are not
+    entered.
+    """
+    languages = extension_languages(language_extensions)
+    if os.path.isfile(root):
+        language = languages.get(os.path.splitext(root)[1].lower())
+        if language:
+            yield root, language
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            language = languages.get(os.path.splitext(name)[1].lower())
+            if language:
+                yield os.path.join(dirpath, name), language
+
+
+def review_batch(items: Iterable[Dict[str, Any]],
+                 num_workers: Optional[int] = None,
+                 config: Optional[CogenConfig] = None,
+                 executor: Optional[Executor] = None,
+                 cache_path: Optional[str] = None,
+                 rules_path: Optional[str] = None,
+                 chunk_size: int = 16) -> Iterator[Dict[str, Any]]:
+    """
+    Review many files, yielding one record per item as soon as it is done
+    (not in input order).
+
+    Each item has ``path`` and ``language`` and, optionally, ``code``;
+    without ``code`` the file is read by the worker. A record is
+    ``{"path", "language", "lines", "review"}``, or ``{"path", "language",
+    "error"}`` when the file can't be read or parsed.
+
+    Items are sent in chunks to ``executor`` (a long-lived pool with
+    ``num_workers`` processes) or, with ``num_workers > 1`` (default
+    ``config.num_workers``), to a process pool created for this call;
+    otherwise they are reviewed in-process. With ``cache_path``, workers
+    share a ReviewCache there, so unchanged definitions are not analyzed
+    again on the next run. ``rules_path`` adds security rules to the
+    built-in ones (see security.load_rules).
+    """
+    config = config or CogenConfig()
+    num_workers = num_workers or config.num_workers
+    chunks = _chunks(items, chunk_size)
+
+    if executor is None and num_workers <= 1:
+        for chunk in chunks:
+            yield from _review_chunk(chunk, cache_path, rules_path)
+        return
+
+    pool = executor or ProcessPoolExecutor(num_workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        in_flight = set()
+        for chunk in chunks:
+            # Keep a bounded number of chunks queued so huge trees are streamed
+            if len(in_flight) >= 2 * num_workers:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield from future.result()
+            in_flight.add(pool.submit(_review_chunk, chunk, cache_path, rules_path))
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield from future.result()
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+
+
+def run_batch_review(path: str, out: TextIO,
+                     config: Optional[CogenConfig] = None,
+                     num_workers: Optional[int] = None,
+                     cache_path: Optional[str] = None,
+                     rules_path: Optional[str] = None,
+                     progress: Optional[Callable[[BatchReviewReport], None]] = None) -> BatchReviewReport:
+    """Review every source file under ``path``, writing one NDJSON record per file to ``out``."""
+    config = config or CogenConfig()
+    report = BatchReviewReport()
+    start = time.perf_counter()
+    items = ({"path": file_path, "language": language}
+             for file_path, language in iter_source_files(path, config.language_extensions))
+    for record in review_batch(items, num_workers=num_workers, config=config,
+                               cache_path=cache_path, rules_path=rules_path):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+        report.add(record)
+        report.elapsed = time.perf_counter() - start
+        if progress:
+            progress(report)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _chunks(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# One analyzer per cache file and rule set, kept for the life of the worker process
+_analyzers: Dict[Tuple[Optional[str], Optional[str]], CodeReviewAnalyzer] = {}
+
+
+def _review_chunk(items: List[Dict[str, Any]], cache_path: Optional[str] = None,
+                  rules_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    analyzer = _analyzers.get((cache_path, rules_path))
+    if analyzer is None:
+        cache = ReviewCache(db_path=cache_path) if cache_path else None
+        analyzer = _analyzers[cache_path, rules_path] = CodeReviewAnalyzer(cache, review_rules(rules_path))
+    records = []
+    for item in items:
+        record = {"path": item["path"], "language": item["language"]}
+        try:
+            code = item.get("code")
+            if code is None and item["language"] in LANGUAGE_SPECS:
+                # Streamed line by line, so multi-MB files are never held in memory
+                lexical = LexicalReview(item["language"], analyzer.rules)
+                with open(item["path"], "r", encoding="utf-8") as f:
+                    review = lexical.run(f)
+                lines = lexical.lines
+            else:
+                if code is None:
+                    with open(item["path"], "r", encoding="utf-8") as f:
+                        code = f.read()
+                review = analyzer.review_code(code, item["language"])
+                lines = len(code.splitlines())
+            record.update(lines=lines, review=review)
+        except (OSError, SyntaxError, ValueError, RecursionError) as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        records.append(record)
+    return records
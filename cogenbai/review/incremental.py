@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+
+# Bump when a metric's partial state changes, so stale cached entries are ignored
+CACHE_VERSION = 2
+
+_DEFINITION = re.compile(r"^(@|(?:async[ \t]+)?def[ \t]|class[ \t])", re.M)
+
+Partials = Dict[str, Dict[str, Any]]
+
+
+def split_definitions(source: str) -> List[str]:
+    """
+    Split a module into segments that each start at a top-level ``def``,
+    ``class`` or decorator (module code before the first one is its own
+    segment); joined, they give back ``source``.
+
+    The split is textual, so a line inside a multi-line string can start a
+    false segment; such a segment won't parse on its own and the caller
+    joins it with the next one.
+    """
+    starts = [0]
+    decorated = False
+    for match in _DEFINITION.finditer(source):
+        # A def/class right after its decorators belongs to their segment
+        if not decorated and match.start() > 0:
+            starts.append(match.start())
+        decorated = match.group(1) == "@"
+    ends = starts[1:] + [len(source)]
+    return [source[start:end] for start, end in zip(starts, ends) if end > start]
+
+
+class ReviewCache:
+    """
+    Per-segment metric partials keyed by a hash of the segment's text, in an
+    in-memory LRU and, when ``db_path`` is given, a SQLite table shared by
+    processes and restarts. Memory misses fall back to the table and
+    promote the entry.
+    """
+
+    def __init__(self, max_entries: int = 4096, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Partials]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.conn = None
+        if db_path:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
+            # Review workers in several processes write to the same file
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS review_cache (
+                    key TEXT PRIMARY KEY,
+                    partials TEXT
+                )
+            ''')
+            self.conn.commit()
+
+    @staticmethod
+    def make_key(segment: str, salt: str = "") -> str:
+        """``salt`` tells apart results computed with different settings, such as security rules."""
+        return hashlib.sha256(f"{CACHE_VERSION}\0{salt}\0{segment}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Partials]:
+        with self._lock:
+            partials = self._entries.get(key)
+            if partials is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return partials
+            if self.conn is not None:
+                row = self.conn.execute("SELECT partials FROM review_cache WHERE key = ?", (key,)).fetchone()
+                if row:
+                    partials = json.loads(row[0])
+                    self._remember(key, partials)
+                    self.disk_hits += 1
+                    return partials
+            self.misses += 1
+            return None
+
+    def put_many(self, entries: List[Tuple[str, Partials]]):
+        """Store the partials of every segment reviewed for one module, in one transaction."""
+        with self._lock:
+            for key, partials in entries:
+                self._remember(key, partials)
+            if self.conn is not None and entries:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO review_cache VALUES (?, ?)",
+                    [(key, json.dumps(partials)) for key, partials in entries]
+                )
+                self.conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM review_cache")
+                self.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, partials: Partials):
+        self._entries[key] = partials
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
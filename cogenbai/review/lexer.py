@@ -0,0 +1,237 @@
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Pattern, Tuple
+import re
+
+# Token kinds. Strings and comments are reported without their text so that
+# memory stays bounded however long they are.
+IDENT = "ident"
+OPEN = "open"  # {
+CLOSE = "close"  # }
+PAREN_OPEN = "popen"  # ( or [
+PAREN_CLOSE = "pclose"  # ) or ]
+SEMI = "semi"
+MEMBER = "member"  # . -> :: ?.
+STRING = "string"
+COMMENT = "comment"
+DOC = "doc"  # /** */, /*! */, /// and //! comments
+NEWLINE = "newline"  # end of a line that ends in code
+
+Token = Tuple[str, str, int, int]  # kind, text, line (from 1), column (from 0)
+
+_C_CONTROL = frozenset({"if", "else", "for", "while", "do", "switch", "try", "catch", "finally"})
+
+
+@dataclass
+class LanguageSpec:
+    """Lexical rules and control-flow keywords of one brace language."""
+
+    name: str
+    branch_keywords: FrozenSet[str] = frozenset({"if", "for", "while", "try"})
+    # Keywords whose following ``{`` opens one more level of nesting
+    nesting_keywords: FrozenSet[str] = _C_CONTROL
+    identifier: str = r"[A-Za-z_]\w*"
+    quotes: Tuple[str, ...] = ('"', "'")
+    # Delimiters of strings that may span lines -> whether they take escapes
+    multiline_strings: Dict[str, bool] = field(default_factory=dict)
+    string_prefix: Optional[str] = None  # e.g. L"..." or b"...", consumed silently
+    line_comments: Tuple[str, ...] = ("//",)
+    nested_comments: bool = False
+    preprocessor: bool = False  # lines starting with '#' are directives
+    rust_literals: bool = False  # 'c' chars, 'a lifetimes and r#"..."# raw strings
+    newline_ends_statement: bool = False  # a newline can end `if (x) foo()` before any brace
+    sigil: str = ""  # PHP's '$' on variable names
+    regex_literals: bool = False  # JavaScript's /.../flags wherever an expression can start
+
+    def __post_init__(self):
+        self.nesting_keywords = self.nesting_keywords | self.branch_keywords
+        # Loops and ifs add to cognitive complexity; try (and Swift's do) only branch
+        self.cognitive_keywords = self.branch_keywords - {"try", "do"}
+        delimiters = sorted(set(self.quotes) | set(self.multiline_strings), key=len, reverse=True)
+        comment_body = r"(?:[^*/\n]|\*(?!/)|/(?!\*))*" if self.nested_comments else r"(?:[^*\n]|\*(?!/))*"
+        parts = [
+            # Characters that can't start a token are skipped in one step
+            r"[^\w$/#\"'`{}()\[\];.:\-?]*(?:",
+            *([r"(?P<raw>b?r(?P<hashes>#*)\".*?\"(?P=hashes))",
+               r"(?P<rawopen>b?r#*\")",
+               r"(?P<char>'(?:\\[^'\n]{1,10}|[^'\\\n])')",
+               r"(?P<lifetime>'[A-Za-z_]\w*)"] if self.rust_literals else []),
+            *([rf"(?P<prefix>{self.string_prefix})"] if self.string_prefix else []),
+            # Most frequent first: the alternatives are tried in order
+            rf"(?P<ident>{self.identifier})",
+            r"(?P<punct>[{}()\[\];.]|->|::|\?\.)",
+            r"(?P<num>\d[\w.]*)",
+            r"(?P<docline>(?:///|//!)[^\n]*)",
+            rf"(?P<line>(?:{'|'.join(re.escape(c) for c in self.line_comments)})[^\n]*)",
+            rf"(?P<docblock>/\*(?:\*(?!/)|!){comment_body}\*/)",
+            rf"(?P<block>/\*{comment_body}\*/)",
+            r"(?P<blockopen>/\*(?:\*(?!/)|!)?)",
+            *([r"(?P<regex>/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\[\n])+/[A-Za-z]*)"]
+              if self.regex_literals else []),
+            rf"(?P<string>{'|'.join(self._single_line_string(d, delimiters) for d in delimiters)})",
+            rf"(?P<stringopen>{'|'.join(re.escape(d) for d in delimiters)})",
+            r"(?P<other>.))",
+        ]
+        self.pattern = re.compile(parts[0] + "|".join(parts[1:]))
+
+        # The rest of a literal continued from an earlier line, through its closing delimiter
+        self.string_ends: Dict[str, Pattern] = {}
+        for delimiter in delimiters:
+            quote = re.escape(delimiter)
+            escapes = self.multiline_strings.get(delimiter, True)
+            if len(delimiter) == 1:
+                body = rf"(?:[^\\{quote}]|\\.)*" if escapes else rf"[^{quote}]*"
+            else:
+                body = r"(?:\\.|[^\\])*?" if escapes else r".*?"
+            self.string_ends[delimiter] = re.compile(body + quote, re.S)
+
+    def _single_line_string(self, delimiter: str, delimiters: List[str]) -> str:
+        """A literal opened and closed on the same line."""
+        quote = re.escape(delimiter)
+        if len(delimiter) > 1:
+            body = r"(?:\\.|[^\\\n])*?" if self.multiline_strings[delimiter] else r"[^\n]*?"
+            return quote + body + quote
+        # An opening quote that starts a triple-quoted string is not an empty string
+        triple = r"(?!" + quote * 2 + ")" if delimiter * 3 in delimiters else ""
+        if self.multiline_strings.get(delimiter, True):
+            return rf"{quote}{triple}(?:[^\\{quote}\n]|\\.)*{quote}"
+        return rf"{quote}[^{quote}\n]*{quote}"
+
+
+_C_FAMILY = dict(preprocessor=True, string_prefix=r"(?:u8|[uUL])(?=[\"'])")
+
+LANGUAGE_SPECS: Dict[str, LanguageSpec] = {spec.name: spec for spec in [
+    LanguageSpec("c", branch_keywords=frozenset({"if", "for", "while"}), **_C_FAMILY),
+    LanguageSpec("cpp", **_C_FAMILY),
+    LanguageSpec("java"),
+    LanguageSpec("csharp", branch_keywords=frozenset({"if", "for", "foreach", "while", "try"}),
+                 nesting_keywords=_C_CONTROL | {"foreach"}),
+    LanguageSpec("javascript", identifier=r"[A-Za-z_$][\w$]*", multiline_strings={"`": True},
+                 regex_literals=True),
+    LanguageSpec("typescript", identifier=r"[A-Za-z_$][\w$]*", multiline_strings={"`": True},
+                 regex_literals=True),
+    LanguageSpec("php", branch_keywords=frozenset({"if", "elseif", "for", "foreach", "while", "try"}),
+                 nesting_keywords=_C_CONTROL | {"elseif", "foreach"},
+                 identifier=r"\$?[A-Za-z_]\w*", line_comments=("//", "#"), sigil="$"),
+    LanguageSpec("go", branch_keywords=frozenset({"if", "for"}),
+                 nesting_keywords=frozenset({"if", "else", "for", "switch", "select"}),
+                 multiline_strings={"`": False}, newline_ends_statement=True),
+    LanguageSpec("rust", branch_keywords=frozenset({"if", "for", "while", "loop"}),
+                 nesting_keywords=frozenset({"if", "else", "for", "while", "loop", "match"}),
+                 quotes=('"',), string_prefix=r"b(?=[\"'])", nested_comments=True, rust_literals=True),
+    LanguageSpec("kotlin", nesting_keywords=_C_CONTROL | {"when"},
+                 multiline_strings={'"""': False}, nested_comments=True, newline_ends_statement=True),
+    LanguageSpec("swift", branch_keywords=frozenset({"if", "guard", "for", "while", "repeat", "do"}),
+                 nesting_keywords=frozenset({"if", "guard", "else", "for", "while", "repeat", "do",
+                                             "catch", "switch", "defer"}),
+                 quotes=('"',), multiline_strings={'"""': True}, nested_comments=True,
+                 newline_ends_statement=True),
+    LanguageSpec("dart", multiline_strings={'"""': True, "'''": True}, string_prefix=r"r(?=[\"'])",
+                 nested_comments=True),
+]}
+
+# Words after which a '/' starts a regex rather than dividing
+_REGEX_KEYWORDS = frozenset({"return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+                             "void", "throw", "instanceof", "yield", "await"})
+_IDENTIFIER_TAIL = re.compile(r"[\w$]+$")
+
+_PUNCTUATION = {"{": OPEN, "}": CLOSE, "(": PAREN_OPEN, "[": PAREN_OPEN, ")": PAREN_CLOSE, "]": PAREN_CLOSE,
+                ";": SEMI, ".": MEMBER, "->": MEMBER, "::": MEMBER, "?.": MEMBER}
+_LITERALS = {"string": STRING, "raw": STRING, "char": STRING, "line": COMMENT, "block": COMMENT,
+             "docline": DOC, "docblock": DOC}
+
+
+def tokenize(lines: Iterable[str], spec: LanguageSpec) -> Iterator[Token]:
+    """
+    Tokens of a source file given as lines (an open file works), in one
+    pass. Only the current line and the lexer state (an open block comment
+    or multi-line string) are held, so memory does not grow with the file.
+    Numbers and other operators produce no tokens.
+    """
+    finditer = spec.pattern.finditer
+    string_ends = spec.string_ends
+    open_string: Optional[Pattern] = None  # finishes a string continued from an earlier line
+    comment_depth = 0
+    in_directive = False
+
+    for lineno, line in enumerate(lines, 1):
+        pos = 0
+        if open_string is not None:
+            match = open_string.match(line)
+            if match is None:
+                continue
+            pos, open_string = match.end(), None
+        elif comment_depth:
+            pos, comment_depth = _skip_comment(line, 0, comment_depth, spec.nested_comments)
+            if comment_depth:
+                continue
+        elif spec.preprocessor and (in_directive or line.lstrip().startswith("#")):
+            in_directive = line.rstrip().endswith("\\")
+            continue
+
+        while pos is not None:
+            resume = None
+            for match in finditer(line, pos):
+                kind = match.lastgroup
+                if kind == IDENT:
+                    yield IDENT, match.group(kind), lineno, match.start(kind)
+                elif kind == "punct":
+                    text = match.group(kind)
+                    yield _PUNCTUATION[text], text, lineno, match.start(kind)
+                elif kind == "other" or kind == "num" or kind == "prefix" or kind == "lifetime":
+                    continue
+                elif kind in _LITERALS:
+                    yield _LITERALS[kind], "", lineno, match.start(kind)
+                elif kind == "blockopen":
+                    # Nested, or continues on the next lines
+                    yield (COMMENT if match.group(kind) == "/*" else DOC), "", lineno, match.start(kind)
+                    end, comment_depth = _skip_comment(line, match.end(), 1, spec.nested_comments)
+                    if not comment_depth:
+                        resume = end
+                    break
+                elif kind == "stringopen":
+                    yield STRING, "", lineno, match.start(kind)
+                    delimiter = match.group(kind)
+                    if delimiter in spec.multiline_strings:
+                        open_string = string_ends[delimiter]
+                    break  # an unterminated one-line string ends with the line
+                elif kind == "regex":
+                    start = match.start(kind)
+                    if _starts_expression(line, start):
+                        yield STRING, "", lineno, start
+                        continue
+                    resume = start + 1  # a division; lex what follows the '/'
+                    break
+                elif kind == "rawopen":
+                    yield STRING, "", lineno, match.start(kind)
+                    open_string = re.compile(r'.*?"' + "#" * match.group(kind).count("#"), re.S)
+                    break
+            pos = resume
+
+        if open_string is None and not comment_depth:
+            yield NEWLINE, "", lineno, len(line)
+
+
+def _starts_expression(line: str, pos: int) -> bool:
+    """Whether a '/' at ``pos`` begins an operand (a regex) rather than following one (a division)."""
+    before = line[:pos].rstrip()
+    if not before or before[-1] not in ")]\"'`" and not (before[-1].isalnum() or before[-1] in "_$"):
+        return True
+    word = _IDENTIFIER_TAIL.search(before)
+    return word is not None and word.group() in _REGEX_KEYWORDS
+
+
+def _skip_comment(line: str, pos: int, depth: int, nested: bool) -> Tuple[int, int]:
+    """Position after the block comment open at ``pos`` and the depth still open at the end of the line."""
+    if not nested:
+        end = line.find("*/", pos)
+        return (len(line), depth) if end < 0 else (end + 2, 0)
+    while depth:
+        end = line.find("*/", pos)
+        start = line.find("/*", pos)
+        if start >= 0 and (end < 0 or start < end):
+            depth, pos = depth + 1, start + 2
+        elif end >= 0:
+            depth, pos = depth - 1, end + 2
+        else:
+            return len(line), depth
+    return pos, 0
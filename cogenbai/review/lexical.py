@@ -0,0 +1,110 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from .lexer import (
+    CLOSE, COMMENT, DOC, IDENT, LANGUAGE_SPECS, MEMBER, NEWLINE, OPEN, PAREN_CLOSE, PAREN_OPEN, SEMI,
+    tokenize,
+)
+from .security import RuleSet, SecurityScanner
+
+
+class LexicalReview:
+    """
+    Review metrics for brace languages, computed in one pass over the
+    tokens of ``lexer.tokenize``; results have the same keys as the Python
+    review.
+
+    - complexity: branch keywords (if/for/while/try and the language's
+      equivalents); if/loops also add ``1 + 0.5 * nesting`` to cognitive
+      complexity, where nesting counts the enclosing ``{`` blocks opened by
+      control-flow keywords (``else if`` stays at the depth of its ``if``);
+    - naming: identifiers shorter than two characters, except member names
+      after ``.``/``->``/``::`` and the ``_`` discard;
+    - documentation: doc comments per line, and whether the file starts
+      with a comment;
+    - security: the language's rules (see security.py), checked at every
+      identifier that triggers one.
+    """
+
+    def __init__(self, language: str, rules: Optional[RuleSet] = None):
+        if language not in LANGUAGE_SPECS:
+            raise ValueError(f"No lexer for {language!r}; supported: {', '.join(LANGUAGE_SPECS)}")
+        self.spec = LANGUAGE_SPECS[language]
+        self.scanner = SecurityScanner(language, rules)
+        self.lines = 0
+        self._line = ""
+
+    def _count(self, lines: Iterable[str]) -> Iterator[str]:
+        # tokenize finishes a line before reading the next, so _line is the one being tokenized
+        for line in lines:
+            self.lines += 1
+            self._line = line
+            yield line
+
+    def run(self, lines: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        spec = self.spec
+        branch_keywords = spec.branch_keywords
+        cognitive_keywords = spec.cognitive_keywords
+        nesting_keywords = spec.nesting_keywords
+        newline_ends_statement = spec.newline_ends_statement
+        sigil = spec.sigil
+        triggers = self.scanner.triggers
+
+        branches, cognitive, docs = 0, 0.0, 0
+        issues: List[str] = []
+        # One entry per open '{': whether it was opened by a control-flow keyword
+        blocks: List[bool] = []
+        depth = parens = 0
+        pending = member = False
+        first = None
+
+        for kind, text, lineno, column in tokenize(self._count(lines), spec):
+            if first is None and kind != NEWLINE:
+                first = kind
+            if kind == IDENT:
+                if text in triggers:
+                    self.scanner.check(self._line, lineno, column, text)
+                if member:
+                    member = False
+                    continue
+                if text in nesting_keywords:
+                    pending = True
+                    if text in branch_keywords:
+                        branches += 1
+                        if text in cognitive_keywords:
+                            cognitive += 1 + 0.5 * depth
+                else:
+                    name = text[len(sigil):] if sigil and text.startswith(sigil) else text
+                    if len(name) < 2 and name != "_":
+                        issues.append(f"Invalid name: {text}")
+            elif kind == NEWLINE:
+                if newline_ends_statement and not parens:
+                    pending = False
+                continue
+            elif kind == OPEN:
+                blocks.append(pending)
+                depth += pending
+                pending = False
+            elif kind == CLOSE:
+                if blocks and blocks.pop():
+                    depth -= 1
+                pending = False
+            elif kind == PAREN_OPEN:
+                parens += 1
+            elif kind == PAREN_CLOSE:
+                parens = max(0, parens - 1)
+            elif kind == SEMI:
+                # for (;;) headers don't end the statement
+                if not parens:
+                    pending = False
+            elif kind == DOC:
+                docs += 1
+            member = kind == MEMBER
+
+        return {
+            'complexity': {'cyclomatic_complexity': branches, 'cognitive_complexity': int(cognitive)},
+            'naming': {'issues': issues},
+            'documentation': {
+                'documentation_ratio': docs / max(1, self.lines),
+                'has_module_docstring': first in (DOC, COMMENT)
+            },
+            'security': self.scanner.result()
+        }
@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional, Type
+import ast
+
+from .security import RuleSet, SecurityScanner
+from .visitor import Handler, Metric
+
+DOCUMENTED_NODES = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+class ComplexityMetric(Metric):
+    """Cyclomatic complexity (branch count) and cognitive complexity with a nesting penalty."""
+
+    name = "complexity"
+
+    def __init__(self, source: str):
+        super().__init__(source)
+        self.branches = 0
+        self.cognitive = 0.0
+
+    def handlers(self) -> Dict[Type[ast.AST], Handler]:
+        return {ast.If: self._loop_or_if, ast.For: self._loop_or_if, ast.While: self._loop_or_if,
+                ast.Try: self._branch}
+
+    def _branch(self, node: ast.AST, depth: int):
+        self.branches += 1
+
+    def _loop_or_if(self, node: ast.AST, depth: int):
+        self.branches += 1
+        self.cognitive += 1 + depth * 0.5
+
+    def result(self) -> Dict[str, Any]:
+        return {'cyclomatic_complexity': self.branches, 'cognitive_complexity': int(self.cognitive)}
+
+    def partial(self) -> Dict[str, Any]:
+        # Cognitive complexity is truncated only once, for the whole module
+        return {'branches': self.branches, 'cognitive': self.cognitive}
+
+    def merge(self, partial: Dict[str, Any], line_offset: int = 0):
+        self.branches += partial['branches']
+        self.cognitive += partial['cognitive']
+
+
+class NamingMetric(Metric):
+    name = "naming"
+
+    def __init__(self, source: str):
+        super().__init__(source)
+        self.issues: List[str] = []
+
+    def handlers(self) -> Dict[Type[ast.AST], Handler]:
+        return {ast.Name: self._name}
+
+    def _name(self, node: ast.Name, depth: int):
+        if len(node.id) < 2 or not node.id.isidentifier():
+            self.issues.append(f"Invalid name: {node.id}")
+
+    def result(self) -> Dict[str, Any]:
+        return {'issues': self.issues}
+
+    def partial(self) -> Dict[str, Any]:
+        return {'issues': self.issues}
+
+    def merge(self, partial: Dict[str, Any], line_offset: int = 0):
+        self.issues.extend(partial['issues'])
+
+
+class DocumentationMetric(Metric):
+    """Docstrings on the module, classes and functions, per line of source."""
+
+    name = "documentation"
+
+    def __init__(self, source: str):
+        super().__init__(source)
+        self.docstrings = 0
+        self.has_module_docstring = False
+
+    def handlers(self) -> Dict[Type[ast.AST], Handler]:
+        return {node_type: self._definition for node_type in DOCUMENTED_NODES}
+
+    def _definition(self, node: ast.AST, depth: int):
+        if ast.get_docstring(node, clean=False) is not None:
+            self.docstrings += 1
+            if isinstance(node, ast.Module):
+                self.has_module_docstring = True
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            'documentation_ratio': self.docstrings / max(1, len(self.source.splitlines())),
+            'has_module_docstring': self.has_module_docstring
+        }
+
+    def partial(self) -> Dict[str, Any]:
+        # The ratio is taken over the lines of the whole module, in result()
+        return {'docstrings': self.docstrings, 'has_module_docstring': self.has_module_docstring}
+
+    def merge(self, partial: Dict[str, Any], line_offset: int = 0):
+        self.docstrings += partial['docstrings']
+        self.has_module_docstring = self.has_module_docstring or partial['has_module_docstring']
+
+
+class SecurityMetric(Metric):
+    """
+    Security rules for Python (see security.py), checked where a name or
+    attribute equal to a rule's trigger appears; text in strings and
+    comments is never a node, so it never matches.
+    """
+
+    name = "security"
+
+    def __init__(self, source: str, rules: Optional[RuleSet] = None):
+        super().__init__(source)
+        self.scanner = SecurityScanner("python", rules)
+        self.triggers = self.scanner.triggers
+        self._lines: Optional[List[str]] = None
+
+    def handlers(self) -> Dict[Type[ast.AST], Handler]:
+        return {ast.Name: self._name, ast.Attribute: self._attribute}
+
+    def _name(self, node: ast.Name, depth: int):
+        if node.id in self.triggers:
+            self._check(node.id, node.lineno, node.col_offset)
+
+    def _attribute(self, node: ast.Attribute, depth: int):
+        if node.attr in self.triggers:
+            # The attribute name ends the node
+            self._check(node.attr, node.end_lineno, node.end_col_offset - len(node.attr.encode("utf-8")))
+
+    def _check(self, trigger: str, lineno: int, offset: int):
+        if self._lines is None:
+            self._lines = self.source.splitlines()
+        line = self._lines[lineno - 1]
+        # AST offsets count UTF-8 bytes
+        column = offset if line.isascii() else len(line.encode("utf-8")[:offset].decode("utf-8", "ignore"))
+        self.scanner.check(line, lineno, column, trigger)
+
+    def result(self) -> Dict[str, Any]:
+        return self.scanner.result()
+
+    def partial(self) -> Dict[str, Any]:
+        return {'findings': self.scanner.findings}
+
+    def merge(self, partial: Dict[str, Any], line_offset: int = 0):
+        self.scanner.findings.extend({**finding, "line": finding["line"] + line_offset}
+                                     for finding in partial['findings'])
+
+
+METRICS = [ComplexityMetric, NamingMetric, DocumentationMetric, SecurityMetric]
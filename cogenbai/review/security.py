@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+import hashlib
+import json
+import os
+import re
+
+# Built-in rule files, one per language family
+RULES_DIR = os.path.join(os.path.dirname(__file__), "rules")
+
+SEVERITIES = ("low", "medium", "high")
+
+# An optional (?<![...]) guard, then an identifier or a group of alternative ones
+# that the rest of the pattern can't extend
+_LEADING_IDENTIFIERS = re.compile(r"(?:\(\?<!\[[^\]]*\]\))?"
+                                  r"(?:(\\?\$?[A-Za-z_]\w*)|\(\?:((?:\\?\$?[A-Za-z_]\w*\|)+\\?\$?[A-Za-z_]\w*)\))"
+                                  r"(?![\w(\[?*+{|]|\\[wdWD])")
+
+
+@dataclass
+class SecurityRule:
+    """
+    One security check. ``pattern`` is matched where one of the
+    ``triggers`` identifiers appears in code (never inside a string or
+    comment) and runs to the end of that line at most, so it may look at
+    the call's arguments. Without ``triggers``, the identifier the pattern
+    starts with (or each one of a leading ``(?:a|b)`` group) is used.
+    """
+
+    id: str
+    message: str
+    pattern: str
+    languages: Tuple[str, ...]
+    severity: str = "medium"
+    triggers: Tuple[str, ...] = ()
+    regex: Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.severity not in SEVERITIES:
+            raise ValueError(f"Rule {self.id}: severity must be one of {', '.join(SEVERITIES)}")
+        if not self.languages:
+            raise ValueError(f"Rule {self.id}: no languages")
+        self.languages = tuple(self.languages)
+        if not self.triggers:
+            match = _LEADING_IDENTIFIERS.match(self.pattern)
+            if match is None:
+                raise ValueError(f"Rule {self.id}: pattern must start with an identifier, or set 'triggers'")
+            # PHP variables keep their '$', as the lexer reports them
+            names = (match.group(1) or match.group(2)).replace("\\", "")
+            self.triggers = tuple(names.split("|"))
+        self.triggers = tuple(self.triggers)
+        try:
+            self.regex = re.compile(self.pattern)
+        except re.error as e:
+            raise ValueError(f"Rule {self.id}: invalid pattern: {e}") from e
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "message": self.message, "pattern": self.pattern,
+                "languages": list(self.languages), "severity": self.severity, "triggers": list(self.triggers)}
+
+
+class RuleSet:
+    """
+    Rules indexed by language and trigger identifier. Scanning looks up
+    each identifier once, so its cost does not grow with the number of
+    rules, only with the number of hits to confirm.
+    """
+
+    def __init__(self, rules: Iterable[SecurityRule] = ()):
+        self.rules: List[SecurityRule] = []
+        self._ids: Set[str] = set()
+        self._triggers: Dict[str, Dict[str, List[SecurityRule]]] = {}
+        self._fingerprint: Optional[str] = None
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: SecurityRule):
+        if rule.id in self._ids:
+            raise ValueError(f"Duplicate rule id {rule.id!r}")
+        self._ids.add(rule.id)
+        self.rules.append(rule)
+        for language in rule.languages:
+            triggers = self._triggers.setdefault(language, {})
+            for trigger in rule.triggers:
+                triggers.setdefault(trigger, []).append(rule)
+        self._fingerprint = None
+
+    def triggers(self, language: str) -> Dict[str, List[SecurityRule]]:
+        """Trigger identifier -> rules, for one language."""
+        return self._triggers.get(language, {})
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes whenever a rule does; part of the review cache key."""
+        if self._fingerprint is None:
+            text = json.dumps([rule.to_dict() for rule in self.rules], sort_keys=True)
+            self._fingerprint = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return self._fingerprint
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def load_rules(*paths: str) -> RuleSet:
+    """
+    Rules from JSON files, or directories of them. A file holds
+    ``{"languages": [...], "rules": [...]}``, where each rule is a
+    SecurityRule as a dict and may override the file's ``languages``.
+    """
+    rule_set = RuleSet()
+    for path in paths:
+        files = ([os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json")]
+                 if os.path.isdir(path) else [path])
+        for file_path in files:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for rule in data.get("rules", []):
+                rule_set.add(SecurityRule(**{"languages": data.get("languages", ()), **rule}))
+    return rule_set
+
+
+_default_rules: Optional[RuleSet] = None
+
+
+def default_rules() -> RuleSet:
+    """The built-in rules, loaded once per process."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = load_rules(RULES_DIR)
+    return _default_rules
+
+
+def review_rules(extra_path: Optional[str] = None) -> RuleSet:
+    """The built-in rules, plus those in ``extra_path`` (a rule file or directory)."""
+    return load_rules(RULES_DIR, extra_path) if extra_path else default_rules()
+
+
+class SecurityScanner:
+    """Collects the findings of one language's rules; identifiers are fed in by the review pass."""
+
+    def __init__(self, language: str, rules: Optional[RuleSet] = None):
+        self.triggers = (rules if rules is not None else default_rules()).triggers(language)
+        self.findings: List[Dict[str, Any]] = []
+
+    def check(self, line: str, lineno: int, column: int, trigger: str):
+        """Confirm the rules triggered by the identifier at ``column`` of ``line``."""
+        for rule in self.triggers[trigger]:
+            if rule.regex.match(line, column):
+                self.findings.append({"rule": rule.id, "message": rule.message, "severity": rule.severity,
+                                      "line": lineno, "column": column})
+
+    def result(self) -> Dict[str, Any]:
+        return security_result(self.findings)
+
+
+def security_result(findings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """``vulnerabilities`` lists each message once; ``findings`` has every hit, in source order."""
+    findings = sorted(findings, key=lambda finding: (finding["line"], finding["column"]))
+    return {'vulnerabilities': list(dict.fromkeys(finding["message"] for finding in findings)),
+            'findings': findings}
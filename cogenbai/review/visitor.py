@@ -0,0 +1,69 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+import ast
+
+# Statements whose bodies count as one more level of nesting
+NESTING_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.With, ast.AsyncWith)
+
+Handler = Callable[[ast.AST, int], None]
+
+
+class Metric:
+    """
+    One review metric computed during the shared walk. Subclasses map node
+    types to handlers in ``handlers``; each handler receives the node and
+    its nesting depth (the number of enclosing if/for/while/try/with
+    statements, with ``elif`` staying at the depth of its ``if``).
+    """
+
+    name = ""
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def handlers(self) -> Dict[Type[ast.AST], Handler]:
+        return {}
+
+    def result(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def partial(self) -> Dict[str, Any]:
+        """JSON-serializable state after walking one segment of a module (see incremental.py)."""
+        raise NotImplementedError
+
+    def merge(self, partial: Dict[str, Any], line_offset: int = 0):
+        """
+        Fold in a segment's ``partial``; merging every segment in order gives
+        the whole-module result. ``line_offset`` is the number of lines
+        before the segment, for results that report line numbers.
+        """
+        raise NotImplementedError
+
+
+class ReviewVisitor:
+    """Walks a tree once, pre-order, dispatching every node to the metrics' handlers."""
+
+    def __init__(self, metrics: Iterable[Metric]):
+        self.metrics = list(metrics)
+        self._dispatch: Dict[Type[ast.AST], List[Handler]] = {}
+        for metric in self.metrics:
+            for node_type, handler in metric.handlers().items():
+                self._dispatch.setdefault(node_type, []).append(handler)
+
+    def walk(self, tree: ast.AST):
+        dispatch = self._dispatch
+        # Explicit stack: deeply nested generated code must not hit the recursion limit
+        stack: List[Tuple[ast.AST, int]] = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            for handler in dispatch.get(type(node), ()):
+                handler(node, depth)
+
+            child_depth = depth + 1 if isinstance(node, NESTING_NODES) else depth
+            # elif: the chained if stays at the depth of the first one
+            elif_node = (node.orelse[0] if isinstance(node, ast.If) and len(node.orelse) == 1
+                         and isinstance(node.orelse[0], ast.If) else None)
+            stack.extend((child, depth if child is elif_node else child_depth)
+                         for child in reversed(list(ast.iter_child_nodes(node))))
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        return {metric.name: metric.result() for metric in self.metrics}
@@ -0,0 +1,131 @@
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+import hashlib
+import sqlite3
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+CODECS = ("raw", "zlib", "zstd")
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress(text: str, codec: str) -> Tuple[str, bytes]:
+    """Compressed bytes and the codec actually used; tiny texts are kept raw."""
+    raw = text.encode("utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        data = zstandard.ZstdCompressor(level=3).compress(raw)
+    elif codec == "zlib":
+        data = zlib.compress(raw, 6)
+    elif codec == "raw":
+        data = raw
+    else:
+        raise ValueError(f"Unknown codec {codec!r}; choose from {', '.join(CODECS)}")
+    return (codec, data) if len(data) < len(raw) else ("raw", raw)
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Snippet was stored with zstd; install the zstandard package to read it")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec != "raw":
+        raise ValueError(f"Unknown codec {codec!r}")
+    return data.decode("utf-8")
+
+
+class BlobStore:
+    """
+    Content-addressed store of compressed texts in the ``blobs`` table.
+
+    Identical texts (boilerplate, imports, templates repeated across
+    projects) are stored once under their SHA-256 digest and reference
+    counted; a blob is deleted when its last reference is released. Writes
+    are left to the caller's transaction.
+    """
+
+    def __init__(self, conn, codec: Optional[str] = None):
+        # A connection, or a callable returning the current thread's connection
+        self._conn = conn
+        self.codec = codec or default_codec()
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown codec {self.codec!r}; choose from {', '.join(CODECS)}")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                codec TEXT,
+                size INTEGER,
+                refs INTEGER,
+                data BLOB
+            )
+        ''')
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._conn if isinstance(self._conn, sqlite3.Connection) else self._conn()
+
+    @staticmethod
+    def digest(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def put(self, text: str) -> str:
+        """Store ``text`` (or add a reference to the existing copy); returns its digest."""
+        digest = self.digest(text)
+        cursor = self.conn.execute("UPDATE blobs SET refs = refs + 1 WHERE digest = ?", (digest,))
+        if cursor.rowcount == 0:
+            codec, data = compress(text, self.codec)
+            self.conn.execute("INSERT INTO blobs VALUES (?, ?, ?, 1, ?)",
+                              (digest, codec, len(text), data))
+        return digest
+
+    def release(self, digest: str):
+        """Drop one reference; the blob is deleted with its last one."""
+        self.conn.execute("UPDATE blobs SET refs = refs - 1 WHERE digest = ?", (digest,))
+        self.conn.execute("DELETE FROM blobs WHERE digest = ? AND refs <= 0", (digest,))
+
+    def get(self, digest: str) -> Optional[str]:
+        row = self.conn.execute("SELECT codec, data FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        return decompress(*row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        blobs, refs, size, stored = self.conn.execute(
+            "SELECT COUNT(*), SUM(refs), SUM(size), SUM(LENGTH(data)) FROM blobs"
+        ).fetchone()
+        return {"blobs": blobs, "references": refs or 0, "text_bytes": size or 0, "stored_bytes": stored or 0}
+
+
+class LazySnippets(Mapping):
+    """
+    Read-only feature -> code mapping over compressed blobs. A snippet is
+    decompressed the first time it is accessed, so callers that touch only
+    a few features of a large project pay only for those.
+    """
+
+    def __init__(self, rows: List[Tuple[str, str, bytes]]):
+        self._compressed = {feature: (codec, data) for feature, codec, data in rows}
+        self._decoded: Dict[str, str] = {}
+
+    def __getitem__(self, feature: str) -> str:
+        code = self._decoded.get(feature)
+        if code is None:
+            code = self._decoded[feature] = decompress(*self._compressed[feature])
+        return code
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._compressed)
+
+    def __len__(self) -> int:
+        return len(self._compressed)
+
+    def __repr__(self) -> str:
+        return f"LazySnippets({list(self._compressed)})"
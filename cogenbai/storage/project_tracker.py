@@ -1,8 +1,15 @@
+import asyncio
+import base64
 import sqlite3
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import json
+import threading
+from .blob_store import BlobStore, LazySnippets, decompress
+from .snippet_index import SnippetIndex
 
 @dataclass
 class ProjectState:
@@ -13,13 +20,134 @@ class ProjectState:
     status: str
     completion_percentage: float
     last_modified: datetime
-    code_snippets: Dict[str, str]
+    code_snippets: Mapping[str, str]
     dependencies: List[str]
+    owner_id: Optional[str] = None
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready fields, without the code."""
+        return {
+            "project_id": self.project_id,
+            "name": self.name,
+            "language": self.language,
+            "framework": self.framework,
+            "status": self.status,
+            "completion_percentage": self.completion_percentage,
+            "last_modified": self.last_modified.isoformat(),
+            "dependencies": self.dependencies,
+            "owner_id": self.owner_id,
+        }
+
+@dataclass
+class ProjectMatch:
+    project: ProjectState
+    score: float  # FTS5 bm25 rank of the best snippet; lower is better
+    features: List[str] = field(default_factory=list)
+
+PROJECT_COLUMNS = ("project_id, name, language, framework, status, completion_percentage, "
+                   "last_modified, dependencies, owner_id")
+
+def project_cursor(project: ProjectState) -> str:
+    """Keyset pagination token that resumes ``list_projects`` after ``project``."""
+    return _encode_cursor(project.last_modified.isoformat(), project.project_id)
+
+def search_cursor(match: ProjectMatch) -> str:
+    """Keyset pagination token that resumes ``search_projects`` after ``match``."""
+    return _encode_cursor(match.score, match.project.project_id)
+
+def _encode_cursor(*key: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str, types: Tuple[type, type]) -> Tuple:
+    try:
+        key = tuple(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii"))))
+        if len(key) == len(types) and all(isinstance(value, kind) for value, kind in zip(key, types)):
+            return key
+    except (TypeError, ValueError):
+        pass
+    raise ValueError(f"Invalid cursor {cursor!r}")
 
 class ProjectTracker:
-    def __init__(self, db_path: str = "cogenbai_projects.db"):
-        self.conn = sqlite3.connect(db_path)
-        self._init_db()
+    """
+    Project storage in SQLite, safe to share between threads and processes.
+
+    Every thread gets its own connection (opened on first use) in WAL mode,
+    so readers never block on the writer and writers from several API
+    workers queue on the database lock for up to ``busy_timeout`` seconds
+    instead of failing. Each write method is a single transaction.
+    """
+
+    def __init__(self, db_path: str = "cogenbai_projects.db", busy_timeout: float = 5.0):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        # Every thread's connection has to reach the same in-memory database
+        self._database = (f"file:cogenbai-projects-{id(self)}?mode=memory&cache=shared"
+                          if db_path == ":memory:" else db_path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        with self.transaction():
+            self._init_db()
+            self.blobs = BlobStore(lambda: self.conn)
+            self.snippet_index = SnippetIndex(lambda: self.conn)
+            self._migrate()
+        if not self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() \
+                and self.conn.execute("SELECT 1 FROM projects LIMIT 1").fetchone():
+            self.analyze()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are opened explicitly by transaction()
+            conn = sqlite3.connect(self._database, timeout=self.busy_timeout, isolation_level=None,
+                                   check_same_thread=False, uri=self._database.startswith("file:"))
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")  # durable at checkpoints, safe in WAL
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self, write: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        Run the block in one transaction on this thread's connection.
+
+        Write transactions take the write lock up front (BEGIN IMMEDIATE), so
+        they wait for the busy timeout rather than failing on a lock upgrade.
+        Nested calls join the outer transaction.
+        """
+        conn = self.conn
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def analyze(self):
+        """
+        Refresh the query planner's statistics, so a listing filtered on
+        several columns uses the most selective index. Worth running after
+        bulk loads; ``close`` runs SQLite's lighter ``PRAGMA optimize``.
+        """
+        self.conn.execute("ANALYZE")
+
+    def close(self):
+        """Close the connections of every thread."""
+        self.conn.execute("PRAGMA optimize")
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
     def _init_db(self):
         cursor = self.conn.cursor()
@@ -33,28 +161,83 @@ class ProjectTracker:
                 completion_percentage REAL,
                 last_modified TIMESTAMP,
                 code_snippets TEXT,
-                dependencies TEXT
+                dependencies TEXT,
+                owner_id TEXT
             )
         ''')
-        self.conn.commit()
+        if "owner_id" not in [row[1] for row in cursor.execute("PRAGMA table_info(projects)")]:
+            cursor.execute("ALTER TABLE projects ADD COLUMN owner_id TEXT")
+        # Listing filters on one column and pages by (last_modified, project_id)
+        for column in ("owner_id", "language", "framework", "status"):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS projects_{column} "
+                           f"ON projects ({column}, last_modified, project_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS projects_modified ON projects (last_modified, project_id)")
+        # One row per feature, pointing at its code in the blob store;
+        # rowid order is the order features were added
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS snippets (
+                project_id TEXT,
+                feature TEXT,
+                digest TEXT,
+                PRIMARY KEY (project_id, feature)
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS snippets_project ON snippets (project_id)")
+
+    def _migrate(self):
+        # Full-text index of snippet code. Contentless, since the code itself is
+        # compressed in the blob store; rowids are those of the snippets table.
+        fts_exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'snippet_fts'"
+        ).fetchone()
+        self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS snippet_fts USING fts5(code, content='')")
+
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(snippets)")]
+        if "code" in columns:
+            # Snippet rows that held their code verbatim
+            if "digest" not in columns:
+                self.conn.execute("ALTER TABLE snippets ADD COLUMN digest TEXT")
+            for rowid, code in self.conn.execute(
+                "SELECT rowid, code FROM snippets WHERE code IS NOT NULL"
+            ).fetchall():
+                self.conn.execute("UPDATE snippets SET digest = ? WHERE rowid = ?", (self.blobs.put(code), rowid))
+            self.conn.execute("ALTER TABLE snippets DROP COLUMN code")
+
+        if not fts_exists:
+            for rowid, codec, data in self.conn.execute(
+                "SELECT s.rowid, b.codec, b.data FROM snippets s JOIN blobs b ON b.digest = s.digest"
+            ).fetchall():
+                self.conn.execute("INSERT INTO snippet_fts (rowid, code) VALUES (?, ?)",
+                                  (rowid, decompress(codec, data)))
+
+        # Databases from before the snippets table kept them as one JSON blob
+        rows = self.conn.execute(
+            "SELECT project_id, code_snippets FROM projects WHERE code_snippets IS NOT NULL"
+        ).fetchall()
+        for project_id, code_snippets in rows:
+            snippets = json.loads(code_snippets or "{}")
+            for feature, code in snippets.items():
+                self._upsert_snippet(project_id, feature, code)
+            self.conn.execute("UPDATE projects SET code_snippets = NULL WHERE project_id = ?", (project_id,))
 
     def create_project(self, project: ProjectState) -> bool:
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                project.project_id,
-                project.name,
-                project.language,
-                project.framework,
-                project.status,
-                project.completion_percentage,
-                project.last_modified.isoformat(),
-                json.dumps(project.code_snippets),
-                json.dumps(project.dependencies)
-            ))
-            self.conn.commit()
+            with self.transaction() as conn:
+                conn.execute(f'''
+                    INSERT INTO projects ({PROJECT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    project.project_id,
+                    project.name,
+                    project.language,
+                    project.framework,
+                    project.status,
+                    project.completion_percentage,
+                    project.last_modified.isoformat(),
+                    json.dumps(project.dependencies),
+                    project.owner_id
+                ))
+                for feature, code in project.code_snippets.items():
+                    self._upsert_snippet(project.project_id, feature, code)
             return True
         except Exception as e:
             print(f"Error creating project: {e}")
@@ -62,30 +245,300 @@ class ProjectTracker:
 
     def update_project(self, project_id: str, updates: Dict) -> bool:
         try:
-            cursor = self.conn.cursor()
-            set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-            query = f"UPDATE projects SET {set_clause} WHERE project_id = ?"
-            cursor.execute(query, list(updates.values()) + [project_id])
-            self.conn.commit()
+            updates = dict(updates)
+            snippets = updates.pop("code_snippets", None)
+            with self.transaction() as conn:
+                if updates:
+                    set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
+                    query = f"UPDATE projects SET {set_clause} WHERE project_id = ?"
+                    conn.execute(query, list(updates.values()) + [project_id])
+                if snippets is not None:
+                    # Replaces the whole set; prefer add_snippets for new features
+                    snippets = json.loads(snippets) if isinstance(snippets, str) else snippets
+                    for (feature,) in conn.execute(
+                        "SELECT feature FROM snippets WHERE project_id = ?", (project_id,)
+                    ).fetchall():
+                        if feature not in snippets:
+                            self._delete_snippet(project_id, feature)
+                    for feature, code in snippets.items():
+                        self._upsert_snippet(project_id, feature, code)
             return True
         except Exception as e:
             print(f"Error updating project: {e}")
             return False
 
-    def get_project(self, project_id: str) -> Optional[ProjectState]:
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM projects WHERE project_id = ?", (project_id,))
-        row = cursor.fetchone()
+    def add_snippet(self, project_id: str, feature: str, code: str,
+                    last_modified: Optional[datetime] = None) -> bool:
+        """Add or replace one feature's code without touching the rest of the project."""
+        return self.add_snippets(project_id, {feature: code}, last_modified)
+
+    def add_snippets(self, project_id: str, snippets: Dict[str, str],
+                     last_modified: Optional[datetime] = None) -> bool:
+        """Add or replace several features in one transaction."""
+        try:
+            with self.transaction() as conn:
+                for feature, code in snippets.items():
+                    self._upsert_snippet(project_id, feature, code)
+                conn.execute(
+                    "UPDATE projects SET last_modified = ? WHERE project_id = ?",
+                    ((last_modified or datetime.now()).isoformat(), project_id)
+                )
+            return True
+        except Exception as e:
+            print(f"Error adding snippets: {e}")
+            return False
+
+    def _upsert_snippet(self, project_id: str, feature: str, code: str):
+        row = self.conn.execute(
+            "SELECT rowid, digest FROM snippets WHERE project_id = ? AND feature = ?", (project_id, feature)
+        ).fetchone()
+        if row and row[1] == self.blobs.digest(code):
+            return
+        digest = self.blobs.put(code)
         if row:
-            return ProjectState(
-                project_id=row[0],
-                name=row[1],
-                language=row[2],
-                framework=row[3],
-                status=row[4],
-                completion_percentage=row[5],
-                last_modified=datetime.fromisoformat(row[6]),
-                code_snippets=json.loads(row[7]),
-                dependencies=json.loads(row[8])
-            )
+            # Updating in place keeps the feature's original position
+            rowid = row[0]
+            self.conn.execute("UPDATE snippets SET digest = ? WHERE rowid = ?", (digest, rowid))
+            self._release_code(rowid, row[1])
+        else:
+            rowid = self.conn.execute(
+                "INSERT INTO snippets VALUES (?, ?, ?)", (project_id, feature, digest)
+            ).lastrowid
+        self.conn.execute("INSERT INTO snippet_fts (rowid, code) VALUES (?, ?)", (rowid, code))
+        self.snippet_index.update(project_id, feature, code)
+
+    def _delete_snippet(self, project_id: str, feature: str):
+        row = self.conn.execute(
+            "SELECT rowid, digest FROM snippets WHERE project_id = ? AND feature = ?", (project_id, feature)
+        ).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM snippets WHERE rowid = ?", (row[0],))
+            self._release_code(*row)
+            self.snippet_index.remove(project_id, feature)
+
+    def _release_code(self, rowid: int, digest: str):
+        # A contentless FTS5 table needs the old text to remove its entries
+        self.conn.execute("INSERT INTO snippet_fts (snippet_fts, rowid, code) VALUES ('delete', ?, ?)",
+                          (rowid, self.blobs.get(digest)))
+        self.blobs.release(digest)
+
+    def get_snippets(self, project_id: str, features: Optional[List[str]] = None) -> Mapping[str, str]:
+        """
+        Snippets of a project (only ``features`` if given), in the order they
+        were added. Code is decompressed when a snippet is first accessed.
+        """
+        if features is None:
+            rows = self.conn.execute('''
+                SELECT s.feature, b.codec, b.data FROM snippets s JOIN blobs b ON b.digest = s.digest
+                WHERE s.project_id = ? ORDER BY s.rowid
+            ''', (project_id,)).fetchall()
+        elif not features:
+            return LazySnippets([])
+        else:
+            # Primary-key lookups, then sort; ORDER BY rowid would scan the whole project
+            placeholders = ", ".join("?" * len(features))
+            rows = sorted(self.conn.execute(f'''
+                SELECT s.rowid, s.feature, b.codec, b.data FROM snippets s JOIN blobs b ON b.digest = s.digest
+                WHERE s.project_id = ? AND s.feature IN ({placeholders})
+            ''', [project_id] + list(features)).fetchall())
+            rows = [row[1:] for row in rows]
+        return LazySnippets(rows)
+
+    def get_project(self, project_id: str, include_snippets: bool = True) -> Optional[ProjectState]:
+        # One read transaction, so the project row and its snippets are a consistent snapshot
+        with self.transaction(write=False) as conn:
+            row = conn.execute(
+                f"SELECT {PROJECT_COLUMNS} FROM projects WHERE project_id = ?", (project_id,)
+            ).fetchone()
+            if row:
+                project = self._project_from_row(row)
+                if include_snippets:
+                    project.code_snippets = self.get_snippets(project_id)
+                return project
         return None
+
+    @staticmethod
+    def _project_from_row(row: Tuple) -> ProjectState:
+        return ProjectState(
+            project_id=row[0],
+            name=row[1],
+            language=row[2],
+            framework=row[3],
+            status=row[4],
+            completion_percentage=row[5],
+            last_modified=datetime.fromisoformat(row[6]),
+            code_snippets={},
+            dependencies=json.loads(row[7]),
+            owner_id=row[8]
+        )
+
+    def list_projects(self, owner_id: Optional[str] = None, language: Optional[str] = None,
+                      framework: Optional[str] = None, status: Optional[str] = None,
+                      modified_after: Optional[datetime] = None, modified_before: Optional[datetime] = None,
+                      cursor: Optional[str] = None, limit: Optional[int] = None,
+                      page_size: int = 100) -> Iterator[ProjectState]:
+        """
+        Projects matching every given filter, most recently modified first,
+        without their snippets.
+
+        Rows are read ``page_size`` at a time by keyset pagination on
+        (last_modified, project_id), each page in its own short read, so
+        iterating a large result holds neither memory nor a transaction.
+        Pass ``project_cursor(last)`` of the last project seen as ``cursor``
+        to resume after it.
+        """
+        conditions, params = [], []
+        for column, value in (("owner_id", owner_id), ("language", language),
+                              ("framework", framework), ("status", status)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if modified_after is not None:
+            conditions.append("last_modified > ?")
+            params.append(modified_after.isoformat())
+        if modified_before is not None:
+            conditions.append("last_modified < ?")
+            params.append(modified_before.isoformat())
+
+        key = _decode_cursor(cursor, (str, str)) if cursor else None
+        # A plain function around the generator, so a bad cursor fails at the call
+        return self._iter_projects(conditions, params, key, limit, page_size)
+
+    def _iter_projects(self, conditions: List[str], params: List[Any], key: Optional[Tuple],
+                       limit: Optional[int], page_size: int) -> Iterator[ProjectState]:
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_conditions, page_params = list(conditions), list(params)
+            if key is not None:
+                page_conditions.append("(last_modified, project_id) < (?, ?)")
+                page_params.extend(key)
+            where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+            size = page_size if remaining is None else min(page_size, remaining)
+            rows = self.conn.execute(
+                f"SELECT {PROJECT_COLUMNS} FROM projects {where} "
+                "ORDER BY last_modified DESC, project_id DESC LIMIT ?",
+                page_params + [size]
+            ).fetchall()
+            for row in rows:
+                yield self._project_from_row(row)
+            if len(rows) < size:
+                return
+            key = (rows[-1][6], rows[-1][0])
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def search_projects(self, query: str, owner_id: Optional[str] = None,
+                        cursor: Optional[str] = None, limit: int = 20) -> List[ProjectMatch]:
+        """
+        Projects whose snippet code matches every word of ``query`` (FTS5),
+        best match first, with the matching features. ``cursor`` is
+        ``search_cursor(last)`` of the last match seen.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        # Quote each word so FTS5 operators in user input are matched literally
+        fts_query = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        score, project_id = _decode_cursor(cursor, ((int, float), str)) if cursor else (-float("inf"), "")
+        owner_condition = "AND p.owner_id = ?" if owner_id is not None else ""
+        params = [fts_query] + ([owner_id] if owner_id is not None else []) + [score, project_id, limit]
+        with self.transaction(write=False) as conn:
+            rows = conn.execute(f'''
+                SELECT {", ".join("p." + column for column in PROJECT_COLUMNS.split(", "))},
+                       MIN(m.rank) AS score, GROUP_CONCAT(s.feature, char(31))
+                FROM (SELECT rowid, rank FROM snippet_fts WHERE snippet_fts MATCH ?) m
+                JOIN snippets s ON s.rowid = m.rowid
+                JOIN projects p ON p.project_id = s.project_id
+                WHERE 1 {owner_condition}
+                GROUP BY p.project_id
+                HAVING (score, p.project_id) > (?, ?)
+                ORDER BY score, p.project_id
+                LIMIT ?
+            ''', params).fetchall()
+        return [
+            ProjectMatch(self._project_from_row(row[:9]), row[9], row[10].split("\x1f"))
+            for row in rows
+        ]
+
+    def relevant_snippets(self, project_id: str, query: str) -> List[str]:
+        """Features of the project ranked by relevance to ``query``."""
+        with self.transaction(write=False):
+            return [feature for feature, _ in self.snippet_index.search(project_id, query)]
+
+    def snippet_token_counts(self, project_id: str, tokenizer: str, features: List[str]) -> Dict[str, int]:
+        """Recorded token counts of ``features`` under ``tokenizer``, see set_snippet_token_counts."""
+        with self.transaction(write=False):
+            return self.snippet_index.token_counts(project_id, tokenizer, features)
+
+    def set_snippet_token_counts(self, project_id: str, tokenizer: str, counts: List[Tuple[str, str, int]]):
+        """
+        Remember ``(feature, code, tokens)`` token counts; a count is
+        forgotten when its feature's code changes.
+        """
+        with self.transaction():
+            self.snippet_index.set_token_counts(project_id, tokenizer, counts)
+
+    def snippet_features(self, project_id: str) -> List[str]:
+        """Features of the project, most recently added first, without loading any code."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT feature FROM snippets WHERE project_id = ? ORDER BY rowid DESC", (project_id,)
+        )]
+
+
+class AsyncProjectTracker:
+    """
+    Awaitable facade over a ProjectTracker for async handlers.
+
+    Calls run on a small thread pool of their own, so database waits (e.g.
+    the busy timeout under write contention) never block the event loop
+    and never take a slot from the inference workers.
+    """
+
+    def __init__(self, tracker: ProjectTracker, max_workers: int = 4):
+        self.tracker = tracker
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="project-db")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def create_project(self, project: ProjectState) -> bool:
+        return await self._run(self.tracker.create_project, project)
+
+    async def update_project(self, project_id: str, updates: Dict) -> bool:
+        return await self._run(self.tracker.update_project, project_id, updates)
+
+    async def add_snippet(self, project_id: str, feature: str, code: str) -> bool:
+        return await self._run(self.tracker.add_snippet, project_id, feature, code)
+
+    async def add_snippets(self, project_id: str, snippets: Dict[str, str]) -> bool:
+        return await self._run(self.tracker.add_snippets, project_id, snippets)
+
+    async def get_project(self, project_id: str, include_snippets: bool = True) -> Optional[ProjectState]:
+        return await self._run(self.tracker.get_project, project_id, include_snippets)
+
+    async def get_snippets(self, project_id: str, features: Optional[List[str]] = None) -> Mapping[str, str]:
+        return await self._run(self.tracker.get_snippets, project_id, features)
+
+    async def relevant_snippets(self, project_id: str, query: str) -> List[str]:
+        return await self._run(self.tracker.relevant_snippets, project_id, query)
+
+    async def snippet_features(self, project_id: str) -> List[str]:
+        return await self._run(self.tracker.snippet_features, project_id)
+
+    async def snippet_token_counts(self, project_id: str, tokenizer: str, features: List[str]) -> Dict[str, int]:
+        return await self._run(self.tracker.snippet_token_counts, project_id, tokenizer, features)
+
+    async def set_snippet_token_counts(self, project_id: str, tokenizer: str,
+                                       counts: List[Tuple[str, str, int]]):
+        return await self._run(self.tracker.set_snippet_token_counts, project_id, tokenizer, counts)
+
+    async def list_projects(self, limit: int = 100, **filters) -> List[ProjectState]:
+        """One page of ``ProjectTracker.list_projects``."""
+        return await self._run(lambda: list(self.tracker.list_projects(limit=limit, **filters)))
+
+    async def search_projects(self, query: str, owner_id: Optional[str] = None,
+                              cursor: Optional[str] = None, limit: int = 20) -> List[ProjectMatch]:
+        return await self._run(self.tracker.search_projects, query, owner_id, cursor, limit)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,161 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+import hashlib
+import math
+import re
+import sqlite3
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased identifiers plus their snake_case/camelCase parts, so that
+    ``getUserName`` and ``get_user_name`` both match a query for "user name".
+    """
+    terms = []
+    for identifier in _IDENTIFIER.findall(text):
+        parts = _SUBWORD.findall(identifier)
+        terms.append(identifier.lower())
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts)
+    return terms
+
+
+class SnippetIndex:
+    """
+    BM25 index over the code snippets of each project, kept in the project
+    database next to the ``projects`` table. Only snippets whose content
+    changed are re-indexed, so updates cost O(changed snippets). Writes are
+    left to the caller's transaction.
+
+    It also remembers each snippet's length in model tokens, per tokenizer,
+    so context building does not re-tokenize snippets it has seen before.
+    """
+
+    def __init__(self, conn, k1: float = 1.2, b: float = 0.75):
+        # A connection, or a callable returning the current thread's connection
+        self._conn = conn
+        self.k1 = k1
+        self.b = b
+        self._init_db()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._conn if isinstance(self._conn, sqlite3.Connection) else self._conn()
+
+    def _init_db(self):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS snippet_docs (
+                project_id TEXT,
+                feature TEXT,
+                length INTEGER,
+                digest TEXT,
+                PRIMARY KEY (project_id, feature)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS snippet_terms (
+                project_id TEXT,
+                term TEXT,
+                feature TEXT,
+                tf INTEGER,
+                PRIMARY KEY (project_id, term, feature)
+            )
+        ''')
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS snippet_terms_feature ON snippet_terms (project_id, feature)"
+        )
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS snippet_token_counts (
+                project_id TEXT,
+                feature TEXT,
+                tokenizer TEXT,
+                digest TEXT,
+                tokens INTEGER,
+                PRIMARY KEY (project_id, feature, tokenizer)
+            )
+        ''')
+
+    @staticmethod
+    def _digest(feature: str, code: str) -> str:
+        return hashlib.sha1(f"{feature}\0{code}".encode("utf-8")).hexdigest()
+
+    def update(self, project_id: str, feature: str, code: str):
+        """Index one added or changed snippet; the caller commits."""
+        digest = self._digest(feature, code)
+        row = self.conn.execute(
+            "SELECT digest FROM snippet_docs WHERE project_id = ? AND feature = ?", (project_id, feature)
+        ).fetchone()
+        if row is None or row[0] != digest:
+            self.remove(project_id, feature)
+            self._add(project_id, feature, code, digest)
+
+    def _add(self, project_id: str, feature: str, code: str, digest: str):
+        # The feature description is usually the best summary of the snippet
+        terms = Counter(tokenize(f"{feature}\n{code}"))
+        self.conn.execute(
+            "INSERT INTO snippet_docs VALUES (?, ?, ?, ?)",
+            (project_id, feature, sum(terms.values()), digest)
+        )
+        self.conn.executemany(
+            "INSERT INTO snippet_terms VALUES (?, ?, ?, ?)",
+            [(project_id, term, feature, tf) for term, tf in terms.items()]
+        )
+
+    def remove(self, project_id: str, feature: str):
+        self.conn.execute("DELETE FROM snippet_docs WHERE project_id = ? AND feature = ?", (project_id, feature))
+        self.conn.execute("DELETE FROM snippet_terms WHERE project_id = ? AND feature = ?", (project_id, feature))
+        self.conn.execute("DELETE FROM snippet_token_counts WHERE project_id = ? AND feature = ?",
+                          (project_id, feature))
+
+    def token_counts(self, project_id: str, tokenizer: str, features: List[str]) -> Dict[str, int]:
+        """Known token counts of ``features`` under ``tokenizer``; unknown ones are left out."""
+        if not features:
+            return {}
+        placeholders = ", ".join("?" * len(features))
+        # Counts recorded for older code of a feature no longer match its digest
+        return dict(self.conn.execute(f'''
+            SELECT c.feature, c.tokens FROM snippet_token_counts c JOIN snippet_docs d
+              ON d.project_id = c.project_id AND d.feature = c.feature AND d.digest = c.digest
+            WHERE c.project_id = ? AND c.tokenizer = ? AND c.feature IN ({placeholders})
+        ''', [project_id, tokenizer] + list(features)).fetchall())
+
+    def set_token_counts(self, project_id: str, tokenizer: str, counts: Iterable[Tuple[str, str, int]]):
+        """Record ``(feature, code, tokens)`` counts; the caller commits."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO snippet_token_counts VALUES (?, ?, ?, ?, ?)",
+            [(project_id, feature, tokenizer, self._digest(feature, code), tokens)
+             for feature, code, tokens in counts]
+        )
+
+    def search(self, project_id: str, query: str) -> List[Tuple[str, float]]:
+        """Features matching any query term, best BM25 score first."""
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        num_docs, total_length = self.conn.execute(
+            "SELECT COUNT(*), SUM(length) FROM snippet_docs WHERE project_id = ?", (project_id,)
+        ).fetchone()
+        if not num_docs:
+            return []
+        average_length = (total_length or 0) / num_docs or 1.0
+
+        placeholders = ", ".join("?" * len(terms))
+        rows = self.conn.execute(f'''
+            SELECT t.term, t.feature, t.tf, d.length
+            FROM snippet_terms t JOIN snippet_docs d
+              ON d.project_id = t.project_id AND d.feature = t.feature
+            WHERE t.project_id = ? AND t.term IN ({placeholders})
+        ''', [project_id] + terms).fetchall()
+
+        doc_freq = Counter(term for term, _, _, _ in rows)
+        scores: Dict[str, float] = {}
+        for term, feature, tf, length in rows:
+            df = doc_freq[term]
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1 - self.b + self.b * length / average_length)
+            scores[feature] = scores.get(feature, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
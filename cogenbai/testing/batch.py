@@ -0,0 +1,187 @@
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import ast
+import multiprocessing
+import os
+import time
+
+from ..config import CogenConfig
+from ..review.batch import iter_source_files
+from ..optimization.formatting import default_formatting_service
+from .generator import python_test_module
+
+
+@dataclass
+class BatchTestReport:
+    files: int = 0
+    failed: int = 0
+    written: int = 0
+    tests: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    def add(self, record: Dict[str, Any]):
+        self.files += 1
+        if "error" in record:
+            self.failed += 1
+        elif record["output"]:
+            self.written += 1
+            self.tests += record["tests"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "files_per_second": self.files_per_second}
+
+
+def iter_python_modules(root: str, config: Optional[CogenConfig] = None) -> Iterator[Dict[str, str]]:
+    """
+    ``{"path", "module"}`` for every Python source file under ``root``,
+    with its dotted module name. When ``root`` is itself a package (has an
+    ``__init__.py``) its name starts every module name. Test modules and
+    conftest.py are left out.
+    """
+    config = config or CogenConfig()
+    root = os.path.abspath(root)
+    base = os.path.dirname(root)
+    if os.path.isdir(root) and not os.path.isfile(os.path.join(root, "__init__.py")):
+        base = root
+    extensions = {"python": config.language_extensions.get("python", [".py"])}
+    for path, _ in iter_source_files(root, extensions):
+        name = os.path.basename(path)
+        if name.startswith("test_") or name == "conftest.py":
+            continue
+        parts = os.path.splitext(os.path.relpath(path, base))[0].split(os.sep)
+        if parts[-1] == "__init__":
+            parts.pop()
+        if parts and all(part.isidentifier() for part in parts):
+            yield {"path": path, "module": ".".join(parts)}
+
+
+def output_path(output_dir: str, module: str) -> str:
+    """
+    Where the tests of ``module`` go: its dotted name flattened with
+    underscores. That can clash (``a.b_c`` and ``a_b.c``), so generate_batch
+    numbers the later of two clashing modules.
+    """
+    return os.path.join(output_dir, f"test_{module.replace('.', '_')}.py")
+
+
+def generate_batch(items: Iterable[Dict[str, str]],
+                   output_dir: str,
+                   num_workers: Optional[int] = None,
+                   config: Optional[CogenConfig] = None,
+                   executor: Optional[Executor] = None,
+                   format_output: bool = False,
+                   chunk_size: int = 16) -> Iterator[Dict[str, Any]]:
+    """
+    Write a unittest module to ``output_dir`` for each item (``path`` and
+    ``module``, see iter_python_modules), yielding one record per item as
+    soon as its file is written (not in input order).
+
+    A record is ``{"path", "module", "output", "tests"}``, with ``output``
+    None when the module has nothing public to test, or ``{"path",
+    "module", "error"}`` when it can't be read or parsed. Every source file
+    is parsed once, in the worker that writes its tests. Files are named by
+    output_path, except that a module whose name flattens to an earlier
+    module's file gets ``test_<name>_2.py`` (then ``_3`` and so on).
+
+    Items are sent in chunks to ``executor`` or, with ``num_workers > 1``
+    (default ``config.num_workers``), to a process pool created for this
+    call; otherwise they are handled in-process. The generated code is
+    already black-formatted; ``format_output`` runs it through the
+    formatting pipeline anyway.
+    """
+    config = config or CogenConfig()
+    num_workers = num_workers or config.num_workers
+    os.makedirs(output_dir, exist_ok=True)
+    chunks = _chunks(_assign_outputs(items, output_dir), chunk_size)
+
+    if executor is None and num_workers <= 1:
+        for chunk in chunks:
+            yield from _generate_chunk(chunk, format_output)
+        return
+
+    pool = executor or ProcessPoolExecutor(num_workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        in_flight = set()
+        for chunk in chunks:
+            if len(in_flight) >= 2 * num_workers:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield from future.result()
+            in_flight.add(pool.submit(_generate_chunk, chunk, format_output))
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield from future.result()
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+
+
+def run_batch_generation(path: str, output_dir: str,
+                         config: Optional[CogenConfig] = None,
+                         num_workers: Optional[int] = None,
+                         format_output: bool = False,
+                         progress: Optional[Callable[[BatchTestReport], None]] = None) -> BatchTestReport:
+    """Generate a test module in ``output_dir`` for every Python module under ``path``."""
+    config = config or CogenConfig()
+    report = BatchTestReport()
+    start = time.perf_counter()
+    for record in generate_batch(iter_python_modules(path, config), output_dir, num_workers=num_workers,
+                                 config=config, format_output=format_output):
+        report.add(record)
+        report.elapsed = time.perf_counter() - start
+        if progress:
+            progress(report)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _assign_outputs(items: Iterable[Dict[str, str]], output_dir: str) -> Iterator[Dict[str, str]]:
+    # Decided here, in input order, so workers never write each other's files
+    taken = set()
+    for item in items:
+        base = output_path(output_dir, item["module"])[:-len(".py")]
+        output, n = base + ".py", 1
+        while output in taken:
+            n += 1
+            output = f"{base}_{n}.py"
+        taken.add(output)
+        yield {**item, "output": output}
+
+
+def _chunks(items: Iterable[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _generate_chunk(items: List[Dict[str, str]], format_output: bool = False) -> List[Dict[str, Any]]:
+    records = []
+    for item in items:
+        record: Dict[str, Any] = {"path": item["path"], "module": item["module"]}
+        try:
+            with open(item["path"], "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), filename=item["path"])
+            code, tests = python_test_module(tree, item["module"])
+            output = None
+            if tests:
+                if format_output:
+                    code = default_formatting_service().format(code, "python")
+                output = item["output"]
+                with open(output, "w", encoding="utf-8") as f:
+                    f.write(code)
+            record.update(output=output, tests=tests)
+        except (OSError, SyntaxError, ValueError, RecursionError) as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        records.append(record)
+    return records
@@ -1,9 +1,18 @@
 import ast
-from typing import List, Dict, Any
-import black
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+from ..optimization.formatting import FormattingService, default_formatting_service
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+# A name, or a call as (callee, arguments)
+Expression = Union[str, Tuple[str, List["Expression"]]]
+
+LINE_LENGTH = 88  # black's default
+
 
 class TestGenerator:
-    def __init__(self):
+    def __init__(self, formatter: Optional[FormattingService] = None):
+        self.formatter = formatter or default_formatting_service()
         self.test_templates = {
             'python': {
                 'unit': self._generate_python_unit_test,
@@ -15,50 +24,205 @@ class TestGenerator:
         generator = self.test_templates.get(language, {}).get(test_type)
         if not generator:
             raise ValueError(f"Unsupported language or test type: {language}/{test_type}")
-        
+
         test_code = generator(code)
-        try:
-            return black.format_str(test_code, mode=black.FileMode())
-        except:
-            return test_code
+        return self.formatter.format(test_code, language)
 
     def _generate_python_unit_test(self, code: str) -> str:
-        tree = ast.parse(code)
-        test_cases = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                test_cases.append(self._generate_function_test(node))
-
-        return self._format_test_class(test_cases)
-
-    def _generate_function_test(self, func_node: ast.FunctionDef) -> str:
-        args = [arg.arg for arg in func_node.args.args]
-        test_name = f"test_{func_node.name}"
-        
-        test_template = f"""
-    def {test_name}(self):
-        # Arrange
-        {''.join(f'{arg} = None  # TODO: Add test value\n        ' for arg in args)}
-        
-        # Act
-        result = {func_node.name}({', '.join(args)})
-        
-        # Assert
-        self.assertIsNotNone(result)  # TODO: Add specific assertions
-        """
-        return test_template
-
-    def _format_test_class(self, test_cases: List[str]) -> str:
-        return f"""import unittest
-
-class TestGeneratedCode(unittest.TestCase):
-{''.join(test_cases)}
-
-if __name__ == '__main__':
-    unittest.main()
-"""
+        return python_test_module(ast.parse(code))[0]
 
     def _generate_python_integration_test(self, code: str) -> str:
         # Similar to unit test but with more complex scenarios
         return "# TODO: Implement integration tests\n"
+
+
+def python_test_module(tree: ast.Module, module: Optional[str] = None) -> Tuple[str, int]:
+    """
+    A unittest module for the public top-level functions and classes of
+    ``tree``, and the number of test methods in it.
+
+    Module functions are tested by ``TestModuleFunctions`` and each class
+    by its own ``Test<Class>``, one test per public method; nested
+    functions are not tested. With ``module`` the tested names are
+    imported from it. Long lines are split the way black splits them, so
+    the output is already black-formatted.
+    """
+    functions: List[FunctionNode] = []
+    classes: List[Tuple[ast.ClassDef, List[FunctionNode]]] = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_public(node.name):
+            functions.append(node)
+        elif isinstance(node, ast.ClassDef) and _is_public(node.name):
+            methods = [child for child in node.body
+                       if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_public(child.name)]
+            classes.append((node, methods))
+    functions = _unique(functions)
+
+    blocks, count = [], 0
+    if functions:
+        tests = [_function_test(node, node.name) for node in functions]
+        blocks.append(_test_class("TestModuleFunctions", tests))
+        count += len(tests)
+    for class_node, methods in classes:
+        tests = [_method_test(class_node.name, node) for node in _unique(methods)]
+        setup = _setup(class_node) if any(_kind(node) in ("instance", "property") for node in methods) else None
+        blocks.append(_test_class(f"Test{class_node.name}", tests, setup))
+        count += len(tests)
+    if not blocks:
+        blocks.append(_test_class("TestGeneratedCode", []))
+
+    header = ["import unittest"]
+    if any(isinstance(node, ast.AsyncFunctionDef) for node in functions) or any(
+            isinstance(node, ast.AsyncFunctionDef) for _, methods in classes for node in methods):
+        header.insert(0, "import asyncio")
+    names = [node.name for node in functions] + [node.name for node, _ in classes]
+    if module and names:
+        header.append("\n" + "\n".join(_import_lines(module, names)))
+    footer = 'if __name__ == "__main__":\n    unittest.main()\n'
+    return "\n".join(header) + "\n\n\n" + "\n\n".join(blocks) + "\n\n" + footer, count
+
+
+def _is_public(name: str) -> bool:
+    return not name.startswith("_")
+
+
+def _unique(nodes: List[FunctionNode]) -> List[FunctionNode]:
+    # Property setters and conditional definitions repeat a name; test it once
+    seen = set()
+    return [node for node in nodes if not (node.name in seen or seen.add(node.name))]
+
+
+def _kind(node: FunctionNode) -> str:
+    decorators = {d.id for d in node.decorator_list if isinstance(d, ast.Name)}
+    if "staticmethod" in decorators:
+        return "static"
+    if "classmethod" in decorators:
+        return "class"
+    if "property" in decorators:
+        return "property"
+    return "instance"
+
+
+def _required_args(args: ast.arguments, skip_first: bool) -> Tuple[List[str], List[str]]:
+    """Positional and keyword-only parameters without defaults."""
+    positional = [arg.arg for arg in args.posonlyargs + args.args]
+    if skip_first:
+        positional = positional[1:]
+    positional = positional[:len(positional) - len(args.defaults)] if args.defaults else positional
+    keywords = [arg.arg for arg, default in zip(args.kwonlyargs, args.kw_defaults) if default is None]
+    return positional, keywords
+
+
+def _call(target: str, node: FunctionNode, skip_first: bool) -> Tuple[List[str], Expression]:
+    positional, keywords = _required_args(node.args, skip_first)
+    call: Expression = (target, positional + [f"{name}={name}" for name in keywords])
+    if isinstance(node, ast.AsyncFunctionDef):
+        call = ("asyncio.run", [call])
+    return positional + keywords, call
+
+
+def _render(expression: Expression) -> str:
+    if isinstance(expression, str):
+        return expression
+    callee, args = expression
+    return f"{callee}({', '.join(map(_render, args))})"
+
+
+def _statement(indent: str, head: str, expression: Expression) -> List[str]:
+    """
+    ``head`` followed by ``expression``, split over lines as black splits a
+    line that is too long: at the brackets of the outermost call, or, for an
+    assignment whose first line would still be too long, inside parentheses
+    around the right-hand side when every resulting line then fits.
+    """
+    line = indent + head + _render(expression)
+    if len(line) <= LINE_LENGTH:
+        return [line]
+    inner = indent + "    "
+    if isinstance(expression, str) or not expression[1]:
+        # Nothing to split on but the parentheses black adds around the right-hand side
+        if head and not _render(expression).isidentifier():
+            return [f"{indent}{head}(", *_statement(inner, "", expression), f"{indent})"]
+        return [line]
+    callee, args = expression
+    opening, closing = f"{indent}{head}{callee}(", f"{indent})"
+    if len(args) == 1 and not isinstance(args[0], str):
+        lines = [opening, *_statement(inner, "", args[0]), closing]
+    elif len(inner + ", ".join(map(_render, args))) <= LINE_LENGTH:
+        lines = [opening, inner + ", ".join(map(_render, args)), closing]
+    else:
+        lines = [opening, *(f"{inner}{_render(arg)}," for arg in args), closing]
+    if head and len(opening) > LINE_LENGTH:
+        wrapped = [f"{indent}{head}(", *_statement(inner, "", expression), f"{indent})"]
+        if all(len(wrapped_line) <= LINE_LENGTH for wrapped_line in wrapped):
+            return wrapped
+    return lines
+
+
+def _import_lines(module: str, names: List[str]) -> List[str]:
+    line = f"from {module} import {', '.join(names)}"
+    if len(line) <= LINE_LENGTH:
+        return [line]
+    # black puts each name of a split import on its own line
+    return [f"from {module} import (", *(f"    {name}," for name in names), ")"]
+
+
+def _placeholder(arg: str) -> List[str]:
+    line = f"        {arg} = None  # TODO: Add test value"
+    if len(line) <= LINE_LENGTH:
+        return [line]
+    # black moves the comment into parentheses around the value
+    return [f"        {arg} = (", "            None  # TODO: Add test value", "        )"]
+
+
+def _test_method(name: str, arrange: List[str], act: Expression) -> str:
+    signature = f"    def test_{name}(self):"
+    lines = [signature] if len(signature) <= LINE_LENGTH else [f"    def test_{name}(", "        self,", "    ):"]
+    if arrange:
+        lines.append("        # Arrange")
+        lines.extend(line for arg in arrange for line in _placeholder(arg))
+        lines.append("")
+    lines.extend([
+        "        # Act",
+        *_statement("        ", "result = ", act),
+        "",
+        "        # Assert",
+        "        self.assertIsNotNone(result)  # TODO: Add specific assertions",
+    ])
+    return "\n".join(lines) + "\n"
+
+
+def _function_test(node: FunctionNode, target: str) -> str:
+    arrange, act = _call(target, node, skip_first=False)
+    return _test_method(node.name, arrange, act)
+
+
+def _method_test(class_name: str, node: FunctionNode) -> str:
+    kind = _kind(node)
+    if kind == "property":
+        return _test_method(node.name, [], f"self.instance.{node.name}")
+    target = f"self.instance.{node.name}" if kind == "instance" else f"{class_name}.{node.name}"
+    arrange, act = _call(target, node, skip_first=kind != "static")
+    return _test_method(node.name, arrange, act)
+
+
+def _setup(class_node: ast.ClassDef) -> str:
+    init = next((child for child in class_node.body
+                 if isinstance(child, ast.FunctionDef) and child.name == "__init__"), None)
+    args: List[str] = []
+    call: Expression = (class_node.name, [])
+    if init is not None:
+        args, call = _call(class_node.name, init, skip_first=True)
+    lines = ["    def setUp(self):"]
+    lines.extend(line for arg in args for line in _placeholder(arg))
+    lines.extend(_statement("        ", "self.instance = ", call))
+    return "\n".join(lines) + "\n"
+
+
+def _test_class(name: str, tests: List[str], setup: Optional[str] = None) -> str:
+    members = ([setup] if setup else []) + tests
+    body = "\n".join(members) if members else "    pass\n"
+    header = f"class {name}(unittest.TestCase):"
+    if len(header) > LINE_LENGTH:
+        header = f"class {name}(\n    unittest.TestCase\n):"
+    return f"{header}\n{body}"
@@ -6,7 +6,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "torch>=1.9.0",
-        "transformers>=4.11.0",
+        "transformers>=4.56.0",
         "pyttsx3>=2.90",
         "fastapi>=0.68.0",
         "uvicorn>=0.15.0",
@@ -0,0 +1,108 @@
+"""
+Stub formatter for the external formatter tests: strips trailing
+whitespace and expands tabs. A snippet containing CRASH makes it exit,
+HANG makes it sleep and REJECT makes it report an error.
+
+    python tests/stub_formatter.py --mode oneshot|persistent|lsp [--position-encoding utf-8]
+
+As a language server it edits each line in place, counting columns in the
+position encoding it settles on: ``--position-encoding`` if the client
+offers it, else LSP's default utf-16.
+"""
+import argparse
+import json
+import sys
+import time
+
+
+def format_code(code):
+    if "CRASH" in code:
+        sys.exit(3)
+    if "HANG" in code:
+        time.sleep(60)
+    if "REJECT" in code:
+        raise ValueError("cannot format REJECT")
+    return "".join(line.rstrip().replace("\t", "    ") + "\n" for line in code.splitlines())
+
+
+def oneshot():
+    try:
+        sys.stdout.write(format_code(sys.stdin.read()))
+    except ValueError as e:
+        sys.stderr.write(f"error: {e}\n")
+        sys.exit(1)
+
+
+def persistent():
+    for line in sys.stdin:
+        request = json.loads(line)
+        try:
+            response = {"id": request["id"], "code": format_code(request["code"])}
+        except ValueError as e:
+            response = {"id": request["id"], "error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+def lsp(encoding):
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+
+    def send(message):
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        stdout.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        stdout.flush()
+
+    def receive():
+        length = 0
+        while True:
+            line = stdin.readline()
+            if not line:
+                sys.exit(0)
+            if line == b"\r\n":
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        return json.loads(stdin.read(length))
+
+    documents = {}
+    while True:
+        message = receive()
+        method = message.get("method")
+        if method == "initialize":
+            offered = message["params"]["capabilities"].get("general", {}).get("positionEncodings", [])
+            encoding = encoding if encoding in offered else "utf-16"
+            capabilities = {"documentFormattingProvider": True, "positionEncoding": encoding}
+            send({"id": message["id"], "result": {"capabilities": capabilities}})
+        elif method == "textDocument/didOpen":
+            document = message["params"]["textDocument"]
+            documents[document["uri"]] = document["text"]
+        elif method == "textDocument/didClose":
+            documents.pop(message["params"]["textDocument"]["uri"], None)
+        elif method == "textDocument/formatting":
+            # Servers may ask the client for settings before answering
+            send({"id": "config", "method": "workspace/configuration", "params": {"items": [{}]}})
+            receive()
+            text = documents[message["params"]["textDocument"]["uri"]]
+            try:
+                formatted = format_code(text)
+            except ValueError as e:
+                send({"id": message["id"], "error": {"code": -32603, "message": str(e)}})
+                continue
+            units = lambda line: len(line.encode("utf-8")) if encoding == "utf-8" else len(line.encode("utf-16-le")) // 2
+            edits = [{"range": {"start": {"line": i, "character": 0}, "end": {"line": i, "character": units(old)}},
+                      "newText": new} for i, (old, new) in enumerate(zip(text.splitlines(), formatted.splitlines()))]
+            if not text.endswith("\n"):
+                end = {"line": len(text.splitlines()) - 1, "character": units(text.splitlines()[-1])}
+                edits.append({"range": {"start": end, "end": end}, "newText": "\n"})
+            send({"id": message["id"], "result": edits})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["oneshot", "persistent", "lsp"], default="oneshot")
+    parser.add_argument("--position-encoding", choices=["utf-8", "utf-16"], default="utf-16")
+    args = parser.parse_args()
+    if args.mode == "lsp":
+        lsp(args.position_encoding)
+    else:
+        {"oneshot": oneshot, "persistent": persistent}[args.mode]()
@@ -0,0 +1,43 @@
+import threading
+import pytest
+from cogenbai.core.batching import BatchScheduler, GenerationRequest, GenerationResult
+
+class EchoModel:
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+
+    def build_prompt(self, prompt, language, framework=None):
+        if language != "python":
+            raise ValueError(f"Unsupported language: {language}")
+        return prompt
+
+    def generate_batch(self, requests):
+        self.release.wait(5)
+        self.batches.append(len(requests))
+        return [GenerationResult(code=f"{r.prompt}:{r.temperature}", num_tokens=r.max_length)
+                for r in requests]
+
+def test_requests_share_a_batch_and_get_their_own_result():
+    model = EchoModel()
+    scheduler = BatchScheduler(model, batch_size=4, max_wait_ms=200)
+    futures = [
+        scheduler.submit(GenerationRequest(f"p{i}", "python", max_length=10 + i, temperature=0.1 * i))
+        for i in range(4)
+    ]
+    model.release.set()
+    results = [f.result(timeout=5) for f in futures]
+    scheduler.shutdown()
+
+    assert model.batches == [4]
+    assert [r.code for r in results] == [f"p{i}:{0.1 * i}" for i in range(4)]
+    assert [r.num_tokens for r in results] == [10, 11, 12, 13]
+    assert scheduler.stats()["occupancy"] == 1.0
+
+def test_invalid_request_is_rejected_before_batching():
+    model = EchoModel()
+    scheduler = BatchScheduler(model, batch_size=2)
+    with pytest.raises(ValueError):
+        scheduler.submit(GenerationRequest("p", "cobol"))
+    scheduler.shutdown()
+    assert model.batches == []
@@ -0,0 +1,34 @@
+import sqlite3
+import pytest
+from cogenbai.storage.blob_store import BlobStore, LazySnippets, compress, decompress
+
+BOILERPLATE = "import os\nimport sys\n\n" + "\n".join(f"SETTING_{i} = os.environ.get('SETTING_{i}')" for i in range(20))
+
+def test_compression_round_trip_and_raw_fallback():
+    codec, data = compress(BOILERPLATE, "zlib")
+    assert codec == "zlib" and len(data) < len(BOILERPLATE)
+    assert decompress(codec, data) == BOILERPLATE
+    assert compress("x", "zlib") == ("raw", b"x")
+    with pytest.raises(ValueError):
+        compress("x", "lz4")
+
+def test_identical_texts_are_stored_once_and_reference_counted():
+    store = BlobStore(sqlite3.connect(":memory:"), codec="zlib")
+    first = store.put(BOILERPLATE)
+    assert store.put(BOILERPLATE) == first
+    store.put("def main(): ...")
+    stats = store.stats()
+    assert (stats["blobs"], stats["references"]) == (2, 3)
+    assert stats["stored_bytes"] < stats["text_bytes"]
+
+    store.release(first)
+    assert store.get(first) == BOILERPLATE
+    store.release(first)
+    assert store.get(first) is None
+
+def test_lazy_snippets_decompress_on_access():
+    snippets = LazySnippets([("a", *compress(BOILERPLATE, "zlib")), ("b", "raw", b"y = 2")])
+    assert list(snippets) == ["a", "b"] and not snippets._decoded
+    assert snippets["b"] == "y = 2"
+    assert list(snippets._decoded) == ["b"]
+    assert dict(snippets) == {"a": BOILERPLATE, "b": "y = 2"}
@@ -0,0 +1,53 @@
+import json
+from cogenbai.core.batching import GenerationResult
+from cogenbai.core.bulk import run_bulk_generation
+
+class EchoModel:
+    def __init__(self):
+        self.batches = []
+
+    def build_prompt(self, prompt, language, framework=None):
+        if language != "python":
+            raise ValueError(f"Unsupported language: {language}")
+        return prompt
+
+    def generate_batch(self, requests):
+        self.batches.append([r.prompt for r in requests])
+        return [GenerationResult(code=r.prompt.upper(), num_tokens=3) for r in requests]
+
+def write_jsonl(path, items):
+    path.write_text("".join(json.dumps(item) + "\n" for item in items))
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_prompts_are_batched_and_written_with_ids(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_jsonl(source, [{"prompt": f"p{i}", "language": "python"} for i in range(5)]
+                + [{"id": "bad", "prompt": "x", "language": "cobol"}])
+    model = EchoModel()
+
+    report = run_bulk_generation(str(source), str(output), model=model, batch_size=2)
+
+    assert model.batches == [["p0", "p1"], ["p2", "p3"], ["p4"]]
+    records = read_jsonl(output)
+    assert records[:5] == [{"id": str(i + 1), "code": f"P{i}", "num_tokens": 3} for i in range(5)]
+    assert records[5]["id"] == "bad" and "error" in records[5]
+    assert (report.processed, report.failed, report.generated_tokens) == (5, 1, 15)
+
+def test_rerun_resumes_after_completed_items(tmp_path):
+    source, output = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_jsonl(source, [{"id": f"r{i}", "prompt": f"p{i}", "language": "python"} for i in range(4)])
+    # A previous run finished r0 and r1 and was killed while writing r2
+    output.write_text(
+        json.dumps({"id": "r0", "code": "P0", "num_tokens": 3}) + "\n"
+        + json.dumps({"id": "r1", "code": "P1", "num_tokens": 3}) + "\n"
+        + '{"id": "r2", "co'
+    )
+    model = EchoModel()
+
+    report = run_bulk_generation(str(source), str(output), model=model, batch_size=8)
+
+    assert model.batches == [["p2", "p3"]]
+    assert report.skipped == 2
+    assert [r["id"] for r in read_jsonl(output)] == ["r0", "r1", "r2", "r3"]
@@ -0,0 +1,60 @@
+import os
+import stat
+import tempfile
+import threading
+import pytest
+from cogenbai.cli.daemon import DaemonClient, DaemonUnavailable, InferenceDaemon, default_socket_path
+
+class FakeModel:
+    def generate_code(self, prompt, language, framework=None):
+        if language != "python":
+            raise ValueError(f"Unsupported language: {language}")
+        return f"# {framework}\n{prompt}"
+
+@pytest.fixture
+def daemon(tmp_path):
+    loads = []
+    daemon = InferenceDaemon(str(tmp_path / "d.sock"), lambda: loads.append(1) or FakeModel())
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon, loads
+    daemon.shutdown()
+    thread.join()
+
+def test_client_reuses_resident_model(daemon):
+    daemon, loads = daemon
+    client = DaemonClient(daemon.socket_path, timeout=5)
+    assert client.ping()
+    assert client.generate(prompt="x = 1", language="python", framework="flask") == "# flask\nx = 1"
+    assert client.generate(prompt="y = 2", language="python") == "# None\ny = 2"
+    assert loads == [1]
+
+def test_errors_are_reported_to_the_client(daemon):
+    daemon, _ = daemon
+    with pytest.raises(ValueError, match="Unsupported language"):
+        DaemonClient(daemon.socket_path, timeout=5).generate(prompt="x", language="cobol")
+
+def test_missing_daemon_is_detected(tmp_path):
+    client = DaemonClient(str(tmp_path / "none.sock"))
+    assert not client.ping()
+    with pytest.raises(DaemonUnavailable):
+        client.generate(prompt="x", language="python")
+
+def test_socket_is_private_and_client_checks_its_owner(daemon, monkeypatch):
+    daemon, _ = daemon
+    assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    with pytest.raises(DaemonUnavailable, match="another user"):
+        DaemonClient(daemon.socket_path, timeout=5).generate(prompt="x", language="python")
+
+def test_default_socket_lives_in_a_private_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("COGENBAI_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    directory = os.path.dirname(default_socket_path())
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    os.chmod(directory, 0o755)
+    with pytest.raises(RuntimeError, match="not a private directory"):
+        default_socket_path()
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import pytest
+from cogenbai.core.executor import InferenceExecutor, InferenceQueueFull
+
+def test_full_queue_rejects_with_retry_after():
+    release = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(lambda: "done"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceQueueFull) as exc:
+            await executor.run(lambda: "rejected")
+        assert exc.value.retry_after >= 1
+        assert executor.stats()["queue_depth"] == 1
+        release.set()
+        return await running, await queued
+
+    assert asyncio.run(scenario()) == (True, "done")
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
+    executor.shutdown()
+
+def test_event_loop_stays_responsive():
+    executor = InferenceExecutor(max_workers=1)
+    timer_fired = threading.Event()
+
+    def blocking():
+        # Returns only once the loop has run the timer below, so it times out
+        # if the call blocks the loop instead of running on a worker
+        return timer_fired.wait(5)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        loop.call_later(0.01, timer_fired.set)
+        fired = await executor.run(blocking)
+        return fired, loop.time() - start
+
+    fired, elapsed = asyncio.run(scenario())
+    assert fired and elapsed < 1
+    executor.shutdown()
+
+def test_stream_relays_items_in_order():
+    executor = InferenceExecutor(max_workers=2)
+
+    async def scenario():
+        return [item async for item in executor.stream(lambda n: (i * i for i in range(n)), 50)]
+
+    assert asyncio.run(scenario()) == [i * i for i in range(50)]
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+def test_stream_raises_the_generator_error_after_its_items():
+    executor = InferenceExecutor(max_workers=1)
+
+    def failing():
+        yield "first"
+        raise ValueError("model failed")
+
+    async def scenario():
+        received = []
+        with pytest.raises(ValueError, match="model failed"):
+            async for item in executor.stream(failing):
+                received.append(item)
+        return received
+
+    assert asyncio.run(scenario()) == ["first"]
+
+    def fails_at_once():
+        raise ValueError("bad request")
+
+    async def immediate():
+        with pytest.raises(ValueError, match="bad request"):
+            async for _ in executor.stream(fails_at_once):
+                pass
+
+    asyncio.run(immediate())
+    executor.shutdown()
+
+def test_stream_is_rejected_when_the_queue_is_full():
+    executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        queued = executor.stream(lambda: iter(["queued"]))
+        with pytest.raises(InferenceQueueFull):
+            executor.stream(lambda: iter(["rejected"]))
+        release.set()
+        await running
+        return [item async for item in queued]
+
+    assert asyncio.run(scenario()) == ["queued"]
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
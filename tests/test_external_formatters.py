@@ -0,0 +1,98 @@
+import os
+import sys
+import pytest
+from cogenbai.optimization.external import (
+    ExternalFormatter, ExternalFormatterSpec, FormatterError, FormatterNotInstalled, FormatterTimeout,
+    close_external_formatters, register_external_formatters,
+)
+from cogenbai.optimization.formatting import FORMATTERS, FormattingService
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_formatter.py")
+
+def stub(mode, **options):
+    return ExternalFormatter("stub", ExternalFormatterSpec([sys.executable, STUB, "--mode", mode], mode=mode, **options))
+
+@pytest.mark.parametrize("mode", ["oneshot", "persistent", "lsp"])
+def test_snippets_are_formatted_and_rejections_reported(mode):
+    formatter = stub(mode, filename="snippet.go")
+    try:
+        assert formatter.format("func f() {  \n\treturn\n}") == "func f() {\n    return\n}\n"
+        assert formatter.format("x = 1   \n") == "x = 1\n"
+        with pytest.raises(FormatterError):
+            formatter.format("REJECT")
+        stats = formatter.stats()
+        assert stats["calls"] == 3 and stats["errors"] == 1 and stats["restarts"] == 0
+        assert stats["p95_ms"] >= stats["p50_ms"] > 0
+    finally:
+        formatter.close()
+
+@pytest.mark.parametrize("mode", ["persistent", "lsp"])
+def test_workers_are_restarted_after_a_crash_or_timeout(mode):
+    formatter = stub(mode, workers=1, timeout=2.0)
+    try:
+        assert formatter.format("a \n") == "a\n"
+        with pytest.raises(FormatterError):
+            formatter.format("CRASH")
+        assert formatter.format("b \n") == "b\n"
+        with pytest.raises(FormatterTimeout):
+            formatter.format("HANG")
+        assert formatter.format("c \n") == "c\n"
+        stats = formatter.stats()
+        assert stats["restarts"] == 2 and stats["timeouts"] == 1
+    finally:
+        formatter.close()
+
+def test_persistent_workers_stay_up_between_snippets():
+    formatter = stub("persistent", workers=1)
+    try:
+        formatter.format("a\n")
+        process = formatter._idle.queue[0].process
+        formatter.format("b\n")
+        assert formatter._idle.queue[0].process is process
+    finally:
+        formatter.close()
+
+def test_missing_executables_are_skipped_by_the_pipeline():
+    with pytest.raises(FormatterNotInstalled):
+        ExternalFormatter("nope", ExternalFormatterSpec(["no-such-formatter-cogenbai"])).format("x")
+    register_external_formatters({
+        "stub-fmt": {"command": [sys.executable, STUB, "--mode", "persistent"], "mode": "persistent"},
+        "missing-fmt": {"command": ["no-such-formatter-cogenbai"]},
+    })
+    try:
+        service = FormattingService({"go": ["missing-fmt", "stub-fmt"]})
+        assert service.format("x := 1  \n", "go") == "x := 1\n"
+        assert service.stats()["unavailable"] == ["missing-fmt"]
+    finally:
+        close_external_formatters()
+        FORMATTERS.pop("stub-fmt")
+        FORMATTERS.pop("missing-fmt")
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-8"])
+def test_lsp_edit_positions_follow_the_negotiated_encoding(encoding):
+    spec = ExternalFormatterSpec([sys.executable, STUB, "--mode", "lsp", "--position-encoding", encoding],
+                                 mode="lsp", workers=1)
+    formatter = ExternalFormatter("stub", spec)
+    try:
+        code = 's := "😀 é"  \n\tt := "ok"   \nu := 1'
+        assert formatter.format(code) == 's := "😀 é"\n    t := "ok"\nu := 1\n'
+    finally:
+        formatter.close()
+
+def test_a_missing_language_server_falls_back_to_the_oneshot_command():
+    spec = ExternalFormatterSpec(["no-such-language-server-cogenbai"], mode="lsp",
+                                 fallback=[sys.executable, STUB, "--mode", "oneshot"])
+    formatter = ExternalFormatter("stub", spec)
+    assert formatter.format("a  \n") == "a\n"
+    assert formatter.format("b  \n") == "b\n"
+    assert formatter.stats()["mode"] == "oneshot" and formatter.stats()["fallback"]
+    with pytest.raises(FormatterNotInstalled):
+        ExternalFormatter("nope", ExternalFormatterSpec(["no-such-language-server-cogenbai"], mode="lsp")).format("x")
+
+def test_a_language_server_that_exits_at_startup_falls_back():
+    # What a rustup proxy does when the rust-analyzer component is missing
+    spec = ExternalFormatterSpec([sys.executable, "-c", "import sys; sys.exit(1)"], mode="lsp",
+                                 fallback=[sys.executable, STUB, "--mode", "oneshot"])
+    formatter = ExternalFormatter("stub", spec)
+    assert formatter.format("a  \n") == "a\n"
+    assert formatter.stats()["fallback"]
@@ -0,0 +1,66 @@
+import pytest
+from cogenbai.optimization.formatting import FORMATTERS, FormattingService, register_formatter
+from cogenbai.optimization.optimizer import CodeOptimizer
+
+calls = []
+
+def strip_trailing(code):
+    calls.append("strip")
+    return "\n".join(line.rstrip() for line in code.splitlines()) + "\n"
+
+def upper(code):
+    calls.append("upper")
+    return code.upper()
+
+def broken(code):
+    calls.append("broken")
+    raise ValueError("cannot parse")
+
+def missing(code):
+    raise ImportError("no module named missing")
+
+@pytest.fixture(autouse=True)
+def passes():
+    calls.clear()
+    register_formatter("strip", strip_trailing, idempotent=True)
+    register_formatter("upper", upper)
+    register_formatter("broken", broken)
+    register_formatter("missing", missing)
+    yield
+    for name in ("strip", "upper", "broken", "missing"):
+        FORMATTERS.pop(name)
+
+def test_results_are_cached_per_pass_and_text():
+    service = FormattingService({"text": ["strip", "upper"]})
+    result = service.format_code("a  \nb\n", "text")
+    assert result.code == "A\nB\n"
+    assert [(t.name, t.changed, t.cached) for t in result.passes] == [("strip", True, False), ("upper", True, False)]
+    assert service.format("a  \nb\n", "text") == "A\nB\n"
+    assert calls == ["strip", "upper"]
+    stats = service.stats()["passes"]
+    assert stats["strip"]["runs"] == 1 and stats["strip"]["cached"] == 1
+
+def test_already_formatted_code_skips_idempotent_passes():
+    service = FormattingService({"text": ["strip"]})
+    formatted = service.format("x = 1   \n", "text")
+    assert service.format_code(formatted, "text").passes[0].cached
+    # A pass that left a text unchanged is not run on it again
+    service.format("y\n", "text")
+    service.format("y\n", "text")
+    assert calls == ["strip", "strip"]
+
+def test_failing_and_missing_passes_leave_the_text_unchanged():
+    service = FormattingService({"text": ["missing", "broken", "upper"]})
+    result = service.format_code("ok", "text")
+    assert result.code == "OK"
+    assert [t.name for t in result.passes] == ["broken", "upper"]
+    assert result.passes[0].error == "ValueError: cannot parse"
+    assert service.stats()["unavailable"] == ["missing"]
+    assert service.format("other", "javascript") == "other"  # no pipeline
+    with pytest.raises(ValueError):
+        FormattingService({"python": ["no-such-formatter"]})
+
+def test_optimizer_uses_the_python_pipeline():
+    code = "def f(a,b):\n  return a+b\n"
+    optimizer = CodeOptimizer(FormattingService({"python": ["black"]}))
+    assert optimizer.optimize(code, "Python") == "def f(a, b):\n    return a + b\n"
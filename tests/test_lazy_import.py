@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_python(code, cwd=None):
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                          cwd=cwd, env=env).stdout
+
+def test_import_does_not_load_heavy_dependencies():
+    out = run_python(
+        "import sys, cogenbai\n"
+        "from cogenbai import LanguageGenerator, CogenConfig\n"
+        "heavy = ['torch', 'transformers', 'pyttsx3', 'cogenbai.api.server', 'cogenbai.core.model']\n"
+        "print(sorted(m for m in heavy if m in sys.modules))"
+    )
+    assert out.strip() == "[]"
+
+def test_unknown_attribute_raises():
+    out = run_python(
+        "import cogenbai\n"
+        "try:\n"
+        "    cogenbai.Missing\n"
+        "except AttributeError as e:\n"
+        "    print('AttributeError')"
+    )
+    assert out.strip() == "AttributeError"
+
+def test_importing_the_api_creates_no_files(tmp_path):
+    run_python("import cogenbai.api.server", cwd=tmp_path)
+    assert os.listdir(tmp_path) == []
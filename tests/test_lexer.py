@@ -0,0 +1,74 @@
+import pytest
+from cogenbai.review.analyzer import CodeReviewAnalyzer
+from cogenbai.review.lexer import IDENT, LANGUAGE_SPECS, OPEN, tokenize
+from cogenbai.review.lexical import LexicalReview
+
+JS = '''/** Module docs */
+const s = `multi
+line { not a brace
+`; // comment {
+function handle(items, limit) {
+    /* block
+       comment { */
+    for (let i = 0; i < items.length; i++) {
+        if (items[i] > limit) {
+            while (limit) { limit--; }
+        } else if (items[i] < 0) {
+            try { run(); } catch (e) { stop(); }
+        }
+    }
+    return obj.x;
+}
+'''
+
+def idents(source, language):
+    return [text for kind, text, _, _ in tokenize(source.splitlines(True), LANGUAGE_SPECS[language]) if kind == IDENT]
+
+def test_strings_and_comments_produce_no_identifiers_or_braces():
+    tokens = list(tokenize(JS.splitlines(True), LANGUAGE_SPECS["javascript"]))
+    names = [text for kind, text, _, _ in tokens if kind == IDENT]
+    assert "multi" not in names and "comment" not in names and "brace" not in names
+    assert sum(kind == OPEN for kind, _, _, _ in tokens) == JS.count("{") - 3
+    assert ("ident", "handle", 5, 9) in tokens
+
+def test_rust_literals_and_nested_comments():
+    source = ("fn f<'a>(x: &'a str) -> char {\n"
+              "    /* outer /* inner } */ still { */\n"
+              "    let raw = r#\"quote \" } \"#;\n"
+              "    '{'\n"
+              "}\n")
+    assert idents(source, "rust") == ["fn", "f", "x", "str", "char", "let", "raw"]
+
+def test_javascript_regex_literals_are_not_strings_or_comments():
+    source = ("const tick = /`/g;\n"
+              "const slash = /[/*]/;\n"
+              "function check(a, b) {\n"
+              "    if (a / b / 2 > 1) { return /x\\/y/i.test(a); }\n"
+              "}\n")
+    assert idents(source, "javascript") == ["const", "tick", "const", "slash", "function", "check", "a", "b",
+                                            "if", "a", "b", "return", "test", "a"]
+    results = LexicalReview("typescript").run(source.splitlines(True))
+    assert results["complexity"]["cyclomatic_complexity"] == 1
+
+def test_c_preprocessor_lines_are_skipped():
+    source = "#include <stdio.h>\n#define MAX(a, b) \\\n    ((a) > (b))\nint main() { return 0; }\n"
+    assert idents(source, "c") == ["int", "main", "return"]
+
+def test_complexity_nesting_and_naming_in_one_pass():
+    results = LexicalReview("javascript").run(JS.splitlines(True))
+    # for(0) + if(1) + while(2) + else if(1); try only branches
+    assert results["complexity"] == {"cyclomatic_complexity": 5, "cognitive_complexity": 6}
+    assert "Invalid name: x" not in results["naming"]["issues"]  # member access
+    assert results["naming"]["issues"].count("Invalid name: i") == 5
+    assert results["documentation"]["has_module_docstring"] is True
+
+def test_go_newline_ends_braceless_statements():
+    source = "func f(xs []int) int {\n\tfor _, x := range xs {\n\t\tif x > 0 {\n\t\t\treturn x\n\t\t}\n\t}\n\treturn 0\n}\n"
+    results = LexicalReview("go").run(iter(source.splitlines(True)))
+    assert results["complexity"] == {"cyclomatic_complexity": 2, "cognitive_complexity": 2}
+    assert "Invalid name: _" not in results["naming"]["issues"]
+
+def test_analyzer_uses_the_lexer_for_brace_languages():
+    assert CodeReviewAnalyzer().review_code("if (a) { b(); }", "java")["complexity"]["cyclomatic_complexity"] == 1
+    with pytest.raises(ValueError):
+        LexicalReview("cobol")
@@ -0,0 +1,125 @@
+import threading
+from datetime import datetime
+import torch
+from cogenbai.core.batching import GenerationRequest
+from cogenbai.storage.project_tracker import ProjectState
+from tiny_model import tiny_cogenbai
+
+def test_seeded_sampling_is_reproducible_while_others_sample(tmp_path):
+    model = tiny_cogenbai(tmp_path, early_stopping=False)
+    expected = model.generate_code("add two numbers", "python", max_length=60, seed=7)
+
+    def sample_unseeded():
+        for _ in range(3):
+            model.generate_code("loop over items", "python", max_length=60)
+
+    threads = [threading.Thread(target=sample_unseeded) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    torch.manual_seed(123)
+    seeded = [model.generate_code("add two numbers", "python", max_length=60, seed=7) for _ in range(3)]
+    for thread in threads:
+        thread.join()
+    assert seeded == [expected] * 3
+    assert model.generate_code("add two numbers", "python", max_length=60, seed=8) != expected
+
+def test_seeded_sampling_at_zero_temperature_is_greedy(tmp_path):
+    model = tiny_cogenbai(tmp_path, early_stopping=False)
+    greedy = model.generate_code("add two numbers", "python", max_length=60, deterministic=True)
+    assert model.generate_code("add two numbers", "python", max_length=60, temperature=0.0, seed=1) == greedy
+
+def test_result_cache_key_covers_stopping_and_formatting(tmp_path):
+    model = tiny_cogenbai(tmp_path, result_cache_enabled=True)
+    key = lambda: model._result_cache_key("p", "python", None, 100, 0.7, 0.95, None, True, None)
+    before = key()
+    model.config.early_stopping = False
+    assert key() != before
+    stopped = key()
+    model.formatter.pipelines["python"] = ["black"]
+    assert key() != stopped
+
+def test_project_context_fills_the_budget_with_unmatched_snippets(tmp_path):
+    model = tiny_cogenbai(tmp_path, project_context_tokens=1024)
+    snippets = {"setup": "app = create_app()", "cart": "cart = []", "orders": "def list_orders(): ..."}
+    model.project_tracker.create_project(ProjectState("p1", "shop", "python", "flask", "active", 0.0,
+                                                      datetime(2024, 1, 1), snippets, []))
+    project = model.project_tracker.get_project("p1", include_snippets=False)
+
+    context = model._build_project_context(project, "websocket notifications")
+    assert all(code in context for code in snippets.values())
+
+    model.config.project_context_tokens = len(model.tokenizer(model._snippet_section("orders", snippets["orders"])).input_ids)
+    context = model._build_project_context(project, "orders report")
+    assert snippets["orders"] in context and "cart" not in context
+
+def test_project_context_measures_a_bounded_number_of_snippets(tmp_path):
+    model = tiny_cogenbai(tmp_path, project_context_tokens=201)
+    snippets = {f"feature {i}": f"value_{i} = {i}\n" * (1 + i % 7) for i in range(3000)}
+    model.project_tracker.create_project(ProjectState("p1", "shop", "python", "flask", "active", 0.0,
+                                                      datetime(2024, 1, 1), snippets, []))
+    project = model.project_tracker.get_project("p1", include_snippets=False)
+    tokenized = []
+    tokenizer = model.tokenizer
+    model.tokenizer = lambda text, **kwargs: tokenized.append(text) or tokenizer(text, **kwargs)
+
+    first = model._build_project_context(project, "value report")
+    assert 0 < len(tokenized) <= 64
+    tokenized.clear()
+    # Counts are remembered, so the same request measures nothing again
+    assert model._build_project_context(project, "value report") == first
+    assert tokenized == []
+
+    # A changed snippet is measured again
+    best = model.project_tracker.relevant_snippets("p1", "value report")[0]
+    model.project_tracker.add_snippet("p1", best, "value_report = 0\n")
+    model._build_project_context(project, "value report")
+    assert len(tokenized) == 1
+
+def test_prefix_cache_does_not_change_tokenization(tmp_path):
+    cached = tiny_cogenbai(tmp_path / "on")
+    uncached = tiny_cogenbai(tmp_path / "off", prefix_cache_max_bytes=0)
+    for context in [None, "def add(a, b):\n    return a + b\n", "items = []\n\n\n", "x = 1   "]:
+        for _ in range(2):  # the second call is served from the prefix cache
+            ids, past = cached._encode("add two numbers", "python", None, context)
+            assert past is not None
+            assert ids.tolist() == uncached._encode("add two numbers", "python", None, context)[0].tolist()
+
+def test_batched_rows_match_single_requests(tmp_path):
+    # Prompts of different lengths are left-padded; each row keeps its own sampling, budget and stopping point
+    model = tiny_cogenbai(tmp_path, train_steps=100)
+    requests = [
+        GenerationRequest("add two numbers", "python", max_length=90, deterministic=True),
+        GenerationRequest("print every item", "python", max_length=80, deterministic=True),
+        GenerationRequest("print every item", "python", max_length=50, temperature=0.0),
+        GenerationRequest("add two numbers", "python", max_length=70, temperature=1.0, top_p=0.5),
+    ]
+    batched = model.generate_batch(requests)
+    for request, result in zip(requests[:3], batched):
+        single = model._generate_rows([GenerationRequest(request.prompt, request.language,
+                                                         max_length=request.max_length, deterministic=True)])[0]
+        assert (result.code, result.num_tokens) == (single.code, single.num_tokens)
+        assert result.code == model.generate_code(request.prompt, request.language,
+                                                  max_length=request.max_length, deterministic=True)
+
+    # The first two rows stop at the next "Generate python code" prompt, which is trimmed off
+    assert batched[0].code.startswith("def add(a, b):")
+    assert not any("Generate" in result.code for result in batched[:2])
+    assert model.early_stopping.stats()["early_stops"] >= 2
+    prompt_len = len(model.tokenizer(model.build_prompt("print every item", "python")).input_ids)
+    assert batched[2].num_tokens == 50 - prompt_len
+
+def test_generate_code_stream_tokens_add_up_to_the_answer(tmp_path):
+    model = tiny_cogenbai(tmp_path, early_stopping=False)
+    events = list(model.generate_code_stream("add two numbers", "python", max_length=60))
+    tokens, final = events[:-1], events[-1]
+    assert tokens and all(event["type"] == "token" for event in tokens)
+    assert "ttft_ms" in tokens[0] and all("ttft_ms" not in event for event in tokens[1:])
+    assert final["type"] == "final" and final["total_ms"] >= final["ttft_ms"]
+    assert final["code"] == "".join(event["text"] for event in tokens).split("Solution:")[-1].strip()
+
+def test_closing_the_stream_stops_generation(tmp_path):
+    model = tiny_cogenbai(tmp_path, early_stopping=False)
+    stream = model.generate_code_stream("add two numbers", "python", max_length=400)
+    assert next(stream)["type"] == "token"
+    stream.close()
+    assert not any(thread.name == "cogenbai-stream" for thread in threading.enumerate())
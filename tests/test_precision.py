@@ -0,0 +1,27 @@
+import pytest
+import torch
+from transformers import GPT2Config, GPT2LMHeadModel
+from cogenbai.core.precision import load_causal_lm, quantize_dynamic_int8
+
+def tiny_gpt2():
+    torch.manual_seed(0)
+    return GPT2LMHeadModel(GPT2Config(n_embd=32, n_layer=2, n_head=2, vocab_size=64, n_positions=32)).eval()
+
+def test_int8_quantizes_conv1d_layers_and_keeps_outputs_close():
+    model = tiny_gpt2()
+    ids = torch.tensor([[1, 5, 9, 13]])
+    with torch.no_grad():
+        expected = model(ids).logits
+        quantized = quantize_dynamic_int8(model)
+        actual = quantized(ids).logits
+
+    names = {type(m).__name__ for m in quantized.modules()}
+    assert "Conv1D" not in names
+    assert any("quantized.dynamic" in type(m).__module__ for m in quantized.modules())
+    assert torch.allclose(actual, expected, atol=0.1)
+
+def test_unknown_precision_and_int8_on_gpu_are_rejected():
+    with pytest.raises(ValueError):
+        load_causal_lm("unused", precision="fp8")
+    with pytest.raises(ValueError):
+        load_causal_lm("unused", precision="int8", device="cuda")
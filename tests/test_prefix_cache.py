@@ -0,0 +1,41 @@
+import torch
+from cogenbai.core.prefix_cache import PrefixCache
+
+def make_cache(length):
+    # One layer of (key, value) tensors shaped (batch, heads, seq, head_dim)
+    keys = torch.arange(length, dtype=torch.float).view(1, 1, length, 1)
+    return ((keys, torch.zeros(1, 1, length, 1)),)
+
+def test_longest_prefix_and_cropped_partial_match():
+    cache = PrefixCache(max_bytes=1024)
+    cache.insert([1, 2, 3], make_cache(3))
+    cache.insert([1, 2, 4, 5], make_cache(4))
+
+    assert cache.lookup([1, 2, 4, 5, 6])[0] == 4
+    assert cache.lookup([1, 2, 3, 9])[0] == 3
+
+    matched, past = cache.lookup([1, 2, 7])
+    assert matched == 2
+    assert past[0][0].flatten().tolist() == [0.0, 1.0]
+    assert cache.lookup([9])[0] == 0
+
+def test_lru_eviction_is_bounded_by_bytes():
+    # Each cached position is 8 bytes (one float key + one float value)
+    cache = PrefixCache(max_bytes=100)
+    cache.insert([1, 2, 3, 4], make_cache(4))
+    cache.insert([5, 6, 7, 8, 9], make_cache(5))
+    cache.lookup([1, 2, 3, 4])
+    cache.insert([7, 7, 7, 7, 7, 7], make_cache(6))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 100
+    assert stats["evictions"] == 1
+    assert cache.lookup([5, 6, 7, 8, 9])[0] == 0
+    assert cache.lookup([1, 2, 3, 4])[0] == 4
+
+def test_lookup_returns_a_private_copy():
+    cache = PrefixCache()
+    cache.insert([1, 2], make_cache(2))
+    _, past = cache.lookup([1, 2])
+    past[0][0].add_(100)
+    assert cache.lookup([1, 2])[1][0][0].flatten().tolist() == [0.0, 1.0]
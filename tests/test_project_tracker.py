@@ -0,0 +1,176 @@
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+import pytest
+from cogenbai.storage.project_tracker import (
+    AsyncProjectTracker, ProjectState, ProjectTracker, project_cursor, search_cursor
+)
+
+def make_project(project_id, snippets=None):
+    return ProjectState(project_id, "shop", "python", "flask", "active", 0.0,
+                        datetime(2024, 1, 1), snippets or {}, ["flask"])
+
+def test_add_snippet_upserts_in_insertion_order(tmp_path):
+    tracker = ProjectTracker(str(tmp_path / "projects.db"))
+    tracker.create_project(make_project("p1", {"initial": "app = Flask(__name__)"}))
+    tracker.add_snippet("p1", "cart", "cart = []")
+    tracker.add_snippet("p1", "checkout", "def checkout(): ...")
+    tracker.add_snippet("p1", "cart", "cart = {}")
+
+    project = tracker.get_project("p1")
+    assert list(project.code_snippets) == ["initial", "cart", "checkout"]
+    assert project.code_snippets["cart"] == "cart = {}"
+    assert project.last_modified > datetime(2024, 1, 1)
+    assert tracker.get_snippets("p1", ["checkout", "initial", "missing"]) == {
+        "initial": "app = Flask(__name__)", "checkout": "def checkout(): ..."
+    }
+    assert tracker.get_project("p1", include_snippets=False).code_snippets == {}
+    assert tracker.snippet_features("p1") == ["checkout", "cart", "initial"]
+
+def test_update_project_replaces_snippet_set(tmp_path):
+    tracker = ProjectTracker(str(tmp_path / "projects.db"))
+    tracker.create_project(make_project("p1", {"a": "x = 1", "b": "y = 2"}))
+    assert tracker.update_project("p1", {"status": "done", "code_snippets": json.dumps({"b": "y = 3"})})
+
+    project = tracker.get_project("p1")
+    assert project.status == "done"
+    assert project.code_snippets == {"b": "y = 3"}
+    assert tracker.relevant_snippets("p1", "x y") == ["b"]
+
+def test_json_snippets_are_migrated(tmp_path):
+    db_path = str(tmp_path / "projects.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute('''CREATE TABLE projects (project_id TEXT PRIMARY KEY, name TEXT, language TEXT,
+                    framework TEXT, status TEXT, completion_percentage REAL, last_modified TIMESTAMP,
+                    code_snippets TEXT, dependencies TEXT)''')
+    conn.execute("INSERT INTO projects VALUES ('old', 'shop', 'python', 'flask', 'active', 0, ?, ?, '[]')",
+                 (datetime.now().isoformat(), json.dumps({"initial": "app = 1", "orders": "def list_orders(): ..."})))
+    conn.commit()
+
+    tracker = ProjectTracker(db_path)
+    assert list(tracker.get_project("old").code_snippets) == ["initial", "orders"]
+    assert tracker.relevant_snippets("old", "orders") == ["orders"]
+    assert conn.execute("SELECT code_snippets FROM projects").fetchone() == (None,)
+
+    # Reopening does not duplicate or re-migrate anything
+    assert ProjectTracker(db_path).get_snippets("old") == tracker.get_snippets("old")
+
+def test_concurrent_writers_and_readers(tmp_path):
+    db_path = str(tmp_path / "projects.db")
+    tracker = ProjectTracker(db_path)
+    tracker.create_project(make_project("p1"))
+    # A second tracker stands in for another API worker process
+    other = ProjectTracker(db_path)
+    errors = []
+
+    def write(owner, start):
+        for i in range(start, start + 25):
+            if not owner.add_snippet("p1", f"feature {i}", f"x_{i} = {i}"):
+                errors.append(i)
+
+    def read():
+        for _ in range(25):
+            numbers = [int(feature.split()[1]) for feature in tracker.get_project("p1").code_snippets]
+            # Each writer's features show up in the order it added them
+            for start in (0, 100, 200):
+                own = [n for n in numbers if start <= n < start + 100]
+                if own != list(range(start, start + len(own))):
+                    errors.append(own)
+
+    threads = [threading.Thread(target=write, args=(owner, start))
+               for owner, start in ((tracker, 0), (tracker, 100), (other, 200))]
+    threads += [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(tracker.get_snippets("p1")) == 75
+    assert tracker.conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+def test_failed_transaction_rolls_back(tmp_path):
+    tracker = ProjectTracker(str(tmp_path / "projects.db"))
+    tracker.create_project(make_project("p1"))
+    assert not tracker.create_project(make_project("p1", {"orphan": "x = 1"}))
+    assert tracker.get_snippets("p1") == {}
+    assert tracker.relevant_snippets("p1", "orphan") == []
+
+def test_async_facade(tmp_path):
+    projects = AsyncProjectTracker(ProjectTracker(str(tmp_path / "projects.db")))
+
+    async def run():
+        assert await projects.create_project(make_project("p1"))
+        await asyncio.gather(*(projects.add_snippet("p1", f"f{i}", f"y = {i}") for i in range(10)))
+        return await projects.get_project("p1")
+
+    assert len(asyncio.run(run()).code_snippets) == 10
+    projects.close()
+
+def test_shared_code_is_deduplicated_across_projects(tmp_path):
+    tracker = ProjectTracker(str(tmp_path / "projects.db"))
+    boilerplate = "from flask import Flask\napp = Flask(__name__)\n"
+    tracker.create_project(make_project("p1", {"initial": boilerplate}))
+    tracker.create_project(make_project("p2", {"initial": boilerplate, "cart": "cart = []"}))
+    assert tracker.blobs.stats()["blobs"] == 2
+
+    tracker.add_snippet("p2", "initial", "app = None")
+    tracker.update_project("p1", {"code_snippets": json.dumps({})})
+    assert tracker.blobs.stats()["references"] == 2
+    assert tracker.get_snippets("p2") == {"initial": "app = None", "cart": "cart = []"}
+
+def test_verbatim_snippet_rows_are_migrated(tmp_path):
+    db_path = str(tmp_path / "projects.db")
+    ProjectTracker(db_path).create_project(make_project("p1"))
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE snippets")
+    conn.execute("CREATE TABLE snippets (project_id TEXT, feature TEXT, code TEXT, PRIMARY KEY (project_id, feature))")
+    conn.executemany("INSERT INTO snippets VALUES ('p1', ?, ?)", [("initial", "app = 1"), ("cart", "cart = []")])
+    conn.commit()
+
+    tracker = ProjectTracker(db_path)
+    assert tracker.get_snippets("p1") == {"initial": "app = 1", "cart": "cart = []"}
+    assert "code" not in [row[1] for row in conn.execute("PRAGMA table_info(snippets)")]
+
+def test_list_projects_filters_and_keyset_pagination(tmp_path):
+    tracker = ProjectTracker(str(tmp_path / "projects.db"))
+    for i in range(7):
+        project = make_project(f"p{i}")
+        project.last_modified = datetime(2024, 1, 1) + timedelta(days=i % 4)
+        project.language = "python" if i % 2 else "rust"
+        project.owner_id = "alice" if i < 5 else "bob"
+        tracker.create_project(project)
+
+    ids = [p.project_id for p in tracker.list_projects(page_size=2)]
+    assert ids == ["p3", "p6", "p2", "p5", "p1", "p4", "p0"]
+    assert [p.project_id for p in tracker.list_projects(owner_id="alice", language="python")] == ["p3", "p1"]
+    assert [p.project_id for p in tracker.list_projects(modified_after=datetime(2024, 1, 2, 12))] == ["p3", "p6", "p2"]
+
+    first = list(tracker.list_projects(limit=3))
+    rest = list(tracker.list_projects(cursor=project_cursor(first[-1]), page_size=2))
+    assert [p.project_id for p in first + rest] == ids
+    with pytest.raises(ValueError):
+        tracker.list_projects(cursor="not-a-cursor")
+
+def test_search_projects_uses_full_text_index(tmp_path):
+    tracker = ProjectTracker(str(tmp_path / "projects.db"))
+    tracker.create_project(make_project("p1", {"auth": "def hash_password(password): ...", "cart": "cart = []"}))
+    tracker.create_project(make_project("p2", {"auth": "def check_password(user, password): ..."}))
+    tracker.create_project(make_project("p3", {"api": "app = FastAPI()"}))
+
+    matches = tracker.search_projects("password")
+    assert sorted(m.project.project_id for m in matches) == ["p1", "p2"]
+    assert all(m.features == ["auth"] for m in matches)
+    assert [m.project.project_id for m in tracker.search_projects("check password")] == ["p2"]
+
+    page = tracker.search_projects("password", limit=1)
+    assert [m.project.project_id for m in tracker.search_projects("password", cursor=search_cursor(page[0]))] == \
+        [m.project.project_id for m in matches[1:]]
+
+    # Replaced and deleted code no longer matches
+    tracker.add_snippet("p2", "auth", "def login(user): ...")
+    tracker.update_project("p1", {"code_snippets": json.dumps({"cart": "cart = []"})})
+    assert tracker.search_projects("password") == []
+    assert [m.project.project_id for m in tracker.search_projects("login")] == ["p2"]
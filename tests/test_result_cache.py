@@ -0,0 +1,49 @@
+import time
+from cogenbai.core.result_cache import GenerationCache
+
+def test_lru_eviction_and_counters():
+    cache = GenerationCache(max_entries=2)
+    cache.put("a", "code a")
+    cache.put("b", "code b")
+    assert cache.get("a") == "code a"
+    cache.put("c", "code c")
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "code c"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+
+def test_entries_expire_after_ttl():
+    cache = GenerationCache(ttl_seconds=0.05)
+    cache.put("a", "code a")
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    key = GenerationCache.make_key(prompt="sort a list", language="python", seed=1)
+    GenerationCache(db_path=db_path).put(key, "sorted(items)")
+
+    cache = GenerationCache(db_path=db_path)
+    assert cache.get(key) == "sorted(items)"
+    assert cache.get(key) == "sorted(items)"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+def test_disk_tier_drops_expired_and_oldest_rows(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = GenerationCache(ttl_seconds=0.5, db_path=db_path, max_disk_entries=2)
+    cache.put("old", "expired")
+    time.sleep(0.6)
+    for key in ("a", "b", "c"):
+        cache.put(key, "code " + key)
+
+    keys = {key for (key,) in cache.conn.execute("SELECT key FROM generation_cache")}
+    assert keys == {"b", "c"}
+    stats = cache.stats()
+    assert stats["disk_entries"] == 2
+    assert stats["expirations"] == 1
+    assert GenerationCache(db_path=db_path).get("a") is None
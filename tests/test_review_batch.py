@@ -0,0 +1,51 @@
+import io
+import json
+import os
+from click.testing import CliRunner
+from cogenbai.cli.main import cli
+from cogenbai.config import CogenConfig
+from cogenbai.review.batch import iter_source_files, review_batch, run_batch_review
+
+def make_tree(root):
+    files = {
+        "app/main.py": "def main(argv):\n    if argv:\n        return eval(argv[0])\n",
+        "app/util.js": "function add(a, b) { return a + b; }\n",
+        "app/broken.py": "def (:\n",
+        "app/notes.txt": "not code\n",
+        "node_modules/lib/index.js": "module.exports = {};\n",
+        ".git/hooks/pre-commit.py": "print('hook')\n",
+    }
+    for path, code in files.items():
+        full = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as f:
+            f.write(code)
+
+def test_iter_source_files_maps_extensions_and_skips_vendored_dirs(tmp_path):
+    make_tree(tmp_path)
+    found = [(os.path.relpath(path, tmp_path), language)
+             for path, language in iter_source_files(str(tmp_path), CogenConfig().language_extensions)]
+    assert found == [("app/broken.py", "python"), ("app/main.py", "python"), ("app/util.js", "javascript")]
+
+def test_run_batch_review_streams_one_record_per_file(tmp_path):
+    make_tree(tmp_path)
+    out = io.StringIO()
+    report = run_batch_review(str(tmp_path), out, num_workers=1)
+    records = {os.path.basename(r["path"]): r for r in map(json.loads, out.getvalue().splitlines())}
+    assert (report.files, report.failed) == (3, 1)
+    assert records["broken.py"]["error"].startswith("SyntaxError")
+    assert records["main.py"]["review"]["security"]["vulnerabilities"] == ["Dangerous eval() usage"]
+    assert records["util.js"]["lines"] == 1
+
+def test_process_pool_gives_the_same_records():
+    items = [{"path": str(i), "language": "python", "code": f"x{i} = {i}\nif x{i}:\n    pass\n"} for i in range(40)]
+    serial = sorted(review_batch(items, num_workers=1, chunk_size=4), key=lambda r: int(r["path"]))
+    pooled = sorted(review_batch(items, num_workers=2, chunk_size=4), key=lambda r: int(r["path"]))
+    assert pooled == serial
+
+def test_review_command(tmp_path):
+    make_tree(tmp_path)
+    result = CliRunner().invoke(cli, ["review", str(tmp_path), "-j", "1"])
+    assert result.exit_code == 0
+    assert len(result.stdout.splitlines()) == 3
+    assert "files/s" in result.stderr
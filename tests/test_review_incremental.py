@@ -0,0 +1,64 @@
+import pytest
+from cogenbai.review.analyzer import CodeReviewAnalyzer
+from cogenbai.review.incremental import ReviewCache, split_definitions
+
+SOURCE = '''"""Helpers."""
+import os
+
+@decorator
+@other(1)
+def first(a):
+    if a:
+        if a > 1:
+            return eval(a)
+
+USAGE = """
+def not_a_function():
+    x = os.system("ls")
+"""
+
+class Second:
+    """Docs."""
+    def method(self, b):
+        while b:
+            b -= 1
+
+async def third(c):
+    for i in c:
+        if i:
+            os.system(i)
+'''
+
+def test_split_definitions_round_trips_and_keeps_decorators():
+    segments = split_definitions(SOURCE)
+    assert "".join(segments) == SOURCE
+    assert segments[1].startswith("@decorator\n@other(1)\ndef first")
+    assert any(segment.startswith("def not_a_function") for segment in segments)
+    assert segments[-1].startswith("async def third")
+
+def test_incremental_review_matches_full_review():
+    full = CodeReviewAnalyzer().review_code(SOURCE, "python")
+    analyzer = CodeReviewAnalyzer(ReviewCache())
+    assert analyzer.review_code(SOURCE, "python") == full
+    edited = SOURCE.replace("b -= 1", "b -= 1\n            if b:\n                pass")
+    assert analyzer.review_code(edited, "python") == CodeReviewAnalyzer().review_code(edited, "python")
+
+def test_only_changed_definitions_are_analyzed_again():
+    cache = ReviewCache()
+    analyzer = CodeReviewAnalyzer(cache)
+    analyzer.review_code(SOURCE, "python")
+    # The segment split inside USAGE's string never parses alone, so it misses every time
+    before = cache.misses
+    analyzer.review_code(SOURCE, "python")
+    unparsable = cache.misses - before
+    analyzer.review_code(SOURCE.replace("b -= 1", "b -= 2"), "python")
+    assert cache.misses - before == 2 * unparsable + 1
+
+def test_disk_tier_is_shared_and_syntax_errors_still_raise(tmp_path):
+    path = str(tmp_path / "review.db")
+    CodeReviewAnalyzer(ReviewCache(db_path=path)).review_code(SOURCE, "python")
+    cache = ReviewCache(db_path=path)
+    CodeReviewAnalyzer(cache).review_code(SOURCE, "python")
+    assert cache.disk_hits == len(split_definitions(SOURCE)) - 1  # first and USAGE are cached joined
+    with pytest.raises(SyntaxError):
+        CodeReviewAnalyzer(cache).review_code(SOURCE + "\ndef broken(:\n    pass\n", "python")
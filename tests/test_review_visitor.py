@@ -0,0 +1,72 @@
+import ast
+from cogenbai.review.analyzer import CodeReviewAnalyzer
+from cogenbai.review.visitor import Metric, ReviewVisitor
+
+SOURCE = '''"""Module docs."""
+import os
+
+def handle(items):
+    """Handle items."""
+    for item in items:
+        if item:
+            while item:
+                item -= 1
+        elif item is None:
+            pass
+    try:
+        os.system("ls")
+    except OSError:
+        pass
+    x = eval("1")
+    return x
+'''
+
+class DepthRecorder(Metric):
+    name = "depths"
+
+    def __init__(self, source):
+        super().__init__(source)
+        self.depths = []
+
+    def handlers(self):
+        return {ast.If: self._record, ast.While: self._record, ast.Expr: self._record}
+
+    def _record(self, node, depth):
+        self.depths.append((type(node).__name__, node.lineno, depth))
+
+    def result(self):
+        return {"depths": self.depths}
+
+def test_nesting_depth_is_tracked_during_the_walk():
+    visitor = ReviewVisitor([DepthRecorder(SOURCE)])
+    visitor.walk(ast.parse(SOURCE))
+    depths = visitor.results()["depths"]["depths"]
+    # elif stays at the depth of its if; the while inside it is one deeper
+    assert ("If", 7, 1) in depths and ("If", 10, 1) in depths
+    assert ("While", 8, 2) in depths
+    assert ("Expr", 13, 1) in depths
+
+def test_review_code_results():
+    results = CodeReviewAnalyzer().review_code(SOURCE, "python")
+    assert results["complexity"] == {"cyclomatic_complexity": 5, "cognitive_complexity": 6}
+    assert results["naming"] == {"issues": ["Invalid name: x", "Invalid name: x"]}
+    assert results["documentation"]["has_module_docstring"] is True
+    assert results["documentation"]["documentation_ratio"] == 2 / len(SOURCE.splitlines())
+    assert results["security"]["vulnerabilities"] == ["Unsafe system command execution", "Dangerous eval() usage"]
+    assert [(f["rule"], f["line"], f["column"]) for f in results["security"]["findings"]] == [
+        ("py-os-system", 13, 8), ("py-eval", 16, 8)]
+
+def test_security_ignores_strings_and_comments():
+    code = 'HELP = "never call eval(x) or os.system(cmd)"\n# exec(code)\n'
+    assert CodeReviewAnalyzer().review_code(code, "python")["security"] == {"vulnerabilities": [], "findings": []}
+
+def test_deeply_nested_code_does_not_recurse():
+    depth = 90
+    code = "".join("    " * i + f"if v{i}:\n" for i in range(depth)) + "    " * depth + "pass\n"
+    results = CodeReviewAnalyzer().review_code(code, "python")
+    assert results["complexity"]["cyclomatic_complexity"] == depth
+    assert results["complexity"]["cognitive_complexity"] == int(sum(1 + 0.5 * i for i in range(depth)))
+
+def test_other_languages_keep_the_same_keys():
+    results = CodeReviewAnalyzer().review_code("/** docs */\nint main() { return 0; }", "c")
+    assert set(results) == {"complexity", "naming", "documentation", "security"}
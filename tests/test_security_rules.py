@@ -0,0 +1,57 @@
+import json
+import pytest
+from cogenbai.review.analyzer import CodeReviewAnalyzer
+from cogenbai.review.incremental import ReviewCache
+from cogenbai.review.security import RuleSet, SecurityRule, default_rules, load_rules, review_rules
+
+C_SOURCE = '''/* never strcpy(dst, src) here */
+#include <string.h>
+void copy(char *dst, const char *src) {
+    const char *help = "system(cmd) is unsafe";
+    strcpy(dst, src); // gets(buf) too
+    if (dst[0]) { system(dst); }
+}
+'''
+
+def hits(results):
+    return [(f["rule"], f["line"], f["column"]) for f in results["security"]["findings"]]
+
+def test_brace_languages_report_every_hit_outside_strings_and_comments():
+    results = CodeReviewAnalyzer().review_code(C_SOURCE, "c")
+    assert hits(results) == [("c-strcpy", 5, 4), ("c-system", 6, 18)]
+    assert results["security"]["vulnerabilities"] == [
+        "Unbounded string copy (strcpy)", "Unsafe system command execution"]
+
+def test_php_variables_and_member_calls():
+    code = '<?php\necho $_GET["q"];\n$db->exec($sql);\n$out = exec($_POST["cmd"]);\n'
+    assert hits(CodeReviewAnalyzer().review_code(code, "php")) == [("php-echo-input", 2, 0), ("php-exec", 4, 7)]
+
+def test_incremental_review_reports_whole_module_lines():
+    code = "".join(f"def f{i}(a):\n    '''Doc.'''\n    return eval(a)\n\n" for i in range(5))
+    analyzer = CodeReviewAnalyzer(ReviewCache())
+    analyzer.review_code(code, "python")
+    edited = code.replace("def f2(a):", "def f2(a, b=1):")
+    results = analyzer.review_code(edited, "python")
+    assert results == CodeReviewAnalyzer().review_code(edited, "python")
+    assert [f["line"] for f in results["security"]["findings"]] == [3, 7, 11, 15, 19]
+
+def test_rules_load_from_files(tmp_path):
+    (tmp_path / "team.json").write_text(json.dumps({"languages": ["go", "rust"], "rules": [
+        {"id": "no-panic", "message": "panic in library code", "pattern": r"(?:panic|todo)\s*!?\s*\(",
+         "severity": "low"},
+    ]}))
+    rules = review_rules(str(tmp_path))
+    assert len(rules) == len(default_rules()) + 1
+    assert rules.fingerprint != default_rules().fingerprint
+    assert load_rules(str(tmp_path)).triggers("rust")["todo"][0].id == "no-panic"
+    results = CodeReviewAnalyzer(rules=rules).review_code('fn f() {\n    todo!("later")\n}\n', "rust")
+    assert hits(results) == [("no-panic", 2, 4)]
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        SecurityRule("bad", "x", r"\w+\(", ("python",))  # no leading identifier, no triggers
+    with pytest.raises(ValueError):
+        SecurityRule("bad", "x", r"eval(", ("python",))
+    rule = SecurityRule("ok", "x", r"eval\s*\(", ("python",))
+    with pytest.raises(ValueError):
+        RuleSet([rule, rule])
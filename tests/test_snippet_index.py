@@ -0,0 +1,28 @@
+import sqlite3
+from cogenbai.storage.snippet_index import SnippetIndex, tokenize
+
+SNIPPETS = {
+    "user login": "def login_user(username, password):\n    return check_password(username, password)",
+    "list orders": "def listOrders(customer):\n    return db.query(Order).filter_by(customer=customer)",
+    "initial": "app = Flask(__name__)",
+}
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("getUserName = 42") == ["getusername", "get", "user", "name", "42"]
+    assert tokenize("login_user") == ["login_user", "login", "user"]
+
+def test_search_ranks_relevant_snippets_and_follows_updates():
+    index = SnippetIndex(sqlite3.connect(":memory:"))
+    for feature, code in SNIPPETS.items():
+        index.update("p1", feature, code)
+    index.update("p2", "other", "def orders_report(): pass")
+
+    assert index.search("p1", "Add feature: password reset for a user")[0][0] == "user login"
+    assert [feature for feature, _ in index.search("p1", "cancel orders")] == ["list orders"]
+    assert index.search("p1", "websocket") == []
+
+    index.update("p1", "user login", "def logout(): pass")
+    index.remove("p1", "list orders")
+    assert index.search("p1", "orders") == []
+    assert index.search("p1", "password") == []
+    assert index.search("p1", "logout")[0][0] == "user login"
@@ -0,0 +1,39 @@
+import torch
+from transformers import DynamicCache, GPT2Config, GPT2LMHeadModel
+from cogenbai.core.speculative import DraftModelDrafter, NgramDrafter, SpeculativeDecoder, SpeculativeStats
+
+def tiny_gpt2(seed, layers=2):
+    torch.manual_seed(seed)
+    return GPT2LMHeadModel(GPT2Config(n_embd=32, n_layer=layers, n_head=2, vocab_size=64, n_positions=128)).eval()
+
+def greedy(model, input_ids, max_new_tokens):
+    return model.generate(input_ids, attention_mask=torch.ones_like(input_ids), max_new_tokens=max_new_tokens,
+                          do_sample=False, pad_token_id=0, eos_token_id=None)
+
+def test_ngram_drafter_proposes_continuation_of_latest_match():
+    drafter = NgramDrafter(ngram_size=2)
+    assert drafter.draft([1, 2, 3, 9, 1, 2, 4, 5, 1, 2], 3) == [4, 5, 1]
+    assert drafter.draft([7, 8], 3) == []
+
+def test_speculative_output_matches_greedy():
+    model, draft = tiny_gpt2(0), tiny_gpt2(1, layers=1)
+    input_ids = torch.tensor([[5, 6, 7, 8, 5, 6, 7, 8, 5, 6]])
+    expected = greedy(model, input_ids, 40)
+
+    stats = SpeculativeStats()
+    for drafter in (NgramDrafter(), DraftModelDrafter(draft), DraftModelDrafter(model)):
+        decoder = SpeculativeDecoder(model, drafter, num_tokens=4, stats=stats)
+        assert torch.equal(decoder.generate(input_ids, max_new_tokens=40), expected)
+
+    # Drafting with the model itself is always accepted
+    assert stats.stats()["tokens_per_forward"] > 1
+
+def test_speculative_decoding_continues_from_prefix_cache():
+    model = tiny_gpt2(0)
+    input_ids = torch.tensor([[1, 2, 3, 4, 5, 6]])
+    with torch.no_grad():
+        past_key_values = model(input_ids[:, :4], past_key_values=DynamicCache(), use_cache=True).past_key_values
+
+    decoder = SpeculativeDecoder(model, NgramDrafter(), num_tokens=4)
+    output = decoder.generate(input_ids, past_key_values=past_key_values, max_new_tokens=20)
+    assert torch.equal(output, greedy(model, input_ids, 20))
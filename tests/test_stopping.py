@@ -0,0 +1,66 @@
+import pytest
+from cogenbai.core.stopping import CompletionDetector, EarlyStoppingStats, detector_for
+from cogenbai.languages.generator import LanguageGenerator
+
+def feed_lines(detector, text):
+    """Feed text the way generation produces it, one line at a time."""
+    lines = text.splitlines(keepends=True)
+    for i in range(1, len(lines) + 1):
+        end = detector.feed("".join(lines[:i]))
+        if end is not None:
+            return end
+    return detector.feed(text, final=True)
+
+def test_python_stops_at_first_line_that_cannot_be_code():
+    answer = "def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n"
+    text = answer + "\nThis solution adds and subtracts.\n"
+    detector = detector_for(LanguageGenerator().get_language_config("python"))
+    assert text[:feed_lines(detector, text)] == answer + "\n"
+
+def test_python_keeps_going_inside_blocks_and_strings():
+    text = 'def f():\n    """\nNot code here.\n    """\n    return 1\n'
+    detector = CompletionDetector(completion="python")
+    assert feed_lines(detector, text) is None
+
+@pytest.mark.parametrize("answer", [
+    "if x:\n    a = 1\nelif y:\n    a = 2\nelse:\n    a = 3\n",
+    "for item in items:\n    print(item)\nelse:\n    print('empty')\n",
+    "while n:\n    n -= 1\nelse:\n    done = True\n",
+    "try:\n    run()\nexcept ValueError:\n    pass\nfinally:\n    close()\n",
+])
+def test_python_keeps_else_and_except_branches(answer):
+    assert CompletionDetector(completion="python").feed(answer, final=True) is None
+    assert feed_lines(CompletionDetector(completion="python"), answer) is None
+
+def test_braces_stop_after_balanced_block_and_prose():
+    answer = 'int main() {\n    printf("}");\n    return 0;\n}\n\nint other() { return 1; }'
+    text = answer + "\n\nThe program prints a brace.\n"
+    detector = detector_for(LanguageGenerator().get_language_config("cpp"))
+    assert text[:feed_lines(detector, text)] == answer
+
+def test_braces_ignore_comments_and_unbalanced_prefix():
+    text = "fn main() {\n    // }\n    /* { */\nNot finished yet\n"
+    detector = CompletionDetector(completion="braces")
+    assert feed_lines(detector, text) is None
+
+@pytest.mark.parametrize("completion", ["braces", "python"])
+def test_closing_fence_ends_answer(completion):
+    answer = "int main() {\n  return 0;\n}" if completion == "braces" else "def main():\n    return 0\n"
+    text = answer + ("\n```\n" if completion == "braces" else "```\n")
+    assert text[:feed_lines(CompletionDetector(completion=completion), text)] == answer
+
+def test_braces_stop_at_prose_with_apostrophes():
+    answer = "int main() {\n  return 0;\n}"
+    text = answer + "\nHere's how it works: `main` returns 0.\n"
+    assert text[:feed_lines(CompletionDetector(completion="braces"), text)] == answer
+
+def test_stop_sequence_cuts_answer():
+    detector = CompletionDetector(["\nSolution:"])
+    assert detector.feed("echo hi\nSolution:\necho again\n") == len("echo hi")
+
+def test_stats_count_saved_tokens():
+    stats = EarlyStoppingStats()
+    stats.record(generated=20, budget=100, stopped_early=True)
+    stats.record(generated=100, budget=100, stopped_early=False)
+    assert stats.stats()["saved_tokens"] == 80
+    assert stats.stats()["mean_generated_tokens"] == 60
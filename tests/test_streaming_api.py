@@ -0,0 +1,59 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from cogenbai.api import server
+
+class FakeStreamingModel:
+    def generate_code_stream(self, prompt, language, framework=None, max_length=1024,
+                             temperature=0.7, top_p=0.95):
+        if prompt == "fail":
+            yield {"type": "token", "text": "partial", "ttft_ms": 1.0}
+            raise RuntimeError("model crashed")
+        for i, word in enumerate(prompt.split()):
+            yield {"type": "token", "text": word, **({"ttft_ms": 1.0} if i == 0 else {})}
+        yield {"type": "final", "code": prompt.upper(), "ttft_ms": 1.0, "total_ms": 2.0}
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(server, "_model", FakeStreamingModel())
+    monkeypatch.setattr(server.config, "preload_model", False)
+    with TestClient(server.app) as client:
+        yield client
+
+def sse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+def test_sse_streams_tokens_then_the_final_code(client):
+    response = client.post("/generate/stream", json={"prompt": "def add", "language": "python"},
+                           headers={"Authorization": "Bearer token"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = sse_events(response.text)
+    assert [name for name, _ in events] == ["token", "token", "final"]
+    assert [data["text"] for _, data in events[:2]] == ["def", "add"]
+    assert events[-1][1]["code"] == "DEF ADD"
+
+def test_sse_reports_errors_and_rejects_bad_requests(client):
+    events = sse_events(client.post("/generate/stream", json={"prompt": "fail", "language": "python"},
+                                    headers={"Authorization": "Bearer token"}).text)
+    assert events == [("token", {"type": "token", "text": "partial", "ttft_ms": 1.0}),
+                      ("error", {"type": "error", "detail": "model crashed"})]
+    response = client.post("/generate/stream", json={"prompt": "x", "language": "cobol"},
+                           headers={"Authorization": "Bearer token"})
+    assert response.status_code == 400
+
+def test_websocket_streams_events_and_errors(client):
+    with client.websocket_connect("/ws/generate") as websocket:
+        websocket.send_json({"prompt": "def add", "language": "python"})
+        events = [websocket.receive_json() for _ in range(3)]
+    assert [event["type"] for event in events] == ["token", "token", "final"]
+    assert events[-1]["code"] == "DEF ADD"
+
+    with client.websocket_connect("/ws/generate") as websocket:
+        websocket.send_json({"prompt": "fail", "language": "python"})
+        assert websocket.receive_json()["text"] == "partial"
+        assert websocket.receive_json() == {"type": "error", "detail": "model crashed"}
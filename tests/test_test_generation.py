@@ -0,0 +1,126 @@
+import ast
+import os
+import black
+from click.testing import CliRunner
+from cogenbai.cli.main import cli
+from cogenbai.testing.batch import generate_batch, iter_python_modules, run_batch_generation
+from cogenbai.testing.generator import python_test_module
+
+SOURCE = '''
+def parse(text, strict=False, *, encoding):
+    def helper(line):
+        return line
+    return text
+
+class Store:
+    def __init__(self, path):
+        self.path = path
+
+    def get(self, key):
+        return key
+
+    @staticmethod
+    def open(path):
+        return Store(path)
+
+    def _evict(self):
+        pass
+'''
+
+def make_package(root):
+    files = {
+        "pkg/__init__.py": "",
+        "pkg/core.py": SOURCE,
+        "pkg/sub/__init__.py": "def version():\n    return 1\n",
+        "pkg/sub/broken.py": "def (:\n",
+        "pkg/constants.py": "LIMIT = 3\n",
+        "pkg/test_core.py": "def test_x():\n    pass\n",
+    }
+    for path, code in files.items():
+        full = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as f:
+            f.write(code)
+    return os.path.join(root, "pkg")
+
+def test_tests_are_grouped_by_class_and_skip_nested_functions():
+    code, count = python_test_module(ast.parse(SOURCE), "pkg.core")
+    assert count == 3
+    assert "from pkg.core import parse, Store" in code
+    assert "class TestModuleFunctions(unittest.TestCase):" in code and "class TestStore(unittest.TestCase):" in code
+    assert "result = parse(text, encoding=encoding)" in code
+    assert "self.instance = Store(path)" in code and "result = Store.open(path)" in code
+    assert "helper" not in code and "_evict" not in code
+    assert black.format_str(code, mode=black.FileMode()) == code
+
+def test_iter_python_modules_names_modules_from_the_package(tmp_path):
+    package = make_package(tmp_path)
+    modules = [item["module"] for item in iter_python_modules(package)]
+    assert modules == ["pkg", "pkg.constants", "pkg.core", "pkg.sub", "pkg.sub.broken"]
+
+def test_run_batch_generation_writes_one_test_module_per_source_module(tmp_path):
+    package = make_package(tmp_path)
+    out = tmp_path / "generated"
+    report = run_batch_generation(package, str(out), num_workers=1)
+    assert (report.files, report.failed, report.written, report.tests) == (5, 1, 2, 4)
+    assert sorted(os.listdir(out)) == ["test_pkg_core.py", "test_pkg_sub.py"]
+    compile((out / "test_pkg_core.py").read_text(), "test_pkg_core.py", "exec")
+
+def test_process_pool_gives_the_same_records(tmp_path):
+    package = make_package(tmp_path)
+    items = list(iter_python_modules(package))
+    key = lambda record: record["module"]
+    serial = sorted(generate_batch(items, str(tmp_path / "a"), num_workers=1, chunk_size=2), key=key)
+    pooled = sorted(generate_batch(items, str(tmp_path / "b"), num_workers=2, chunk_size=2), key=key)
+    strip = lambda records: [{k: v for k, v in r.items() if k != "output"} for r in records]
+    assert strip(pooled) == strip(serial)
+    assert (tmp_path / "a" / "test_pkg_core.py").read_text() == (tmp_path / "b" / "test_pkg_core.py").read_text()
+
+def test_generate_tests_command(tmp_path):
+    package = make_package(tmp_path)
+    result = CliRunner().invoke(cli, ["generate-tests", package, str(tmp_path / "out"), "-j", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Wrote 4 tests in 2 files for 5 modules" in result.stdout
+    assert "files/s" in result.stderr
+
+LONG_SOURCE = '''
+async def fetch_every_remote_resource_for_the_configured_account(account_identifier, *, include_archived_resources):
+    pass
+
+class RemoteResourceSynchronizationCoordinatorWithRetriesAndBackoff:
+    def __init__(self, primary_remote_client, secondary_remote_client, retry_policy, clock):
+        pass
+
+    def synchronize_every_resource_between_the_primary_and_secondary_stores(self, resource_kind):
+        pass
+
+    @property
+    def most_recent_successful_synchronization_timestamp_for_the_primary_store(self):
+        pass
+'''
+
+def test_long_lines_are_split_like_black():
+    names = ", ".join(f"function_with_a_rather_descriptive_name_{i}" for i in range(3))
+    for source in (LONG_SOURCE, "".join(f"def {name}():\n    pass\n" for name in names.split(", "))):
+        code, _ = python_test_module(ast.parse(source), "package.with_a_long.module_path")
+        assert "from package.with_a_long.module_path import (\n" in code
+        assert black.format_str(code, mode=black.FileMode()) == code
+
+def test_modules_flattening_to_the_same_file_get_their_own(tmp_path):
+    for path in ("pkg/a/b_c.py", "pkg/a_b/c.py"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("def run():\n    return 1\n")
+    items = [{"path": str(tmp_path / path), "module": module}
+             for path, module in (("pkg/a/b_c.py", "a.b_c"), ("pkg/a_b/c.py", "a_b.c"))]
+    records = list(generate_batch(items, str(tmp_path / "out"), num_workers=1))
+    assert [os.path.basename(record["output"]) for record in records] == ["test_a_b_c.py", "test_a_b_c_2.py"]
+    assert "from a_b.c import run" in (tmp_path / "out" / "test_a_b_c_2.py").read_text()
+
+def test_classes_with_only_properties_get_a_setup():
+    source = "class Config:\n    def __init__(self, path):\n        self.path = path\n\n" \
+             "    @property\n    def name(self):\n        return self.path\n\n" \
+             "    @staticmethod\n    def default():\n        return Config('x')\n"
+    code, count = python_test_module(ast.parse(source), "pkg.config")
+    assert count == 2
+    assert "    def setUp(self):\n        path = None  # TODO: Add test value\n        self.instance = Config(path)" in code
+    assert "result = self.instance.name" in code
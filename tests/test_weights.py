@@ -0,0 +1,43 @@
+import torch
+from transformers import GPT2Config, GPT2LMHeadModel, LlamaConfig, LlamaForCausalLM
+from cogenbai.core.weights import convert_checkpoint, load_mmap_causal_lm, safetensors_files
+
+def save_tiny_gpt2(path, safe=True):
+    torch.manual_seed(0)
+    model = GPT2LMHeadModel(GPT2Config(n_embd=32, n_layer=2, n_head=2, vocab_size=64, n_positions=32)).eval()
+    model.save_pretrained(path, safe_serialization=safe)
+    return model
+
+def test_mmap_loading_matches_regular_loading(tmp_path):
+    reference = save_tiny_gpt2(tmp_path)
+    model = load_mmap_causal_lm(str(tmp_path))
+
+    ids = torch.tensor([[1, 2, 3, 4]])
+    with torch.no_grad():
+        assert torch.equal(model(ids).logits, reference(ids).logits)
+    assert model.lm_head.weight.data_ptr() == model.transformer.wte.weight.data_ptr()
+    assert not any(p.is_meta for p in model.parameters())
+
+def test_buffers_missing_from_the_checkpoint_are_computed(tmp_path):
+    # Llama's rotary frequencies are non-persistent buffers, so they are not saved
+    torch.manual_seed(0)
+    reference = LlamaForCausalLM(LlamaConfig(hidden_size=32, intermediate_size=64, num_hidden_layers=2,
+                                             num_attention_heads=2, num_key_value_heads=2, vocab_size=64)).eval()
+    reference.save_pretrained(tmp_path)
+    model = load_mmap_causal_lm(str(tmp_path))
+
+    assert torch.equal(model.model.rotary_emb.inv_freq, reference.model.rotary_emb.inv_freq)
+    ids = torch.tensor([[1, 2, 3, 4]])
+    with torch.no_grad():
+        assert torch.allclose(model(ids).logits, reference(ids).logits)
+
+def test_mmap_loading_casts_to_requested_dtype(tmp_path):
+    save_tiny_gpt2(tmp_path)
+    model = load_mmap_causal_lm(str(tmp_path), torch.bfloat16)
+    assert {p.dtype for p in model.parameters()} == {torch.bfloat16}
+
+def test_convert_bin_checkpoint_to_safetensors(tmp_path):
+    save_tiny_gpt2(tmp_path / "bin", safe=False)
+    files = convert_checkpoint(str(tmp_path / "bin"), str(tmp_path / "st"), dtype="bf16")
+    assert files == safetensors_files(str(tmp_path / "st"))
+    assert load_mmap_causal_lm(str(tmp_path / "st")).transformer.wte.weight.dtype == torch.bfloat16
@@ -0,0 +1,64 @@
+"""
+A tiny GPT-2 checkpoint with its own byte-level BPE tokenizer, saved to a
+local directory so CogenBAI can be loaded on CPU without downloads.
+"""
+import torch
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+from cogenbai.config import CogenConfig
+from cogenbai.optimization.formatting import FormattingService
+from cogenbai.storage.project_tracker import ProjectTracker
+
+CORPUS = [
+    "Generate python code:\n", "Solution:\n", "def add(a, b):\n    return a + b\n",
+    "if x:\n    y = 1\nelse:\n    y = 2\n", "for item in items:\n    print(item)\n",
+    "class Store:\n    def get(self, key):\n        return self.items[key]\n",
+    "x = 1\n\n\ny = 2\n\n\n",
+]
+
+# Prompt/answer pairs in CogenBAI's prompt format, one after another, so a
+# trained model answers and then starts on the next, unrequested prompt
+ANSWERS = [
+    ("add two numbers", "def add(a, b):\n    return a + b\n"),
+    ("print every item", "for item in items:\n    print(item)\n"),
+]
+
+
+def save_tiny_model(path, seed=0, train_steps=0):
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(vocab_size=300, special_tokens=["<|endoftext|>"],
+                                  initial_alphabet=pre_tokenizers.ByteLevel.alphabet())
+    tokenizer.train_from_iterator(CORPUS * 20, trainer)
+    fast = PreTrainedTokenizerFast(tokenizer_object=tokenizer, eos_token="<|endoftext|>",
+                                   bos_token="<|endoftext|>")
+    fast.save_pretrained(path)
+    torch.manual_seed(seed)
+    model = GPT2LMHeadModel(GPT2Config(n_embd=32, n_layer=2, n_head=2, vocab_size=len(fast),
+                                       n_positions=512, eos_token_id=fast.eos_token_id,
+                                       bos_token_id=fast.eos_token_id))
+    if train_steps:
+        text = "".join(f"Generate python code:\n{prompt}\n\nSolution:\n{answer}" for prompt, answer in ANSWERS)
+        ids = torch.tensor([fast(text * 4).input_ids])
+        optimizer = torch.optim.Adam(model.parameters(), lr=1e-2)
+        for _ in range(train_steps):
+            optimizer.zero_grad()
+            model(ids, labels=ids).loss.backward()
+            optimizer.step()
+    model.eval().save_pretrained(path)
+    return str(path)
+
+
+def tiny_cogenbai(tmp_path, train_steps=0, **options):
+    """
+    A CogenBAI on the tiny checkpoint, with its project database under
+    ``tmp_path``; with ``train_steps`` the model first learns ANSWERS.
+    """
+    from cogenbai.core.model import CogenBAI
+    model_path = save_tiny_model(tmp_path / "model", train_steps=train_steps)
+    config = CogenConfig(model_name=model_path, **options)
+    return CogenBAI(model_path, device="cpu", config=config,
+                    project_tracker=ProjectTracker(str(tmp_path / "projects.db")),
+                    formatter=FormattingService({}))